@@ -1,14 +1,54 @@
-from flask import Flask, render_template, request, jsonify, redirect, url_for, send_file
-import sqlite3
+from flask import Flask, render_template, request, jsonify, redirect, url_for, send_file, Response
+import csv
+import io
+import itertools
 import json
+import gzip
+import hashlib
 import threading
+import time
 import os
-from scraper import DanbooruArtistScraper
+from typing import Dict, Iterator
+from scraper import DanbooruArtistScraper, resolve_fields, typed_filters
+from db import check_snapshot
+from records import ARTIST_COLUMNS
+from events import EventBroadcaster
+from rate_control import RateController
+from jobs import JobManager, SQLiteJobStore, RUNNING, COMPLETED, CANCELLED
+
+# Optional: brotli compression for clients that accept it
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 app = Flask(__name__)
 
+# Serve a published snapshot read-only (immutable and memory-mapped; scraping disabled)
+READ_ONLY = os.environ.get('SERVE_READ_ONLY', '').lower() in ('1', 'true', 'yes')
+DB_PATH = os.environ.get('ARTISTS_DB_PATH', 'artists.db')
+
+# A live (WAL) or old-schema database would fail every query when opened immutable
+if READ_ONLY:
+    snapshot_problem = check_snapshot(DB_PATH, require_published=False)
+    if snapshot_problem:
+        app.logger.warning(f"⚠️ Not serving {DB_PATH} read-only: {snapshot_problem}; falling back to read-write")
+        READ_ONLY = False
+
 # Initialize scraper with proper authentication
-scraper = DanbooruArtistScraper()
+scraper = DanbooruArtistScraper(db_path=DB_PATH, read_only=READ_ONLY)
+
+if READ_ONLY:
+    warmed = scraper.db.warm()
+    app.logger.info(f"📖 Serving {scraper.db_path} read-only ({warmed / 1024 / 1024:.1f} MB warmed)")
+
+# Optional in-memory columnar index for searches (needs numpy); built in the background
+if os.environ.get('ARTIST_INDEX', '').lower() in ('1', 'true', 'yes'):
+    scraper.enable_artist_index(background=True)
+
+# 'thread' runs jobs inside this process; 'process' hands them to worker.py
+# through a shared SQLite job table so several web workers can run at once
+WORKER_MODE = os.environ.get('SCRAPE_WORKER_MODE', 'thread')
 
 # Global variable to track scraping progress
 scraping_status = {
@@ -20,6 +60,168 @@ scraping_status = {
     'total_scraped': 0
 }
 
+# Pushes scrape progress and rate limit health to all /events subscribers
+event_broadcaster = EventBroadcaster()
+
+def current_rate_limit_status():
+    """Rate limit status of whichever process owns the upstream budget"""
+    if WORKER_MODE != 'process':
+        return scraper.get_rate_limit_status()
+    
+    worker = job_manager.live_worker()
+    if worker is None:
+        status = scraper.get_rate_limit_status()
+        status['worker_online'] = False
+        return status
+    status = worker['rate_limit_status']
+    status['worker_online'] = True
+    status['worker_id'] = worker['worker_id']
+    return status
+
+def publish_scraping_status():
+    """Push the current scraping status and rate limit health to SSE clients"""
+    event_broadcaster.publish('scrape', dict(scraping_status))
+    event_broadcaster.publish('rate_limit', current_rate_limit_status())
+
+# Jobs that drive the scraping progress panel
+SCRAPE_JOB_KINDS = ['scrape', 'sync']
+
+def on_job_update(job):
+    """Mirror scrape job state into scraping_status and publish it"""
+    event_broadcaster.publish('job', job.to_dict())
+    if job.kind not in SCRAPE_JOB_KINDS:
+        return
+    
+    metrics = job.metrics
+    max_pages = job.params.get('max_pages')
+    scraping_status.update({
+        'job_id': job.id,
+        'is_running': not job.is_finished,
+        'current_page': metrics.get('current_page', job.params.get('start_page', 0)),
+        'total_pages': max_pages if max_pages else 'Unknown (scraping until exhausted)',
+        'progress': metrics.get('percent') or (100 if job.state == COMPLETED else 0),
+        'total_scraped': metrics.get('artists_scraped', 0),
+        'fetch_post_counts': job.params.get('fetch_post_counts', job.kind == 'scrape'),
+        'stats': metrics
+    })
+    
+    if job.state == RUNNING and metrics:
+        scraping_status['message'] = (
+            f"Scraping page {metrics['page_id']}: {metrics['artists_scraped']} artists, "
+            f"{metrics['requests']} requests, {metrics['rate_limited_429s']} 429s "
+            f"({metrics['artists_per_second']} artists/sec)"
+        )
+    elif job.state == RUNNING:
+        scraping_status['message'] = f"Starting {job.kind} job {job.id}"
+    elif job.state == COMPLETED:
+        scraping_status['message'] = (
+            f'Scraping completed successfully. Total artists: {job.result}' +
+            (' (with post counts)' if scraping_status['fetch_post_counts'] else ' (without post counts)')
+        )
+    elif job.state == CANCELLED:
+        scraping_status['message'] = 'Scraping stopped by user'
+    elif job.error:
+        scraping_status['message'] = f'Scraping failed: {job.error}'
+    else:
+        scraping_status['message'] = f"Queued {job.kind} job {job.id}"
+    
+    publish_scraping_status()
+
+def watch_job_store(interval: float = 1.0):
+    """Publish job changes made by the worker process to this process's SSE clients"""
+    last_seen = {}
+    while True:
+        time.sleep(interval)
+        if not event_broadcaster.subscriber_count:
+            continue
+        try:
+            jobs = job_manager.list(limit=20)
+        except Exception as e:
+            app.logger.warning(f"Failed to read job table: {e}")
+            continue
+        for job in jobs:
+            snapshot = (job.state, job.finished_at, json.dumps(job.metrics, sort_keys=True, default=str))
+            if last_seen.get(job.id) != snapshot:
+                last_seen[job.id] = snapshot
+                on_job_update(job)
+
+if WORKER_MODE == 'process':
+    job_manager = SQLiteJobStore(os.environ.get('JOBS_DB_PATH', 'jobs.db'))
+    threading.Thread(target=watch_job_store, daemon=True, name='job-store-watcher').start()
+    # Image previews are the only upstream calls left in a web process; they get a
+    # small fixed budget of their own, kept apart from the worker's scrape budget
+    preview_rate = float(os.environ.get('PREVIEW_REQUESTS_PER_SECOND', 1))
+    scraper.rate_controller = RateController(preview_rate, max_rate=preview_rate)
+else:
+    # Scrape, sync and post count jobs share the scraper's rate budget on one worker
+    job_manager = JobManager(scraper, max_workers=int(os.environ.get('JOB_WORKERS', 1)),
+                             on_update=on_job_update)
+    # Failed pages and post counts are retried by whichever process owns the rate budget
+    if not READ_ONLY:
+        scraper.start_retry_drainer()
+
+# JSON bodies smaller than this are sent uncompressed
+COMPRESS_MIN_SIZE = 1024
+
+# Upper bound on names per /artists/lookup request
+MAX_LOOKUP_NAMES = 100000
+
+# Bytes per chunk written to streamed exports
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+# Routes that scrape, queue jobs or change state; refused in read-only mode
+WRITE_ENDPOINTS = {'start_scraping', 'stop_scraping', 'submit_job', 'cancel_job', 'set_credentials'}
+
+@app.before_request
+def reject_writes_when_read_only():
+    """Refuse every write path when serving a read-only snapshot"""
+    if READ_ONLY and request.endpoint in WRITE_ENDPOINTS:
+        return jsonify({
+            'success': False,
+            'error': 'This server is in read-only mode'
+        }), 403
+
+def make_etag(*parts) -> str:
+    """Cheap validator from the parts that determine a response body"""
+    return hashlib.sha1(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()[:24]
+
+def conditional_json(etag: str, build_payload):
+    """Answer GET/HEAD with 304 when the client's ETag matches, else build the JSON body
+
+    ETags are weak because the same representation may be sent with
+    different content encodings.
+    """
+    if request.method in ('GET', 'HEAD') and request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = jsonify(build_payload())
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@app.after_request
+def compress_response(response):
+    """gzip/brotli-compress large JSON responses when the client accepts it"""
+    if (response.status_code != 200 or response.is_streamed or response.direct_passthrough
+            or response.mimetype != 'application/json' or 'Content-Encoding' in response.headers):
+        return response
+    
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_SIZE:
+        return response
+    
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        response.set_data(brotli.compress(body, quality=5))
+        response.headers['Content-Encoding'] = 'br'
+    elif accepted['gzip']:
+        response.set_data(gzip.compress(body, compresslevel=6))
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        return response
+    response.vary.add('Accept-Encoding')
+    return response
+
 @app.route('/')
 def index():
     """Main page with search interface"""
@@ -27,47 +229,66 @@ def index():
     auth_status = {
         'authenticated': scraper.authenticated,
         'username': getattr(scraper, 'username', None),
-        'rate_limit_status': scraper.get_rate_limit_status()
+        'rate_limit_status': current_rate_limit_status()
     }
     return render_template('index.html', stats=stats, auth=auth_status)
 
-@app.route('/search', methods=['POST'])
-def search_artists():
-    """Search artists based on criteria"""
-    data = request.get_json()
-    
-    # Extract search parameters
-    name_starts_with = data.get('name_starts_with', '').strip() or None
-    name_contains = data.get('name_contains', '').strip() or None
-    min_post_count = data.get('min_post_count')
-    max_post_count = data.get('max_post_count')
-    limit = min(int(data.get('limit', 100)), 1000)  # Cap at 1000 results
+def parse_search_criteria(data) -> Dict:
+    """get_artists_by_criteria keyword arguments from /search style parameters
+
+    Raises ValueError for malformed numbers, dates or fields.
+    """
+    def optional_int(name):
+        value = data.get(name)
+        return int(value) if value not in (None, '') else None
     
-    # Convert empty strings to None for numeric fields
-    if min_post_count == '':
-        min_post_count = None
-    else:
-        min_post_count = int(min_post_count) if min_post_count else None
+    def flag(name):
+        return str(data.get(name, '')).lower() in ('1', 'true', 'yes', 'on')
     
-    if max_post_count == '':
-        max_post_count = None
-    else:
-        max_post_count = int(max_post_count) if max_post_count else None
+    criteria = {
+        'name_starts_with': data.get('name_starts_with', '').strip() or None,
+        'name_contains': data.get('name_contains', '').strip() or None,
+        # Misspelling-tolerant match on names and aliases, ranked by similarity
+        'fuzzy': data.get('fuzzy', '').strip() or None,
+        'min_post_count': optional_int('min_post_count'),
+        'max_post_count': optional_int('max_post_count'),
+        # Optional projection: field set name ('card', 'minimal', 'full') or column list
+        'fields': resolve_fields(data.get('fields')),
+        # Date (ISO 8601 or epoch seconds) and status filters, answered from indexes
+        'created_after': data.get('created_after') or None,
+        'created_before': data.get('created_before') or None,
+        'updated_since': data.get('updated_since') or None,
+        'exclude_deleted': flag('exclude_deleted'),
+        'exclude_banned': flag('exclude_banned'),
+    }
+    typed_filters(criteria['created_after'], criteria['created_before'], criteria['updated_since'])
+    return criteria
+
+@app.route('/search', methods=['GET', 'POST'])
+def search_artists():
+    """Search artists based on criteria (JSON body for POST, query string for GET)"""
+    data = (request.get_json() or {}) if request.method == 'POST' else request.args
     
     try:
-        artists = scraper.get_artists_by_criteria(
-            name_starts_with=name_starts_with,
-            name_contains=name_contains,
-            min_post_count=min_post_count,
-            max_post_count=max_post_count,
-            limit=limit
-        )
-        
+        criteria = parse_search_criteria(data)
+        criteria['limit'] = min(int(data.get('limit', 100)), 1000)  # Cap at 1000 results
+    except ValueError as e:
         return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    
+    def build_payload():
+        artists = scraper.get_artists_by_criteria(**criteria)
+        return {
             'success': True,
-            'artists': artists,
+            'artists': [artist.to_dict() for artist in artists],
             'count': len(artists)
-        })
+        }
+    
+    try:
+        etag = make_etag('search', scraper.get_db_generation(), criteria)
+        return conditional_json(etag, build_payload)
     
     except Exception as e:
         return jsonify({
@@ -75,12 +296,144 @@ def search_artists():
             'error': str(e)
         }), 500
 
+@app.route('/search/export')
+def export_search_results():
+    """Stream every artist matching the /search criteria as CSV or NDJSON
+
+    Rows go from the SQLite cursor to the response in chunks, so the download
+    starts immediately and memory stays flat. ?format=csv|ndjson; there is
+    no limit unless one is given.
+    """
+    export_format = request.args.get('format', 'csv')
+    if export_format not in ('csv', 'ndjson'):
+        return jsonify({
+            'success': False,
+            'error': "format must be 'csv' or 'ndjson'"
+        }), 400
+    try:
+        criteria = parse_search_criteria(request.args)
+        criteria['limit'] = int(request.args['limit']) if request.args.get('limit') else None
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    
+    artists = scraper.iter_artists_by_criteria(**criteria)
+    if export_format == 'csv':
+        body, mimetype = stream_csv(criteria['fields'], artists), 'text/csv'
+    else:
+        body = (json.dumps(artist.to_dict(), ensure_ascii=False) + '\n' for artist in artists)
+        mimetype = 'application/x-ndjson'
+    response = Response(stream_in_chunks(body), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename=danbooru_artists.{export_format}'
+    return response
+
+def stream_csv(columns: tuple, rows) -> Iterator[str]:
+    """CSV text for a header plus rows, one line at a time"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in itertools.chain([columns], rows):
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+def stream_in_chunks(lines, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[bytes]:
+    """Join small text pieces into chunks of about chunk_size bytes for the response"""
+    pending, size = [], 0
+    for line in lines:
+        pending.append(line)
+        size += len(line)
+        if size >= chunk_size:
+            yield ''.join(pending).encode('utf-8')
+            pending, size = [], 0
+    if pending:
+        yield ''.join(pending).encode('utf-8')
+
+@app.route('/autocomplete')
+def autocomplete_artists():
+    """Typeahead: top artist names and aliases starting with ?q=, by post count"""
+    prefix = request.args.get('q', '')
+    try:
+        limit = int(request.args.get('limit', 10))
+    except ValueError:
+        return jsonify({
+            'success': False,
+            'error': 'limit must be an integer'
+        }), 400
+    
+    suggestions = scraper.autocomplete(prefix, limit)
+    return jsonify({
+        'success': True,
+        'query': prefix,
+        'suggestions': suggestions
+    })
+
+@app.route('/artists/lookup', methods=['POST'])
+def lookup_artists():
+    """Bulk exact lookup of names/aliases, streamed back as NDJSON in input order
+
+    Takes {"names": [...], "fields": ...} as JSON, or one name per line as
+    plain text. Each output line is {"query", "found", "artists"}.
+    """
+    if request.is_json:
+        data = request.get_json() or {}
+        names = data.get('names') or []
+        fields = data.get('fields', 'minimal')
+    else:
+        names = [line.strip() for line in request.get_data(as_text=True).splitlines() if line.strip()]
+        fields = request.args.get('fields', 'minimal')
+    
+    if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+        return jsonify({
+            'success': False,
+            'error': 'names must be a list of strings'
+        }), 400
+    if len(names) > MAX_LOOKUP_NAMES:
+        return jsonify({
+            'success': False,
+            'error': f'At most {MAX_LOOKUP_NAMES} names per request'
+        }), 400
+    try:
+        resolve_fields(fields)
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    
+    def generate():
+        for name, matches in scraper.lookup_artists(names, fields=fields):
+            yield json.dumps({
+                'query': name,
+                'found': bool(matches),
+                'artists': [artist.to_dict() for artist in matches]
+            }, ensure_ascii=False) + '\n'
+    
+    return Response(generate(), mimetype='application/x-ndjson')
+
+@app.route('/search/cache-stats')
+def search_cache_stats():
+    """Hit rate and size of the search result cache"""
+    stats = scraper.search_cache.get_stats()
+    stats['db_generation'] = scraper.get_db_generation()
+    stats['artist_index'] = scraper.artist_index.get_stats() if scraper.artist_index else None
+    stats['autocomplete'] = scraper.autocomplete_index.get_stats() if scraper.autocomplete_index else None
+    stats['fuzzy_index'] = scraper.fuzzy_index.get_stats() if scraper.fuzzy_index else None
+    return jsonify(stats)
+
+@app.route('/retry-queue')
+def retry_queue_stats():
+    """Failed fetches waiting for a retry, and the drainer's counters"""
+    return jsonify(scraper.get_retry_stats())
+
 @app.route('/scrape', methods=['POST'])
 def start_scraping():
-    """Start the scraping process in a background thread"""
+    """Queue a scrape job (kept for the web UI; see /jobs for the general API)"""
     global scraping_status
     
-    if scraping_status['is_running']:
+    if job_manager.list(kinds=SCRAPE_JOB_KINDS, active_only=True):
         return jsonify({
             'success': False,
             'error': 'Scraping is already in progress'
@@ -93,10 +446,8 @@ def start_scraping():
     
     if max_pages:
         max_pages = int(max_pages)
-        end_page = start_page + max_pages - 1
     else:
         max_pages = None
-        end_page = None
     
     # Validate page range
     if start_page < 0:
@@ -111,91 +462,112 @@ def start_scraping():
             'error': 'max_pages must be > 0'
         }), 400
     
-    # Start scraping in background thread
-    scraping_status.update({
-        'is_running': True,
-        'current_page': start_page,
-        'total_pages': max_pages if max_pages else 'Unknown (scraping until exhausted)',
-        'progress': 0,
-        'message': f'Starting scrape from page a{start_page}' + (f' (max {max_pages} pages)' if max_pages else ' (until exhausted)'),
+    job = job_manager.submit('scrape', {
+        'start_page': start_page,
+        'max_pages': max_pages,
         'fetch_post_counts': fetch_post_counts
     })
     
-    def scrape_background():
-        global scraping_status
-        try:
-            # Use the enhanced scrape_all_pages method
-            total_artists_scraped = scraper.scrape_all_pages(
-                start_page=start_page,
-                max_pages=max_pages,
-                fetch_post_counts=fetch_post_counts
-            )
-            
-            scraping_status.update({
-                'is_running': False,
-                'progress': 100,
-                'message': f'Scraping completed successfully. Total artists: {total_artists_scraped}' + 
-                          (' (with post counts)' if fetch_post_counts else ' (without post counts)'),
-                'total_scraped': total_artists_scraped
-            })
-        
-        except Exception as e:
-            scraping_status.update({
-                'is_running': False,
-                'message': f'Scraping failed: {str(e)}'
-            })
-    
-    thread = threading.Thread(target=scrape_background)
-    thread.daemon = True
-    thread.start()
-    
     return jsonify({
         'success': True,
-        'message': 'Scraping started'
+        'message': 'Scraping started',
+        'job_id': job.id
     })
 
 @app.route('/scrape/status')
 def scraping_status_endpoint():
     """Get current scraping status"""
     global scraping_status
+    if WORKER_MODE == 'process':
+        # Status lives in the shared job table; refresh from the latest scrape job
+        latest = job_manager.list(kinds=SCRAPE_JOB_KINDS, limit=1)
+        if latest:
+            on_job_update(latest[-1])
     return jsonify(scraping_status)
 
 @app.route('/scrape/stop', methods=['POST'])
 def stop_scraping():
-    """Stop the scraping process"""
-    global scraping_status
-    scraping_status['is_running'] = False
-    scraping_status['message'] = 'Scraping stopped by user'
-    return jsonify({'success': True, 'message': 'Scraping stopped'})
+    """Cancel running and queued scrape jobs"""
+    cancelled = [job_manager.cancel(job.id).id
+                 for job in job_manager.list(kinds=SCRAPE_JOB_KINDS, active_only=True)]
+    return jsonify({'success': True, 'message': 'Scraping stopped', 'cancelled_jobs': cancelled})
+
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    """Queue a scrape, sync or post_counts job"""
+    data = request.get_json() or {}
+    try:
+        job = job_manager.submit(data.get('kind', ''), data.get('params') or {})
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    return jsonify({'success': True, 'job': job.to_dict()}), 202
+
+@app.route('/jobs', methods=['GET'])
+def list_jobs():
+    """List known jobs, optionally only queued/running ones (?active=1)"""
+    active_only = request.args.get('active', '').lower() in ('1', 'true', 'yes')
+    return jsonify({'jobs': [job.to_dict() for job in job_manager.list(active_only=active_only)]})
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Get state and metrics for one job"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    return jsonify({'success': True, 'job': job.to_dict()})
+
+@app.route('/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """Request cooperative cancellation of a job"""
+    job = job_manager.cancel(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    return jsonify({'success': True, 'job': job.to_dict()})
+
+@app.route('/events')
+def event_stream():
+    """Server-Sent Events stream of scrape progress and rate limit health"""
+    client_queue = event_broadcaster.subscribe()
+    client_queue.put_nowait(('scrape', dict(scraping_status)))
+    client_queue.put_nowait(('rate_limit', current_rate_limit_status()))
+    
+    # While idle, refresh rate limit health instead of sending bare keep-alives
+    stream = event_broadcaster.stream(
+        client_queue,
+        heartbeat=10.0,
+        on_idle=lambda: ('rate_limit', current_rate_limit_status())
+    )
+    return Response(stream, mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
 
 @app.route('/stats')
 def get_stats():
     """Get database statistics"""
-    stats = scraper.get_database_stats()
-    return jsonify(stats)
+    return conditional_json(make_etag('stats', scraper.get_db_generation()), scraper.get_database_stats)
 
 @app.route('/rate-limit-status')
 def get_rate_limit_status():
     """Get current rate limiting status with enhanced 429 detection info"""
-    return jsonify(scraper.get_rate_limit_status())
+    status = current_rate_limit_status()
+    return conditional_json(make_etag('rate-limit-status', status), lambda: status)
 
 @app.route('/export')
 def export_data():
     """Export all artists data as JSON"""
-    conn = sqlite3.connect(scraper.db_path)
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM artists ORDER BY name")
-    results = cursor.fetchall()
-    
-    columns = [description[0] for description in cursor.description]
-    artists = [dict(zip(columns, row)) for row in results]
-    
-    conn.close()
+    def build_payload():
+        with scraper.db.read() as conn:
+            cursor = conn.execute(f"SELECT {', '.join(ARTIST_COLUMNS)} FROM artists ORDER BY name")
+            columns = [description[0] for description in cursor.description]
+            artists = [dict(zip(columns, row)) for row in cursor]
+        
+        return {
+            'artists': artists,
+            'total_count': len(artists)
+        }
     
-    return jsonify({
-        'artists': artists,
-        'total_count': len(artists)
-    })
+    return conditional_json(make_etag('export', scraper.get_db_generation()), build_payload)
 
 @app.route('/export/csv')
 def export_csv():
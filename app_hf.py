@@ -2,7 +2,21 @@
 """
 Hugging Face Spaces entry point for Danbooru Artist Scraper
 """
+import logging
 import os
+
+from db import check_snapshot
+
+# Spaces only serve searches: open a published snapshot read-only. Anything else
+# (a live WAL database, an old schema) is served read-write so queries still work.
+if "SERVE_READ_ONLY" not in os.environ:
+    db_path = os.environ.get("ARTISTS_DB_PATH", "artists.db")
+    problem = check_snapshot(db_path)
+    if problem is None:
+        os.environ["SERVE_READ_ONLY"] = "1"
+    else:
+        logging.getLogger(__name__).warning(f"⚠️ Serving {db_path} read-write: {problem}")
+
 from app import app
 
 if __name__ == "__main__":
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Append-only archive of raw artist page responses, with offline re-ingest
+
+get_page can write every raw page it fetches into compressed JSONL segments
+(zstd when the optional `zstandard` package is installed, gzip otherwise).
+Each page is one compressed frame/member appended to the current segment, and
+index.jsonl records which segment holds which page. `reingest` rebuilds the
+artists table from the archive in parallel across segments, without any
+network access, so parser changes can be applied to existing data.
+
+Usage:
+    python archive.py reingest --archive-dir page_archive [--db artists.db] [--workers 4]
+    python archive.py stats --archive-dir page_archive
+"""
+
+import argparse
+import gzip
+import io
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+# Optional: zstd compresses artist JSON better and faster than gzip
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "index.jsonl"
+
+
+def _segment_suffix() -> str:
+    return ".jsonl.zst" if zstandard is not None else ".jsonl.gz"
+
+
+class _PageWriter:
+    """Writes one page's records as a single compressed frame"""
+
+    def __init__(self, file, zstd: bool):
+        self._file = file
+        if zstd:
+            self._stream = zstandard.ZstdCompressor().stream_writer(self._file, closefd=False)
+        else:
+            self._stream = gzip.GzipFile(fileobj=self._file, mode='wb')
+        self.records = 0
+
+    def write(self, record: Dict):
+        self._stream.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n')
+        self.records += 1
+
+    def close(self):
+        self._stream.close()
+
+
+class PageArchive:
+    """Compressed, append-only store of raw page responses split into segments"""
+
+    def __init__(self, archive_dir: str, pages_per_segment: int = 100):
+        self.archive_dir = archive_dir
+        self.pages_per_segment = pages_per_segment
+        self._lock = threading.Lock()
+        os.makedirs(archive_dir, exist_ok=True)
+
+        self._current_segment = None
+        self._pages_in_segment = 0
+        for entry in self.read_index():
+            if entry['segment'] != self._current_segment:
+                self._current_segment = entry['segment']
+                self._pages_in_segment = 0
+            self._pages_in_segment += 1
+
+    def _next_segment_name(self) -> str:
+        existing = self.segments()
+        number = len(existing) + 1
+        return f"segment-{number:06d}{_segment_suffix()}"
+
+    @contextmanager
+    def page_writer(self, page_id: str):
+        """Context manager yielding a writer for one page's raw artist objects
+
+        Records are compressed into a temporary file as they are written, so a
+        page never has to be held in memory and other pages can be archived
+        meanwhile. When the block exits without an error the frame is appended
+        to the current segment and indexed; otherwise it is discarded.
+        """
+        fetched_at = time.time()
+        with tempfile.TemporaryFile(dir=self.archive_dir) as buffer:
+            writer = _PageWriter(buffer, zstd=_segment_suffix().endswith('.zst'))
+            try:
+                yield _RecordWriter(writer, page_id, fetched_at)
+            finally:
+                writer.close()
+            buffer.seek(0)
+
+            with self._lock:
+                if (self._current_segment is None or self._pages_in_segment >= self.pages_per_segment
+                        or not self._current_segment.endswith(_segment_suffix())):
+                    self._current_segment = self._next_segment_name()
+                    self._pages_in_segment = 0
+
+                segment = self._current_segment
+                with open(os.path.join(self.archive_dir, segment), 'ab') as segment_file:
+                    shutil.copyfileobj(buffer, segment_file)
+                self._pages_in_segment += 1
+                with open(os.path.join(self.archive_dir, INDEX_FILE), 'a', encoding='utf-8') as index:
+                    index.write(json.dumps({
+                        'page': page_id,
+                        'segment': segment,
+                        'records': writer.records,
+                        'fetched_at': fetched_at
+                    }) + '\n')
+
+    def append_page(self, page_id: str, artists: List[Dict]):
+        """Archive a fully downloaded page"""
+        with self.page_writer(page_id) as writer:
+            for artist in artists:
+                writer.write(artist)
+
+    def read_index(self) -> List[Dict]:
+        path = os.path.join(self.archive_dir, INDEX_FILE)
+        if not os.path.exists(path):
+            return []
+        with open(path, encoding='utf-8') as index:
+            return [json.loads(line) for line in index if line.strip()]
+
+    def segments(self) -> List[str]:
+        """Segment file paths in write order"""
+        names = sorted(name for name in os.listdir(self.archive_dir)
+                       if name.startswith('segment-') and name.endswith(('.jsonl.zst', '.jsonl.gz')))
+        return [os.path.join(self.archive_dir, name) for name in names]
+
+    def get_stats(self) -> Dict:
+        index = self.read_index()
+        segments = self.segments()
+        return {
+            'pages': len(index),
+            'records': sum(entry['records'] for entry in index),
+            'segments': len(segments),
+            'bytes': sum(os.path.getsize(path) for path in segments),
+            'compression': 'zstd' if zstandard is not None else 'gzip'
+        }
+
+
+class _RecordWriter:
+    """Wraps raw artist objects with their page id and fetch time"""
+
+    def __init__(self, writer: _PageWriter, page_id: str, fetched_at: float):
+        self._writer = writer
+        self._page_id = page_id
+        self._fetched_at = fetched_at
+
+    def write(self, artist: Dict):
+        self._writer.write({'page': self._page_id, 'fetched_at': self._fetched_at, 'data': artist})
+
+
+def iter_segment(path: str) -> Iterator[Dict]:
+    """Yield archived records from one segment (all frames/members)"""
+    with open(path, 'rb') as raw:
+        if path.endswith('.zst'):
+            if zstandard is None:
+                raise RuntimeError(f"Segment {path} is zstd-compressed but zstandard is not installed")
+            stream = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True)
+        else:
+            stream = gzip.GzipFile(fileobj=raw, mode='rb')
+        with io.TextIOWrapper(stream, encoding='utf-8') as lines:
+            for line in lines:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def _parse_segment(path: str) -> List[Dict]:
+    """Worker: parse one segment into artist dicts (runs in a separate process)"""
+    from scraper import parse_artist_json
+    artists = []
+    for record in iter_segment(path):
+        artist = parse_artist_json(record['data'])
+        if artist is not None:
+            artists.append(artist)
+    return artists
+
+
+def reingest(archive_dir: str, db_path: str = "artists.db", workers: Optional[int] = None) -> int:
+    """Rebuild artist rows from the archive; returns the number of records written
+
+    Segments are parsed in parallel worker processes and written in archive
+    order, so the newest fetch of an artist wins. Existing post counts are
+    kept because archived pages don't contain them.
+    """
+    from scraper import DanbooruArtistScraper
+
+    archive = PageArchive(archive_dir)
+    segments = archive.segments()
+    scraper = DanbooruArtistScraper(db_path=db_path)
+    written = 0
+    started = time.time()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for path, artists in zip(segments, executor.map(_parse_segment, segments)):
+            ticket = scraper.save_artists(artists, preserve_post_counts=True)
+            saved = len(artists) - (len(ticket.failed_rows) if ticket else 0)
+            written += saved
+            logger.info(f"📦 Re-ingested {saved} artists from {os.path.basename(path)}")
+
+    elapsed = time.time() - started
+    logger.info(f"🏁 Re-ingested {written} artists from {len(segments)} segments in {elapsed:.1f}s")
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Raw page archive tools")
+    parser.add_argument('command', choices=['reingest', 'stats'])
+    parser.add_argument('--archive-dir', default=os.environ.get('PAGE_ARCHIVE_DIR', 'page_archive'))
+    parser.add_argument('--db', default=os.environ.get('ARTISTS_DB_PATH', 'artists.db'))
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Parser processes (default: one per CPU)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.command == 'stats':
+        print(json.dumps(PageArchive(args.archive_dir).get_stats(), indent=2))
+    else:
+        total = reingest(args.archive_dir, args.db, args.workers)
+        print(f"✅ Re-ingested {total} artists")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""
+In-memory columnar artist index for fast /search
+
+Keeps just enough of the artists table in NumPy arrays to answer post count
+range and name prefix queries without SQL:
+
+- ids and post_counts, ordered by post count (descending); a row number is a
+  position in this order
+- names packed into one UTF-8 blob with an offsets array (row order)
+- lowercased names (ASCII letters only, as LIKE folds them) packed in sorted
+  order for prefix binary search, with name_order mapping each sorted
+  position back to its row
+
+Writes made through the scraper's group commit writer are applied to a small
+delta overlay; the arrays are rebuilt in the background when the overlay
+grows or when another process changed the database. Queries the index can't
+answer exactly (name_contains, LIKE wildcards, a stale index) return None so
+the caller falls back to SQLite. Requires the optional numpy package.
+"""
+
+import bisect
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Optional: without numpy the index is unavailable and searches use SQLite
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from records import record_type
+
+logger = logging.getLogger(__name__)
+
+# Columns answered straight from the arrays; other columns are read by id
+INDEX_COLUMNS = ('id', 'name', 'post_count')
+# Fold case like SQLite's LIKE (ASCII letters only), so answers match the SQL fallback
+_ASCII_LOWER = str.maketrans('ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')
+
+
+class _PackedStrings(Sequence):
+    """Read-only sequence of byte strings stored in one blob plus offsets"""
+
+    def __init__(self, blob: bytes, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> bytes:
+        return self.blob[self.offsets[i]:self.offsets[i + 1]]
+
+
+def _pack(strings: List[bytes]) -> _PackedStrings:
+    offsets = np.zeros(len(strings) + 1, dtype=np.int64)
+    np.cumsum([len(s) for s in strings], out=offsets[1:])
+    return _PackedStrings(b''.join(strings), offsets)
+
+
+class ColumnarArtistIndex:
+    """NumPy-backed snapshot of (id, name, post_count) plus a write overlay"""
+
+    def __init__(self, db, max_overlay: int = 5000):
+        if np is None:
+            raise RuntimeError("ColumnarArtistIndex requires numpy (pip install numpy)")
+        self.db = db
+        self.max_overlay = max_overlay
+        self.generation = None
+        self.built_at = None
+        self.build_seconds = 0.0
+        self._lock = threading.Lock()
+        self._rebuild_lock = threading.Lock()
+        self._overlay: Dict[int, Tuple[str, int]] = {}
+        self._overlay_names: Dict[str, int] = {}
+        self._shadowed = set()
+        self._stale = True
+        self.stats = {'queries': 0, 'fallbacks': 0, 'rebuilds': 0, 'overlay_updates': 0}
+        self._set_base(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), [])
+
+    # -- building ------------------------------------------------------------
+
+    def _set_base(self, ids, post_counts, names: List[str]):
+        lowered = [name.translate(_ASCII_LOWER).encode('utf-8') for name in names]
+        name_order = np.array(sorted(range(len(lowered)), key=lowered.__getitem__), dtype=np.int64)
+        self._ids = ids
+        self._post_counts = post_counts
+        # Counts negated so ascending searchsorted works on the descending order
+        self._neg_counts = -post_counts
+        self._names = _pack([name.encode('utf-8') for name in names])
+        self._name_keys = _pack([lowered[i] for i in name_order])
+        self._name_order = name_order
+        self._id_order = np.argsort(ids, kind='stable')
+        self._sorted_ids = ids[self._id_order]
+
+    def rebuild(self):
+        """Reload the arrays from the database and clear the overlay"""
+        with self._rebuild_lock:
+            started = time.time()
+            with self.db.read() as conn:
+                # One read transaction, so the rows match the generation
+                conn.execute("BEGIN")
+                generation = conn.execute("SELECT value FROM db_meta WHERE key = 'generation'").fetchone()
+                rows = conn.execute(
+                    "SELECT id, name, post_count FROM artists ORDER BY post_count DESC, id DESC"
+                ).fetchall()
+            ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+            post_counts = np.fromiter((row[2] or 0 for row in rows), dtype=np.int64, count=len(rows))
+            names = [row[1] or '' for row in rows]
+            del rows
+
+            with self._lock:
+                self._set_base(ids, post_counts, names)
+                self._overlay = {}
+                self._overlay_names = {}
+                self._shadowed = set()
+                self.generation = generation[0] if generation else 0
+                self._stale = False
+            self.built_at = time.time()
+            self.build_seconds = self.built_at - started
+            self.stats['rebuilds'] += 1
+            logger.info(f"🗂️  Artist index built: {len(ids)} artists in {self.build_seconds:.2f}s")
+
+    def rebuild_in_background(self):
+        """Start a rebuild unless one is already running"""
+        if self._rebuild_lock.locked():
+            return
+        threading.Thread(target=self._safe_rebuild, daemon=True, name='artist-index-rebuild').start()
+
+    def _safe_rebuild(self):
+        try:
+            self.rebuild()
+        except Exception as e:
+            logger.warning(f"Artist index rebuild failed: {e}")
+
+    # -- incremental updates -------------------------------------------------
+
+    def apply_commit(self, ops):
+        """GroupCommitWriter listener: fold committed writes into the overlay"""
+        with self._lock:
+            for op in ops:
+                if op.kind == 'artists':
+                    for row in op.rows:
+                        self._upsert(row[0], row[1] or '', row[2] or 0)
+                elif op.kind == 'post_counts':
+                    for post_count, artist_id in op.rows:
+                        current = self._lookup(artist_id)
+                        if current is not None:
+                            self._upsert(artist_id, current[0], post_count or 0)
+                else:
+                    # Writes the overlay can't model exactly (merges, raw SQL)
+                    self._stale = True
+            if self.generation is not None:
+                self.generation += 1
+            needs_rebuild = self._stale or len(self._overlay) > self.max_overlay
+        self.stats['overlay_updates'] += 1
+        if needs_rebuild:
+            self.rebuild_in_background()
+
+    def _base_row(self, artist_id: int) -> Optional[int]:
+        pos = int(np.searchsorted(self._sorted_ids, artist_id))
+        if pos < len(self._sorted_ids) and self._sorted_ids[pos] == artist_id:
+            return int(self._id_order[pos])
+        return None
+
+    def _lookup(self, artist_id: int) -> Optional[Tuple[str, int]]:
+        if artist_id in self._overlay:
+            return self._overlay[artist_id]
+        row = self._base_row(artist_id)
+        if row is None or artist_id in self._shadowed:
+            return None
+        return self._names[row].decode('utf-8'), int(self._post_counts[row])
+
+    def _upsert(self, artist_id: int, name: str, post_count: int):
+        if self._base_row(artist_id) is not None:
+            self._shadowed.add(artist_id)
+        # INSERT OR REPLACE drops any other artist holding the same (unique) name
+        for row in self._prefix_rows(name.translate(_ASCII_LOWER).encode('utf-8'), exact=True):
+            other_id = int(self._ids[row])
+            if other_id != artist_id and self._names[row].decode('utf-8') == name:
+                self._shadowed.add(other_id)
+        other_id = self._overlay_names.get(name)
+        if other_id is not None and other_id != artist_id:
+            del self._overlay[other_id]
+        previous = self._overlay.get(artist_id)
+        if previous is not None and self._overlay_names.get(previous[0]) == artist_id:
+            del self._overlay_names[previous[0]]
+        self._overlay[artist_id] = (name, post_count)
+        self._overlay_names[name] = artist_id
+
+    # -- queries -------------------------------------------------------------
+
+    def _prefix_rows(self, key: bytes, exact: bool = False):
+        """Row numbers whose lowercased name starts with (or equals) key"""
+        lo = bisect.bisect_left(self._name_keys, key)
+        hi = bisect.bisect_right(self._name_keys, key) if exact else \
+            bisect.bisect_left(self._name_keys, key + b'\xff', lo)
+        return self._name_order[lo:hi]
+
+    def is_fresh(self, generation: int) -> bool:
+        return not self._stale and self.generation == generation
+
+    def search(self, generation: int, name_starts_with: str = None, min_post_count: int = None,
+               max_post_count: int = None, name_contains: str = None, limit: int = 100,
+               columns: tuple = INDEX_COLUMNS) -> Optional[List[tuple]]:
+        """Answer a search from the arrays, or None if SQLite must handle it"""
+        if name_contains or (name_starts_with and ('%' in name_starts_with or '_' in name_starts_with)):
+            self.stats['fallbacks'] += 1
+            return None
+        if not self.is_fresh(generation):
+            self.stats['fallbacks'] += 1
+            if not self._rebuild_lock.locked():
+                self.rebuild_in_background()
+            return None
+
+        self.stats['queries'] += 1
+        limit = int(limit)
+        with self._lock:
+            overlay = dict(self._overlay)
+            shadowed = self._shadowed
+            ids, post_counts, names = self._ids, self._post_counts, self._names
+
+            # Post count range: a contiguous slice of the count-ordered rows
+            start = 0 if max_post_count is None else int(np.searchsorted(self._neg_counts, -max_post_count, 'left'))
+            stop = len(ids) if min_post_count is None else int(np.searchsorted(self._neg_counts, -min_post_count, 'right'))
+
+            # Overfetch by the rows the overlay replaced so enough remain after skipping them
+            wanted = limit + len(shadowed)
+            if name_starts_with:
+                rows = self._prefix_rows(name_starts_with.translate(_ASCII_LOWER).encode('utf-8'))
+                rows = np.sort(rows[(rows >= start) & (rows < stop)])[:wanted]
+            else:
+                rows = np.arange(start, max(start, min(stop, start + wanted)))
+
+            if shadowed:
+                rows = rows[~np.isin(ids[rows], np.fromiter(shadowed, dtype=np.int64, count=len(shadowed)))]
+            candidates = [(int(ids[r]), names[int(r)].decode('utf-8'), int(post_counts[r])) for r in rows[:limit]]
+
+        if overlay:
+            prefix = name_starts_with.translate(_ASCII_LOWER) if name_starts_with else None
+            for artist_id, (name, post_count) in overlay.items():
+                if prefix is not None and not name.translate(_ASCII_LOWER).startswith(prefix):
+                    continue
+                if min_post_count is not None and post_count < min_post_count:
+                    continue
+                if max_post_count is not None and post_count > max_post_count:
+                    continue
+                candidates.append((artist_id, name, post_count))
+            candidates.sort(key=lambda c: (-c[2], -c[0]))
+            candidates = candidates[:limit]
+
+        if all(column in INDEX_COLUMNS for column in columns):
+            positions = [INDEX_COLUMNS.index(column) for column in columns]
+            make = record_type(columns)._make
+            return [make(c[p] for p in positions) for c in candidates]
+        return self._fetch_rows([c[0] for c in candidates], columns)
+
+    def _fetch_rows(self, artist_ids: List[int], columns: tuple) -> List[tuple]:
+        """Read full rows for the matched ids, keeping the index's order"""
+        if not artist_ids:
+            return []
+        placeholders = ','.join('?' * len(artist_ids))
+        with self.db.read() as conn:
+            rows = conn.execute(
+                f"SELECT id, {', '.join(columns)} FROM artists WHERE id IN ({placeholders})", artist_ids
+            ).fetchall()
+        by_id = {row[0]: row[1:] for row in rows}
+        make = record_type(columns)._make
+        return [make(by_id[artist_id]) for artist_id in artist_ids if artist_id in by_id]
+
+    def get_stats(self) -> Dict:
+        return dict(self.stats, artists=len(self._ids), overlay=len(self._overlay),
+                    shadowed=len(self._shadowed), generation=self.generation, stale=self._stale,
+                    build_seconds=round(self.build_seconds, 3), built_at=self.built_at)
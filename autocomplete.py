@@ -0,0 +1,296 @@
+"""
+In-memory prefix index for artist name and alias typeahead
+
+Every artist name and alias (other_names) becomes one entry keyed by its
+normalized text (ASCII lowercase, spaces as underscores). Keys are kept in one
+sorted list, so a prefix is a bisect range. Top results are ranked by
+post_count. For 1-3 character prefixes, where ranges are huge, the top
+entries are precomputed. Longer prefixes take the best entries of their
+range with a bounded heap.
+
+Writes committed through the scraper's group commit writer go into a small
+overlay (artists whose base entries are skipped). The sorted list is rebuilt
+in the background when the overlay grows or when the database changed
+underneath, and stale results are served meanwhile.
+"""
+
+import bisect
+import heapq
+import logging
+import threading
+import time
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Prefixes up to this length get precomputed top entries
+PRECOMPUTED_PREFIX_LENGTH = 3
+# Precomputed entries per prefix (more than any limit, to survive skipped ones)
+PRECOMPUTED_TOP = 50
+MAX_LIMIT = 25
+_ASCII_LOWER = str.maketrans('ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')
+
+
+def normalize(text: str) -> str:
+    """Lowercase with spaces as underscores, matching how Danbooru names are written
+
+    Only ASCII letters are folded, as SQLite's LIKE does, so the index and
+    query_suggestions agree on non-ASCII names.
+    """
+    return text.strip().translate(_ASCII_LOWER).replace(' ', '_')
+
+
+def split_aliases(other_names: str) -> List[str]:
+    return [alias.strip() for alias in (other_names or '').split(', ') if alias.strip()]
+
+
+class AutocompleteIndex:
+    """Sorted name/alias keys with precomputed top entries for short prefixes"""
+
+    def __init__(self, db, max_overlay: int = 5000):
+        self.db = db
+        self.max_overlay = max_overlay
+        self.generation = None
+        self.build_seconds = 0.0
+        self._lock = threading.Lock()
+        self._rebuild_lock = threading.Lock()
+        self._ready = threading.Event()
+        self._stale = True
+        self.stats = {'queries': 0, 'rebuilds': 0, 'overlay_updates': 0}
+
+        # Base snapshot: artists, then one entry per name/alias in key order
+        self._ids = array('q')
+        self._names: List[str] = []
+        self._other_names: List[str] = []
+        self._counts = array('q')
+        self._keys: List[str] = []
+        self._texts: List[str] = []
+        self._entry_artist = array('l')
+        self._top: Dict[str, List[int]] = {}
+        self._row_by_id: Dict[int, int] = {}
+
+        # Overlay: artist id -> (name, post_count, aliases); their base entries are skipped
+        self._overlay: Dict[int, Tuple[str, int, List[str]]] = {}
+        self._overlay_names: Dict[str, int] = {}
+        self._shadowed = set()
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    # -- building ------------------------------------------------------------
+
+    def rebuild(self):
+        """Reload every name and alias from the database"""
+        with self._rebuild_lock:
+            started = time.time()
+            with self.db.read() as conn:
+                conn.execute("BEGIN")
+                generation = conn.execute("SELECT value FROM db_meta WHERE key = 'generation'").fetchone()
+                rows = conn.execute("SELECT id, name, post_count, other_names FROM artists").fetchall()
+
+            ids, names, other, counts = array('q'), [], [], array('q')
+            entries = []
+            for row, (artist_id, name, post_count, other_names) in enumerate(rows):
+                ids.append(artist_id)
+                names.append(name or '')
+                other.append(other_names or '')
+                counts.append(post_count or 0)
+                if name:
+                    entries.append((normalize(name), name, row))
+                for alias in split_aliases(other_names):
+                    entries.append((normalize(alias), alias, row))
+            del rows
+            entries.sort()
+
+            keys = [entry[0] for entry in entries]
+            texts = [entry[1] for entry in entries]
+            entry_artist = array('l', (entry[2] for entry in entries))
+            del entries
+
+            # Walk entries from most to least posts so each short prefix keeps its best ones
+            top: Dict[str, List[int]] = {}
+            for i in sorted(range(len(keys)), key=lambda i: -counts[entry_artist[i]]):
+                key = keys[i]
+                for length in range(1, min(PRECOMPUTED_PREFIX_LENGTH, len(key)) + 1):
+                    bucket = top.setdefault(key[:length], [])
+                    if len(bucket) < PRECOMPUTED_TOP:
+                        bucket.append(i)
+
+            with self._lock:
+                self._ids, self._names, self._other_names, self._counts = ids, names, other, counts
+                self._keys, self._texts, self._entry_artist = keys, texts, entry_artist
+                self._top = top
+                self._row_by_id = {artist_id: row for row, artist_id in enumerate(ids)}
+                self._overlay, self._overlay_names, self._shadowed = {}, {}, set()
+                self.generation = generation[0] if generation else 0
+                self._stale = False
+            self._ready.set()
+            self.build_seconds = time.time() - started
+            self.stats['rebuilds'] += 1
+            logger.info(f"🔤 Autocomplete index built: {len(keys)} names and aliases "
+                        f"in {self.build_seconds:.2f}s")
+
+    def rebuild_in_background(self):
+        """Start a rebuild unless one is already running"""
+        if self._rebuild_lock.locked():
+            return
+        threading.Thread(target=self._safe_rebuild, daemon=True, name='autocomplete-rebuild').start()
+
+    def _safe_rebuild(self):
+        try:
+            self.rebuild()
+        except Exception as e:
+            logger.warning(f"Autocomplete index rebuild failed: {e}")
+
+    # -- incremental updates -------------------------------------------------
+
+    def apply_commit(self, ops):
+        """GroupCommitWriter listener: fold committed artist writes into the overlay"""
+        with self._lock:
+            for op in ops:
+                if op.kind == 'artists':
+                    for row in op.rows:
+                        self._upsert(row[0], row[1] or '', row[2] or 0, split_aliases(row[3]))
+                elif op.kind == 'post_counts':
+                    for post_count, artist_id in op.rows:
+                        current = self._lookup(artist_id)
+                        if current is not None:
+                            self._upsert(artist_id, current[0], post_count or 0, current[2])
+                else:
+                    # Writes the overlay can't model exactly (merges, raw SQL)
+                    self._stale = True
+            if self.generation is not None:
+                self.generation += 1
+            needs_rebuild = self._stale or len(self._overlay) > self.max_overlay
+        self.stats['overlay_updates'] += 1
+        if needs_rebuild and self.ready:
+            self.rebuild_in_background()
+
+    def _lookup(self, artist_id: int) -> Optional[Tuple[str, int, List[str]]]:
+        if artist_id in self._overlay:
+            return self._overlay[artist_id]
+        row = self._row_by_id.get(artist_id)
+        if row is None or artist_id in self._shadowed:
+            return None
+        return self._names[row], self._counts[row], split_aliases(self._other_names[row])
+
+    def _upsert(self, artist_id: int, name: str, post_count: int, aliases: List[str]):
+        if artist_id in self._row_by_id:
+            self._shadowed.add(artist_id)
+        # INSERT OR REPLACE drops any other artist holding the same (unique) name
+        for i in self._range_of(normalize(name), exact=True):
+            other_id = self._ids[self._entry_artist[i]]
+            if other_id != artist_id and self._names[self._entry_artist[i]] == name:
+                self._shadowed.add(other_id)
+        other_id = self._overlay_names.get(name)
+        if other_id is not None and other_id != artist_id:
+            del self._overlay[other_id]
+        previous = self._overlay.get(artist_id)
+        if previous is not None and self._overlay_names.get(previous[0]) == artist_id:
+            del self._overlay_names[previous[0]]
+        self._overlay[artist_id] = (name, post_count, aliases)
+        self._overlay_names[name] = artist_id
+
+    # -- queries -------------------------------------------------------------
+
+    def _range_of(self, key: str, exact: bool = False) -> range:
+        lo = bisect.bisect_left(self._keys, key)
+        hi = bisect.bisect_right(self._keys, key, lo) if exact else \
+            bisect.bisect_left(self._keys, key + '\U0010ffff', lo)
+        return range(lo, hi)
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Dict]:
+        """Top artists whose name or alias starts with prefix, by post count
+
+        Each artist appears once, with the best-matching text (its name when
+        both the name and an alias match).
+        """
+        key = normalize(prefix)
+        limit = max(1, min(int(limit), MAX_LIMIT))
+        if not key:
+            return []
+        self.stats['queries'] += 1
+
+        with self._lock:
+            shadowed = self._shadowed
+            if len(key) <= PRECOMPUTED_PREFIX_LENGTH:
+                positions = self._top.get(key, [])
+                # Enough unshadowed precomputed entries? Otherwise scan the range
+                if sum(1 for i in positions if self._ids[self._entry_artist[i]] not in shadowed) < limit \
+                        and len(positions) >= PRECOMPUTED_TOP:
+                    positions = self._best_in_range(key, 2 * limit + len(shadowed))
+            else:
+                positions = self._best_in_range(key, 2 * limit + len(shadowed))
+
+            candidates: Dict[int, Dict] = {}
+            for i in positions:
+                row = self._entry_artist[i]
+                artist_id = self._ids[row]
+                if artist_id in shadowed:
+                    continue
+                self._add_candidate(candidates, artist_id, self._names[row], self._texts[i],
+                                    self._counts[row])
+
+            for artist_id, (name, post_count, aliases) in self._overlay.items():
+                for text in [name] + aliases:
+                    if normalize(text).startswith(key):
+                        self._add_candidate(candidates, artist_id, name, text, post_count)
+
+        ranked = sorted(candidates.values(), key=lambda c: (-c['post_count'], c['name']))
+        return ranked[:limit]
+
+    def _best_in_range(self, key: str, count: int) -> List[int]:
+        entries = self._range_of(key)
+        if len(entries) <= count:
+            return list(entries)
+        counts, entry_artist = self._counts, self._entry_artist
+        return heapq.nlargest(count, entries, key=lambda i: counts[entry_artist[i]])
+
+    @staticmethod
+    def _add_candidate(candidates: Dict[int, Dict], artist_id: int, name: str, text: str, post_count: int):
+        existing = candidates.get(artist_id)
+        if existing is not None and (existing['match'] == name or text != name):
+            return
+        candidates[artist_id] = {
+            'id': artist_id,
+            'name': name,
+            'match': text,
+            'is_alias': text != name,
+            'post_count': post_count
+        }
+
+    def is_fresh(self, generation: int) -> bool:
+        return not self._stale and self.generation == generation
+
+    def get_stats(self) -> Dict:
+        return dict(self.stats, ready=self.ready, entries=len(self._keys), artists=len(self._ids),
+                    overlay=len(self._overlay), shadowed=len(self._shadowed),
+                    precomputed_prefixes=len(self._top), generation=self.generation,
+                    build_seconds=round(self.build_seconds, 3))
+
+
+def query_suggestions(conn, prefix: str, limit: int = 10) -> List[Dict]:
+    """Same answer as AutocompleteIndex.suggest, straight from SQLite (slow path)
+
+    Used while the index is still building. LIKE treats '_' as a wildcard, so
+    matches are re-checked against the normalized key.
+    """
+    key = normalize(prefix)
+    limit = max(1, min(int(limit), MAX_LIMIT))
+    if not key:
+        return []
+    rows = conn.execute(
+        "SELECT id, name, post_count, other_names FROM artists "
+        "WHERE name LIKE ? OR other_names LIKE ? OR other_names LIKE ? "
+        "ORDER BY post_count DESC LIMIT ?",
+        (f"{key}%", f"{key}%", f"%, {key}%", limit * 4)
+    ).fetchall()
+    candidates: Dict[int, Dict] = {}
+    for artist_id, name, post_count, other_names in rows:
+        for text in [name or ''] + split_aliases(other_names):
+            if normalize(text).startswith(key):
+                AutocompleteIndex._add_candidate(candidates, artist_id, name, text, post_count or 0)
+    ranked = sorted(candidates.values(), key=lambda c: (-c['post_count'], c['name']))
+    return ranked[:limit]
@@ -0,0 +1,476 @@
+"""
+Shared SQLite connection management
+
+One ConnectionManager per database file (per process) is shared by the scraper,
+the web app and the maintenance scripts. Readers borrow already-open
+connections from a small pool, so request handlers don't pay for opening the
+file and parsing the schema, and each connection keeps its prepared statement
+cache. Writes go through a single writer connection behind a lock, and bulk
+upserts from any number of producers are funneled through one
+GroupCommitWriter thread. Every connection is configured once with WAL, mmap
+and cache pragmas.
+
+A manager opened with read_only=True serves a published snapshot (see
+publish_snapshot) as an immutable, memory-mapped file: no locking, no WAL
+checks and no write paths, and every process maps the same pages.
+"""
+
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import quote
+
+# Per-connection tuning, overridable from the environment
+MMAP_SIZE = int(float(os.getenv('SQLITE_MMAP_MB', 256)) * 1024 * 1024)
+CACHE_SIZE_KB = int(float(os.getenv('SQLITE_CACHE_MB', 16)) * 1024)
+BUSY_TIMEOUT = 30.0
+
+# Group commit triggers: whichever comes first
+GROUP_COMMIT_ROWS = int(os.getenv('SQLITE_GROUP_COMMIT_ROWS', 2000))
+GROUP_COMMIT_MS = float(os.getenv('SQLITE_GROUP_COMMIT_MS', 10))
+
+logger = logging.getLogger(__name__)
+
+
+class ReadOnlyDatabaseError(RuntimeError):
+    """A write was attempted on a database opened in read-only serving mode"""
+
+
+class ConnectionManager:
+    """Pooled reader connections plus one writer connection for a SQLite file"""
+
+    def __init__(self, db_path: str, max_idle_readers: int = 8, read_only: bool = False):
+        self.db_path = db_path
+        self.read_only = read_only
+        self.max_idle_readers = max_idle_readers
+        self._idle_readers: List[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+        self._write_lock = threading.RLock()
+        self._writer = None
+        self._group_writer = None
+        self.stats = {'connections_opened': 0, 'reads': 0, 'writes': 0}
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.read_only:
+            return self._connect_immutable()
+        conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+        conn.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KB}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        self.stats['connections_opened'] += 1
+        return conn
+
+    def _connect_immutable(self) -> sqlite3.Connection:
+        if not os.path.exists(self.db_path):
+            raise FileNotFoundError(f"Database snapshot not found: {self.db_path}")
+        uri = f"file:{quote(os.path.abspath(self.db_path))}?mode=ro&immutable=1"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        # Map the whole file so queries read straight from the shared page cache
+        conn.execute(f"PRAGMA mmap_size={max(MMAP_SIZE, os.path.getsize(self.db_path))}")
+        conn.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KB}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA query_only=1")
+        self.stats['connections_opened'] += 1
+        return conn
+
+    def warm(self) -> int:
+        """Pull the whole database file into the OS page cache; returns bytes read"""
+        warmed = 0
+        with open(self.db_path, 'rb') as db_file:
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(db_file.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+            while True:
+                chunk = db_file.read(1024 * 1024)
+                if not chunk:
+                    break
+                warmed += len(chunk)
+        # Open the pool's first connection (and parse the schema) up front too
+        with self.read() as conn:
+            conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+        return warmed
+
+    @contextmanager
+    def read(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a reader connection for the duration of the block"""
+        with self._readers_lock:
+            conn = self._idle_readers.pop() if self._idle_readers else None
+            self.stats['reads'] += 1
+        if conn is None:
+            conn = self._connect()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            with self._readers_lock:
+                if len(self._idle_readers) < self.max_idle_readers:
+                    self._idle_readers.append(conn)
+                    conn = None
+            if conn is not None:
+                conn.close()
+
+    def open_reader(self) -> sqlite3.Connection:
+        """A dedicated, configured connection for long-running reads; the caller closes it"""
+        return self._connect()
+
+    @contextmanager
+    def write(self) -> Iterator[sqlite3.Connection]:
+        """Run the block in a transaction on the shared writer connection
+
+        Commits when the block exits normally and rolls back on an exception.
+        Writers from all threads are serialized.
+        """
+        if self.read_only:
+            raise ReadOnlyDatabaseError(f"{self.db_path} is opened read-only")
+        with self._write_lock:
+            if self._writer is None:
+                self._writer = self._connect()
+            conn = self._writer
+            self.stats['writes'] += 1
+            try:
+                yield conn
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+
+    def group_writer(self, commit_hook: Callable[[sqlite3.Connection], None] = None) -> 'GroupCommitWriter':
+        """The manager's GroupCommitWriter, started on first use
+
+        commit_hook (taken from the first caller) runs inside every group
+        commit transaction.
+        """
+        if self.read_only:
+            raise ReadOnlyDatabaseError(f"{self.db_path} is opened read-only")
+        with self._write_lock:
+            if self._group_writer is None:
+                self._group_writer = GroupCommitWriter(self, commit_hook=commit_hook)
+            return self._group_writer
+
+    def get_stats(self) -> Dict:
+        with self._readers_lock:
+            idle = len(self._idle_readers)
+        return dict(self.stats, idle_readers=idle, db_path=self.db_path, read_only=self.read_only)
+
+    def close(self):
+        if self._group_writer is not None:
+            self._group_writer.close()
+        with self._readers_lock:
+            readers, self._idle_readers = self._idle_readers, []
+        for conn in readers:
+            conn.close()
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+
+class WriteTicket:
+    """Completion handle for a write submitted to a GroupCommitWriter"""
+
+    def __init__(self):
+        self._done = threading.Event()
+        self.error: Optional[BaseException] = None
+        # Rows the writer logged and skipped while the rest of the op committed
+        self.failed_rows: List = []
+
+    def _finish(self, error: BaseException = None):
+        self.error = error
+        self._done.set()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: float = None) -> bool:
+        """Block until the write is committed; re-raises its error if it failed"""
+        if not self._done.wait(timeout):
+            return False
+        if self.error is not None:
+            raise self.error
+        return True
+
+
+class WriteOp:
+    """One executemany call queued for the next group commit"""
+
+    __slots__ = ('kind', 'statement', 'rows', 'ticket')
+
+    def __init__(self, kind: str, statement: Optional[str], rows: Sequence):
+        self.kind = kind
+        self.statement = statement
+        self.rows = rows
+        self.ticket = WriteTicket()
+
+
+class GroupCommitWriter:
+    """Single writer thread that batches queued writes into group commits
+
+    Producers submit statements with their rows and get a WriteTicket back.
+    The writer thread commits whatever has queued up once max_batch_rows rows
+    are pending or max_delay_ms has passed since the first of them, so many
+    small writes from several threads share one transaction. Readers are
+    unaffected thanks to WAL. If a group fails, each op is retried in its own
+    transaction, and failing rows are logged, skipped and listed in the op's
+    ticket.failed_rows.
+    """
+
+    def __init__(self, manager: ConnectionManager, max_batch_rows: int = GROUP_COMMIT_ROWS,
+                 max_delay_ms: float = GROUP_COMMIT_MS, commit_hook: Callable[[sqlite3.Connection], None] = None):
+        self.manager = manager
+        self.max_batch_rows = max_batch_rows
+        self.max_delay = max_delay_ms / 1000.0
+        self.commit_hook = commit_hook
+        self._queue: 'queue.Queue[Optional[WriteOp]]' = queue.Queue()
+        self._listeners: List[Callable[[List[WriteOp]], None]] = []
+        self._thread = None
+        self._thread_lock = threading.Lock()
+        self.stats = {'ops': 0, 'rows': 0, 'commits': 0, 'fallbacks': 0, 'failed_rows': 0,
+                      'lock_retries': 0, 'largest_commit_rows': 0}
+
+    def add_commit_listener(self, listener: Callable[[List[WriteOp]], None]):
+        """Call listener(ops) on the writer thread after each successful commit"""
+        self._listeners.append(listener)
+
+    def submit(self, kind: str, statement: str, rows: Sequence) -> WriteTicket:
+        """Queue rows for statement (run with executemany) and return its ticket"""
+        op = WriteOp(kind, statement, list(rows))
+        self._ensure_thread()
+        self._queue.put(op)
+        return op.ticket
+
+    def flush(self, timeout: float = None) -> bool:
+        """Wait until everything submitted so far has been committed"""
+        ticket = self.submit('barrier', None, [])
+        return ticket.wait(timeout)
+
+    def close(self):
+        with self._thread_lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+    def get_stats(self) -> Dict:
+        commits = self.stats['commits']
+        return dict(self.stats, pending_ops=self._queue.qsize(),
+                    avg_rows_per_commit=round(self.stats['rows'] / commits, 1) if commits else 0)
+
+    def _ensure_thread(self):
+        with self._thread_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="sqlite-group-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            op = self._queue.get()
+            if op is None:
+                return
+            batch = [op]
+            rows = len(op.rows)
+            deadline = time.time() + self.max_delay
+            stopping = False
+            while rows < self.max_batch_rows:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                try:
+                    op = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if op is None:
+                    stopping = True
+                    break
+                batch.append(op)
+                rows += len(op.rows)
+            self._commit(batch)
+            if stopping:
+                return
+
+    def _commit(self, batch: List[WriteOp]):
+        writes = [op for op in batch if op.rows]
+        if writes:
+            try:
+                try:
+                    self._commit_group(writes)
+                except sqlite3.Error as e:
+                    logger.warning(f"Group commit of {len(writes)} writes failed ({e}); retrying individually")
+                    self.stats['fallbacks'] += 1
+                    for op in writes:
+                        self._commit_single(op)
+            except Exception as e:
+                logger.error(f"Group commit failed: {e}")
+                for op in writes:
+                    if not op.ticket.done:
+                        op.ticket._finish(e)
+            self.stats['ops'] += len(writes)
+            self.stats['rows'] += sum(len(op.rows) for op in writes)
+        for op in batch:
+            if not op.ticket.done:
+                op.ticket._finish()
+
+    def _commit_group(self, ops: List[WriteOp], attempts: int = 3):
+        for attempt in range(attempts):
+            try:
+                with self.manager.write() as conn:
+                    for op in ops:
+                        conn.executemany(op.statement, op.rows)
+                    if self.commit_hook:
+                        self.commit_hook(conn)
+                break
+            except sqlite3.OperationalError as e:
+                # Another process holds the lock past busy_timeout: back off and retry
+                if 'locked' not in str(e) or attempt == attempts - 1:
+                    raise
+                self.stats['lock_retries'] += 1
+                time.sleep(0.1 * (2 ** attempt))
+        self._committed(ops)
+
+    def _commit_single(self, op: WriteOp):
+        try:
+            self._commit_group([op])
+            return
+        except sqlite3.Error:
+            pass
+        try:
+            with self.manager.write() as conn:
+                for row in op.rows:
+                    try:
+                        conn.execute(op.statement, row)
+                    except sqlite3.Error as e:
+                        self.stats['failed_rows'] += 1
+                        op.ticket.failed_rows.append(row)
+                        logger.error(f"Database error writing {op.kind} row {row!r}: {e}")
+                if self.commit_hook:
+                    self.commit_hook(conn)
+            self._committed([op])
+        except sqlite3.Error as e:
+            op.ticket._finish(e)
+
+    def _committed(self, ops: List[WriteOp]):
+        self.stats['commits'] += 1
+        self.stats['largest_commit_rows'] = max(self.stats['largest_commit_rows'],
+                                                sum(len(op.rows) for op in ops))
+        for listener in self._listeners:
+            try:
+                listener(ops)
+            except Exception as e:
+                logger.warning(f"Commit listener failed: {e}")
+
+
+_managers: Dict[Tuple[int, str, bool], ConnectionManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_connection_manager(db_path: str, read_only: bool = False) -> ConnectionManager:
+    """The process-wide ConnectionManager for db_path
+
+    Keyed by process id as well, so a forked child never reuses connections
+    inherited from its parent.
+    """
+    key = (os.getpid(), os.path.abspath(db_path), read_only)
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = ConnectionManager(db_path, read_only=read_only)
+            _managers[key] = manager
+            logger.debug(f"Opened connection manager for {db_path}")
+        return manager
+
+
+# Tables a read-only server queries; older databases may predate some of them
+SNAPSHOT_TABLES = ('artists', 'db_meta', 'artist_names')
+
+
+def check_snapshot(db_path: str, require_published: bool = True) -> Optional[str]:
+    """Why db_path can't be served read-only, or None if it can
+
+    A servable snapshot is a single file in rollback-journal mode with the
+    current schema. With require_published, it must also carry the marker
+    publish_snapshot writes, so a live database is never opened immutable.
+    """
+    if not os.path.exists(db_path):
+        return "database file does not exist"
+    wal_path = f"{db_path}-wal"
+    if os.path.exists(wal_path) and os.path.getsize(wal_path) > 0:
+        return "database has an uncheckpointed WAL (it is being written to)"
+    with open(db_path, 'rb') as f:
+        header = f.read(100)
+    if len(header) < 100 or not header.startswith(b'SQLite format 3\x00'):
+        return "not an SQLite database"
+    if header[18] == 2:
+        return "database is in WAL mode (publish a snapshot with `python db.py snapshot`)"
+
+    try:
+        conn = sqlite3.connect(f"file:{quote(os.path.abspath(db_path))}?mode=ro", uri=True)
+        try:
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            missing = [table for table in SNAPSHOT_TABLES if table not in tables]
+            if missing:
+                return f"schema is out of date (missing {', '.join(missing)})"
+            if require_published and conn.execute(
+                    "SELECT 1 FROM db_meta WHERE key = 'snapshot_published_at'").fetchone() is None:
+                return "database was not published with publish_snapshot"
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        return f"database can't be opened read-only: {e}"
+    return None
+
+
+def publish_snapshot(db_path: str, snapshot_path: str) -> str:
+    """Write a compacted, self-contained copy of db_path for read-only serving
+
+    Uses VACUUM INTO on a live connection (consistent even while the scraper
+    writes) and renames the result into place atomically. Serving processes
+    open snapshots as immutable, so restart them to pick up a new one.
+    """
+    snapshot_path = os.path.abspath(snapshot_path)
+    tmp_path = f"{snapshot_path}.tmp-{os.getpid()}"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    conn = get_connection_manager(db_path).open_reader()
+    try:
+        conn.execute("PRAGMA optimize")
+        conn.execute("VACUUM INTO ?", (tmp_path,))
+    finally:
+        conn.close()
+
+    # A snapshot is a single file: no WAL needed to read it. The marker lets
+    # servers tell it apart from a live database (see check_snapshot).
+    snapshot = sqlite3.connect(tmp_path)
+    snapshot.execute("PRAGMA journal_mode=DELETE")
+    snapshot.execute("INSERT OR REPLACE INTO db_meta (key, value) VALUES ('snapshot_published_at', ?)",
+                     (int(time.time()),))
+    snapshot.commit()
+    snapshot.close()
+    os.replace(tmp_path, snapshot_path)
+    logger.info(f"📸 Published snapshot of {db_path} to {snapshot_path} "
+                f"({os.path.getsize(snapshot_path) / 1024 / 1024:.1f} MB)")
+    return snapshot_path
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="SQLite database tools")
+    parser.add_argument('command', choices=['snapshot'])
+    parser.add_argument('--db', default=os.environ.get('ARTISTS_DB_PATH', 'artists.db'))
+    parser.add_argument('--output', default='artists-snapshot.db',
+                        help="Snapshot path to publish (replaced atomically)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    print(f"✅ Snapshot written to {publish_snapshot(args.db, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
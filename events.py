@@ -0,0 +1,87 @@
+"""
+Fan-out of scrape progress and rate limit events to Server-Sent Events clients
+"""
+
+import json
+import queue
+import threading
+from typing import Dict, Iterator, Optional
+
+
+class EventBroadcaster:
+    """Publish events to every subscribed client queue
+
+    Each SSE connection subscribes its own bounded queue. Publishing never
+    blocks: if a slow client's queue is full, its oldest event is dropped so
+    the scraper thread is never held up by the web tier.
+    """
+
+    def __init__(self, max_queue_size: int = 100):
+        self.max_queue_size = max_queue_size
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> queue.Queue:
+        """Register a new client and return the queue its events arrive on"""
+        client_queue = queue.Queue(maxsize=self.max_queue_size)
+        with self._lock:
+            self._subscribers.add(client_queue)
+        return client_queue
+
+    def unsubscribe(self, client_queue: queue.Queue):
+        with self._lock:
+            self._subscribers.discard(client_queue)
+
+    def publish(self, event_type: str, data: Dict):
+        """Send an event to all connected clients"""
+        with self._lock:
+            subscribers = list(self._subscribers)
+
+        for client_queue in subscribers:
+            try:
+                client_queue.put_nowait((event_type, data))
+            except queue.Full:
+                try:
+                    client_queue.get_nowait()
+                except queue.Empty:
+                    pass
+                try:
+                    client_queue.put_nowait((event_type, data))
+                except queue.Full:
+                    pass
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def stream(self, client_queue: queue.Queue, heartbeat: float = 10.0,
+               on_idle=None) -> Iterator[str]:
+        """Yield SSE-formatted messages for one client until it disconnects
+
+        on_idle, if given, is called every `heartbeat` seconds without traffic
+        and may return an (event_type, data) pair to send instead of a bare
+        keep-alive comment.
+        """
+        try:
+            while True:
+                try:
+                    event_type, data = client_queue.get(timeout=heartbeat)
+                except queue.Empty:
+                    idle_event = on_idle() if on_idle else None
+                    if idle_event is None:
+                        yield ": keep-alive\n\n"
+                        continue
+                    event_type, data = idle_event
+                yield format_sse(event_type, data)
+        finally:
+            self.unsubscribe(client_queue)
+
+
+def format_sse(event_type: str, data: Dict, event_id: Optional[str] = None) -> str:
+    """Format a single Server-Sent Events message"""
+    message = f"event: {event_type}\n"
+    if event_id is not None:
+        message += f"id: {event_id}\n"
+    message += f"data: {json.dumps(data, default=str)}\n\n"
+    return message
@@ -0,0 +1,228 @@
+"""
+On-disk HTTP cache for upstream Danbooru requests
+
+CachingAdapter is mounted on the scraper's requests.Session. Fresh responses
+(younger than their endpoint's TTL) are answered from disk without touching the
+network; stale ones are revalidated with If-None-Match / If-Modified-Since so
+unchanged data comes back as a cheap 304. The store is a single SQLite file
+bounded in size with least-recently-used eviction.
+
+Streamed requests (stream=True) can be answered from the cache but are never
+stored, since storing would read the whole body into memory before the
+caller sees the first byte.
+"""
+
+import json
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+# (URL path, TTL seconds): the path must match exactly, so /posts.json doesn't
+# catch /counts/posts.json; unmatched URLs are not cached.
+# Artist pages change slowly; post counts and previews move faster.
+DEFAULT_TTL_RULES: List[Tuple[str, float]] = [
+    ('/counts/posts.json', 600),
+    ('/artists.json', 6 * 3600),
+    ('/posts.json', 3600),
+]
+
+# Hop-by-hop or encoding headers that don't apply to the stored (decoded) body
+_DROPPED_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding', 'connection')
+
+
+class HTTPCache:
+    """Size-bounded SQLite store of response bodies and validators"""
+
+    def __init__(self, cache_dir: str, max_bytes: int = 256 * 1024 * 1024,
+                 ttl_rules: List[Tuple[str, float]] = None):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, "http_cache.sqlite")
+        self.max_bytes = max_bytes
+        self.ttl_rules = ttl_rules if ttl_rules is not None else DEFAULT_TTL_RULES
+        self.logger = logging.getLogger(__name__)
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+        ''')
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)")
+        self._conn.commit()
+        self.total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def ttl_for(self, url: str) -> float:
+        path = urlsplit(url).path
+        for rule_path, ttl in self.ttl_rules:
+            if path == rule_path:
+                return ttl
+        return 0
+
+    @staticmethod
+    def key_for(request: requests.PreparedRequest) -> str:
+        """Cache key: URL plus credentials, since results can differ per account"""
+        identity = request.headers.get('Authorization', '')
+        return hashlib.sha256(f"{request.method} {request.url} {identity}".encode()).hexdigest()
+
+    def lookup(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, headers, body, etag, last_modified, stored_at FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        return {
+            'url': row[0],
+            'headers': json.loads(row[1]),
+            'body': zlib.decompress(row[2]),
+            'etag': row[3],
+            'last_modified': row[4],
+            'stored_at': row[5]
+        }
+
+    def is_fresh(self, request: requests.PreparedRequest) -> bool:
+        """True if the request would be answered from disk without a network round trip"""
+        ttl = self.ttl_for(request.url)
+        if request.method != 'GET' or ttl <= 0:
+            return False
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT stored_at FROM responses WHERE key = ?", (self.key_for(request),)
+            ).fetchone()
+        return row is not None and time.time() - row[0] < ttl
+
+    def store(self, key: str, response: requests.Response):
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in _DROPPED_HEADERS}
+        body = zlib.compress(response.content)
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, url, headers, body, etag, last_modified, stored_at, last_access, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, response.url, json.dumps(headers), body, response.headers.get('ETag'),
+                 response.headers.get('Last-Modified'), now, now, len(body))
+            )
+            self.total_bytes += len(body) - (old[0] if old else 0)
+            self.stats['stores'] += 1
+            self._evict()
+            self._conn.commit()
+
+    def touch(self, key: str):
+        """Mark a revalidated entry as fresh again"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("UPDATE responses SET stored_at = ?, last_access = ? WHERE key = ?",
+                               (now, now, key))
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop least recently used entries down to 90% of max_bytes (lock held)"""
+        if self.total_bytes <= self.max_bytes:
+            return
+        target = self.max_bytes * 0.9
+        rows = self._conn.execute("SELECT key, size FROM responses ORDER BY last_access").fetchall()
+        for key, size in rows:
+            if self.total_bytes <= target:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self.total_bytes -= size
+            self.stats['evictions'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self.total_bytes = 0
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return dict(self.stats, entries=entries, total_bytes=self.total_bytes, max_bytes=self.max_bytes)
+
+
+class CachingAdapter(HTTPAdapter):
+    """HTTPAdapter that serves GETs from an HTTPCache and revalidates stale entries"""
+
+    def __init__(self, cache: HTTPCache, **kwargs):
+        super().__init__(**kwargs)
+        self.cache = cache
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        ttl = self.cache.ttl_for(request.url)
+        # Callers that need current data send Cache-Control: no-cache to skip the cache
+        if request.method != 'GET' or ttl <= 0 or 'no-cache' in request.headers.get('Cache-Control', ''):
+            return super().send(request, **kwargs)
+
+        key = self.cache.key_for(request)
+        entry = self.cache.lookup(key)
+        if entry is not None and time.time() - entry['stored_at'] < ttl:
+            self.cache.stats['hits'] += 1
+            return self._cached_response(request, entry)
+
+        if entry is not None:
+            request = request.copy()
+            if entry['etag']:
+                request.headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                request.headers['If-Modified-Since'] = entry['last_modified']
+
+        response = super().send(request, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            self.cache.stats['revalidated'] += 1
+            self.cache.touch(key)
+            cached = self._cached_response(request, entry)
+            cached.revalidated = True
+            # Keep the fresh rate limit headers from the 304
+            cached.headers.update({k: v for k, v in response.headers.items()
+                                   if k.lower() not in _DROPPED_HEADERS})
+            response.close()
+            return cached
+
+        self.cache.stats['misses'] += 1
+        if response.status_code == 200 and not kwargs.get('stream'):
+            try:
+                self.cache.store(key, response)
+            except sqlite3.Error as e:
+                self.cache.logger.warning(f"HTTP cache store failed for {request.url}: {e}")
+        return response
+
+    def _cached_response(self, request: requests.PreparedRequest, entry: Dict) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response._content = entry['body']
+        response._content_consumed = True
+        response.from_cache = True
+        return response
@@ -0,0 +1,461 @@
+"""
+Job queue for scrape, sync, post count and verification runs with cooperative cancellation
+"""
+
+import itertools
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+
+# Job lifecycle states
+QUEUED = 'queued'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+FINISHED_STATES = (COMPLETED, FAILED, CANCELLED)
+
+
+class Job:
+    """A unit of scraper work with its own cancellation token and metrics"""
+
+    def __init__(self, job_id: str, kind: str, params: Dict):
+        self.id = job_id
+        self.kind = kind
+        self.params = params
+        self.state = QUEUED
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.error = None
+        self.metrics: Dict = {}
+        self.cancel_event = threading.Event()
+
+    @property
+    def is_finished(self) -> bool:
+        return self.state in FINISHED_STATES
+
+    def to_dict(self) -> Dict:
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'params': self.params,
+            'state': self.state,
+            'cancel_requested': self.cancel_event.is_set(),
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'result': self.result,
+            'error': self.error,
+            'metrics': self.metrics
+        }
+
+
+def _run_scrape(scraper, job: Job, on_progress: Callable[[Dict], None]):
+    params = job.params
+    return scraper.scrape_all_pages(
+        start_page=int(params.get('start_page', 0)),
+        max_pages=int(params['max_pages']) if params.get('max_pages') else None,
+        fetch_post_counts=bool(params.get('fetch_post_counts', True)),
+        progress_callback=on_progress,
+        cancel_event=job.cancel_event
+    )
+
+
+def _run_sync(scraper, job: Job, on_progress: Callable[[Dict], None]):
+    """Fast metadata refresh: re-scrape pages without per-artist post counts"""
+    params = job.params
+    return scraper.scrape_all_pages(
+        start_page=int(params.get('start_page', 0)),
+        max_pages=int(params['max_pages']) if params.get('max_pages') else None,
+        fetch_post_counts=False,
+        progress_callback=on_progress,
+        cancel_event=job.cancel_event
+    )
+
+
+def _run_post_counts(scraper, job: Job, on_progress: Callable[[Dict], None]):
+    params = job.params
+    return scraper.update_post_counts(
+        limit=int(params['limit']) if params.get('limit') else None,
+        progress_callback=on_progress,
+        cancel_event=job.cancel_event
+    )
+
+
+def _run_verify(scraper, job: Job, on_progress: Callable[[Dict], None]):
+    """Consistency sweep: compare id ranges with upstream, refetch only what differs"""
+    params = job.params
+    return scraper.verify_catalogue(
+        start_id=int(params.get('start_id', 1)),
+        end_id=int(params['end_id']) if params.get('end_id') else None,
+        range_size=int(params.get('range_size', 1000)),
+        progress_callback=on_progress,
+        cancel_event=job.cancel_event
+    )
+
+
+JOB_RUNNERS = {
+    'scrape': _run_scrape,
+    'sync': _run_sync,
+    'post_counts': _run_post_counts,
+    'verify': _run_verify,
+}
+
+
+class JobManager:
+    """Run queued jobs against a shared scraper on a bounded pool of worker threads
+
+    The pool defaults to a single worker because every job draws from the same
+    upstream rate budget; extra jobs wait in the queue. Cancellation is
+    cooperative: the job's cancel_event is checked by the scraper between
+    requests.
+    """
+
+    def __init__(self, scraper, max_workers: int = 1, max_finished_jobs: int = 100,
+                 on_update: Callable[[Job], None] = None):
+        self.scraper = scraper
+        self.max_workers = max_workers
+        self.max_finished_jobs = max_finished_jobs
+        self.on_update = on_update
+        self.logger = logging.getLogger(__name__)
+
+        self._jobs: Dict[str, Job] = {}
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._workers: List[threading.Thread] = []
+
+    def _ensure_workers(self):
+        with self._lock:
+            self._workers = [t for t in self._workers if t.is_alive()]
+            while len(self._workers) < self.max_workers:
+                worker = threading.Thread(target=self._worker_loop, daemon=True,
+                                          name=f"job-worker-{len(self._workers) + 1}")
+                worker.start()
+                self._workers.append(worker)
+
+    def submit(self, kind: str, params: Dict = None) -> Job:
+        """Queue a job; raises ValueError for unknown job kinds"""
+        if kind not in JOB_RUNNERS:
+            raise ValueError(f"Unknown job kind '{kind}' (expected one of: {', '.join(JOB_RUNNERS)})")
+
+        job = Job(f"job-{next(self._ids)}-{int(time.time())}", kind, dict(params or {}))
+        self.enqueue(job)
+        self._notify(job)
+        return job
+
+    def enqueue(self, job: Job):
+        """Queue an already-created job (e.g. one claimed from a SQLiteJobStore)"""
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune_finished()
+        self._queue.put(job)
+        self.logger.info(f"📥 Queued {job.kind} job {job.id}")
+        self._ensure_workers()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self, kinds: List[str] = None, active_only: bool = False) -> List[Job]:
+        with self._lock:
+            jobs = list(self._jobs.values())
+        if kinds:
+            jobs = [job for job in jobs if job.kind in kinds]
+        if active_only:
+            jobs = [job for job in jobs if not job.is_finished]
+        return sorted(jobs, key=lambda job: job.created_at)
+
+    def active_count(self) -> int:
+        """Number of jobs that are queued or running"""
+        return len(self.list(active_only=True))
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Request cancellation; queued jobs are cancelled immediately
+
+        The check and the transition happen under the lock the workers take for
+        theirs, so a job finishing at the same moment keeps its final state.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.is_finished:
+                return job
+
+            job.cancel_event.set()
+            if job.state == QUEUED:
+                job.state = CANCELLED
+                job.finished_at = time.time()
+        self.logger.info(f"🛑 Cancellation requested for job {job.id}")
+        self._notify(job)
+        return job
+
+    def _worker_loop(self):
+        while True:
+            job = self._queue.get()
+            try:
+                with self._lock:
+                    claimed = job.state == QUEUED
+                    if claimed:
+                        job.state = RUNNING
+                        job.started_at = time.time()
+                if claimed:
+                    self._run(job)
+            finally:
+                self._queue.task_done()
+
+    def _run(self, job: Job):
+        """Run a job already moved to RUNNING by _worker_loop"""
+        self._notify(job)
+
+        def on_progress(event: Dict):
+            job.metrics = event
+            self._notify(job)
+
+        state = COMPLETED
+        try:
+            job.result = JOB_RUNNERS[job.kind](self.scraper, job, on_progress)
+        except Exception as e:
+            self.logger.error(f"💥 Job {job.id} failed: {e}")
+            job.error = str(e)
+            state = FAILED
+        finally:
+            with self._lock:
+                if state == COMPLETED and job.cancel_event.is_set():
+                    state = CANCELLED
+                job.state = state
+                job.finished_at = time.time()
+            self._notify(job)
+
+    def _notify(self, job: Job):
+        if self.on_update:
+            try:
+                self.on_update(job)
+            except Exception as e:
+                self.logger.warning(f"Job update callback failed: {e}")
+
+    def _prune_finished(self):
+        """Forget the oldest finished jobs beyond max_finished_jobs (lock held)"""
+        finished = [job for job in self._jobs.values() if job.is_finished]
+        for job in sorted(finished, key=lambda job: job.created_at)[:-self.max_finished_jobs or None]:
+            del self._jobs[job.id]
+
+
+class SQLiteJobStore:
+    """Job table shared between web processes and the scraper worker process
+
+    Web processes submit, list and cancel jobs here; worker.py claims queued
+    jobs, runs them and writes back state and metrics. The worker also
+    publishes its scraper's rate limit status so any web process can show it.
+    """
+
+    def __init__(self, db_path: str = "jobs.db"):
+        self.db_path = db_path
+        self.setup_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def setup_database(self):
+        conn = self._connect()
+        conn.executescript('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                params TEXT NOT NULL,
+                state TEXT NOT NULL,
+                cancel_requested INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                result TEXT,
+                error TEXT,
+                metrics TEXT,
+                worker_id TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_state ON jobs(state, created_at);
+            CREATE TABLE IF NOT EXISTS workers (
+                worker_id TEXT PRIMARY KEY,
+                pid INTEGER,
+                heartbeat_at REAL NOT NULL,
+                rate_limit_status TEXT
+            );
+        ''')
+        conn.commit()
+        conn.close()
+
+    @staticmethod
+    def _row_to_job(row) -> Job:
+        (job_id, kind, params, state, cancel_requested, created_at, started_at,
+         finished_at, result, error, metrics) = row
+        job = Job(job_id, kind, json.loads(params))
+        job.state = state
+        job.created_at = created_at
+        job.started_at = started_at
+        job.finished_at = finished_at
+        job.result = json.loads(result) if result is not None else None
+        job.error = error
+        job.metrics = json.loads(metrics) if metrics else {}
+        if cancel_requested:
+            job.cancel_event.set()
+        return job
+
+    _JOB_COLUMNS = ("id, kind, params, state, cancel_requested, created_at, started_at, "
+                    "finished_at, result, error, metrics")
+
+    def submit(self, kind: str, params: Dict = None) -> Job:
+        """Queue a job for the worker; raises ValueError for unknown job kinds"""
+        if kind not in JOB_RUNNERS:
+            raise ValueError(f"Unknown job kind '{kind}' (expected one of: {', '.join(JOB_RUNNERS)})")
+
+        job = Job(f"job-{uuid.uuid4().hex[:12]}", kind, dict(params or {}))
+        conn = self._connect()
+        conn.execute(
+            "INSERT INTO jobs (id, kind, params, state, created_at) VALUES (?, ?, ?, ?, ?)",
+            (job.id, job.kind, json.dumps(job.params), job.state, job.created_at)
+        )
+        conn.commit()
+        conn.close()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        conn = self._connect()
+        row = conn.execute(f"SELECT {self._JOB_COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        conn.close()
+        return self._row_to_job(row) if row else None
+
+    def list(self, kinds: List[str] = None, active_only: bool = False, limit: int = 100) -> List[Job]:
+        query = f"SELECT {self._JOB_COLUMNS} FROM jobs WHERE 1=1"
+        params = []
+        if kinds:
+            query += f" AND kind IN ({', '.join('?' for _ in kinds)})"
+            params.extend(kinds)
+        if active_only:
+            query += " AND state IN (?, ?)"
+            params.extend([QUEUED, RUNNING])
+        query += " ORDER BY created_at DESC LIMIT ?"
+        params.append(limit)
+
+        conn = self._connect()
+        rows = conn.execute(query, params).fetchall()
+        conn.close()
+        return [self._row_to_job(row) for row in reversed(rows)]
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Flag a job for cancellation; queued jobs are cancelled immediately"""
+        conn = self._connect()
+        conn.execute(
+            "UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND state IN (?, ?)",
+            (job_id, QUEUED, RUNNING)
+        )
+        conn.execute(
+            "UPDATE jobs SET state = ?, finished_at = ? WHERE id = ? AND state = ?",
+            (CANCELLED, time.time(), job_id, QUEUED)
+        )
+        conn.commit()
+        conn.close()
+        return self.get(job_id)
+
+    # Worker-side operations
+
+    def claim_next(self, worker_id: str) -> Optional[Job]:
+        """Atomically move the oldest queued job to running for this worker"""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                f"SELECT {self._JOB_COLUMNS} FROM jobs WHERE state = ? ORDER BY created_at LIMIT 1",
+                (QUEUED,)
+            ).fetchone()
+            if row is None:
+                conn.rollback()
+                return None
+            conn.execute(
+                "UPDATE jobs SET state = ?, worker_id = ? WHERE id = ?",
+                (RUNNING, worker_id, row[0])
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        job = self._row_to_job(row)
+        job.state = QUEUED  # Still queued in the worker's in-process manager
+        return job
+
+    def update(self, job: Job):
+        """Write a job's state, result and metrics back to the table"""
+        conn = self._connect()
+        conn.execute(
+            "UPDATE jobs SET state = ?, started_at = ?, finished_at = ?, result = ?, "
+            "error = ?, metrics = ? WHERE id = ?",
+            (job.state, job.started_at, job.finished_at,
+             json.dumps(job.result) if job.result is not None else None,
+             job.error, json.dumps(job.metrics, default=str), job.id)
+        )
+        conn.commit()
+        conn.close()
+
+    def cancel_requested_ids(self, job_ids: List[str]) -> List[str]:
+        if not job_ids:
+            return []
+        conn = self._connect()
+        rows = conn.execute(
+            f"SELECT id FROM jobs WHERE cancel_requested = 1 AND id IN ({', '.join('?' for _ in job_ids)})",
+            job_ids
+        ).fetchall()
+        conn.close()
+        return [row[0] for row in rows]
+
+    def fail_orphaned_jobs(self, worker_id: str) -> int:
+        """Mark jobs left running by a previous worker as failed"""
+        conn = self._connect()
+        cursor = conn.execute(
+            "UPDATE jobs SET state = ?, finished_at = ?, error = ? WHERE state = ? AND "
+            "(worker_id IS NULL OR worker_id != ?)",
+            (FAILED, time.time(), 'Worker restarted while job was running', RUNNING, worker_id)
+        )
+        conn.commit()
+        conn.close()
+        return cursor.rowcount
+
+    def heartbeat(self, worker_id: str, rate_limit_status: Dict):
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO workers (worker_id, pid, heartbeat_at, rate_limit_status) VALUES (?, ?, ?, ?)",
+            (worker_id, os.getpid(), time.time(), json.dumps(rate_limit_status, default=str))
+        )
+        conn.commit()
+        conn.close()
+
+    def remove_worker(self, worker_id: str):
+        conn = self._connect()
+        conn.execute("DELETE FROM workers WHERE worker_id = ?", (worker_id,))
+        conn.commit()
+        conn.close()
+
+    def live_worker(self, max_age: float = 30.0) -> Optional[Dict]:
+        """Most recent worker heartbeat, or None if no worker is alive"""
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT worker_id, pid, heartbeat_at, rate_limit_status FROM workers "
+            "WHERE heartbeat_at >= ? ORDER BY heartbeat_at DESC LIMIT 1",
+            (time.time() - max_age,)
+        ).fetchone()
+        conn.close()
+        if row is None:
+            return None
+        return {
+            'worker_id': row[0],
+            'pid': row[1],
+            'heartbeat_at': row[2],
+            'rate_limit_status': json.loads(row[3]) if row[3] else {}
+        }
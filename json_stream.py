@@ -0,0 +1,95 @@
+"""
+Incremental parsing of top-level JSON arrays
+
+Lets page responses be parsed element by element straight off the socket, so
+only the current element (plus one network chunk) is held in memory instead of
+the whole body and a fully materialized list.
+"""
+
+import codecs
+import json
+from typing import Any, Iterable, Iterator
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+_DELIMITERS = _WHITESPACE + ',]'
+
+
+def iter_json_array(chunks: Iterable[bytes], encoding: str = 'utf-8') -> Iterator[Any]:
+    """Yield the elements of a JSON array delivered as a stream of byte chunks
+
+    Raises json.JSONDecodeError (a ValueError) if the stream is not a
+    well-formed array or ends early.
+    """
+    text_decoder = codecs.getincrementaldecoder(encoding)()
+    chunk_iter = iter(chunks)
+    buffer = ''
+    pos = 0
+    exhausted = False
+    started = False
+
+    def fill() -> bool:
+        """Append the next chunk to the buffer; False once the stream is exhausted"""
+        nonlocal buffer, pos, exhausted
+        if exhausted:
+            return False
+        try:
+            chunk = next(chunk_iter)
+        except StopIteration:
+            exhausted = True
+            buffer = buffer[pos:] + text_decoder.decode(b'', final=True)
+            pos = 0
+            return False
+        buffer = buffer[pos:] + text_decoder.decode(chunk)
+        pos = 0
+        return True
+
+    def skip_whitespace():
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buffer) or not fill():
+                return
+
+    skip_whitespace()
+    if pos >= len(buffer) or buffer[pos] != '[':
+        raise json.JSONDecodeError("Expected a JSON array", buffer, pos)
+    pos += 1
+
+    while True:
+        skip_whitespace()
+        if pos >= len(buffer):
+            raise json.JSONDecodeError("Unterminated JSON array", buffer, pos)
+
+        char = buffer[pos]
+        if char == ']':
+            pos += 1
+            skip_whitespace()
+            if pos < len(buffer):
+                raise json.JSONDecodeError("Extra data after JSON array", buffer, pos)
+            return
+        if started:
+            if char != ',':
+                raise json.JSONDecodeError("Expected ',' or ']'", buffer, pos)
+            pos += 1
+            skip_whitespace()
+
+        # Decode one element, pulling in more chunks while it is incomplete
+        while True:
+            try:
+                element, end = _decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if fill():
+                    continue
+                raise
+            # A number or literal not yet followed by a delimiter may continue
+            # in the next chunk ("12" of "123", "1.5" of "1.5e3")
+            if not exhausted and not isinstance(element, (dict, list, str)):
+                if not any(c in _DELIMITERS for c in buffer[end:]) and fill():
+                    continue
+            break
+
+        pos = end
+        started = True
+        yield element
@@ -0,0 +1,194 @@
+"""
+Request pacing with additive-increase/multiplicative-decrease (AIMD)
+
+The controller holds the current allowed request rate. Every success adds a
+little to it, up to max_rate. A 429 halves it, at most once per second so one
+burst of 429s counts once. A Retry-After is honoured as a pause of exactly
+that length, with no cooldown on top. Throughput recovers in seconds and
+oscillates just under the real limit.
+
+When the server sends rate limit headers (X-RateLimit-Remaining/Reset or the
+IETF RateLimit-Remaining/Reset), requests are paced proactively. What is
+left of the window is spread over the time until it resets, and an exhausted
+budget waits for the reset, so the limit is respected before any 429 happens.
+
+Callers take a slot with acquire() before each request. Slots are handed out
+under a lock, so threads sharing a controller share one rate budget.
+"""
+
+import threading
+import time
+from typing import Dict, Mapping, Optional, Tuple
+
+# Rate added per successful request (requests/second)
+ADDITIVE_INCREASE = 0.05
+# Factor applied to the rate on a 429
+MULTIPLICATIVE_DECREASE = 0.5
+# Minimum seconds between two decreases, so one burst of 429s counts once
+DECREASE_HOLDOFF = 1.0
+
+
+def parse_rate_limit_headers(headers: Mapping[str, str], now: float = None) -> Optional[Tuple[int, float]]:
+    """(remaining requests, reset time as epoch seconds) from rate limit headers, if present
+
+    Reset values above 1e9 are taken as epoch timestamps, smaller ones as
+    seconds from now.
+    """
+    if not headers:
+        return None
+    lowered = {key.lower(): value for key, value in headers.items()}
+    for prefix in ('x-ratelimit-', 'ratelimit-', 'x-rate-limit-'):
+        remaining, reset = lowered.get(prefix + 'remaining'), lowered.get(prefix + 'reset')
+        if remaining is None or reset is None:
+            continue
+        try:
+            remaining, reset = int(float(remaining)), float(reset)
+        except ValueError:
+            return None
+        now = time.time() if now is None else now
+        return max(remaining, 0), reset if reset > 1e9 else now + reset
+    return None
+
+
+def parse_retry_after(value: Optional[str], now: float = None) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delay-seconds or HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        from email.utils import parsedate_to_datetime
+        retry_at = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at - (time.time() if now is None else now), 0.0)
+
+
+class RateController:
+    """Thread-safe AIMD pacing, steered by rate limit headers when the server sends them"""
+
+    def __init__(self, rate: float, max_rate: float = None, min_rate: float = 0.2,
+                 additive_increase: float = ADDITIVE_INCREASE,
+                 multiplicative_decrease: float = MULTIPLICATIVE_DECREASE):
+        self.base_rate = rate
+        self.rate = rate
+        # Bounds as configured; configure() widens the live ones from these
+        self._ceiling = max_rate or rate
+        self._floor = min_rate
+        self.max_rate = max(self._ceiling, rate)
+        self.min_rate = min(self._floor, rate)
+        self.additive_increase = additive_increase
+        self.multiplicative_decrease = multiplicative_decrease
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        # Server-reported budget: requests left and when the window resets
+        self._budget_remaining = None
+        self._budget_reset_at = 0.0
+        self.stats = {'acquired': 0, 'waited_seconds': 0.0, 'increases': 0, 'decreases': 0,
+                      'server_pauses': 0, 'header_updates': 0}
+
+    @property
+    def interval(self) -> float:
+        return 1.0 / self.rate
+
+    def configure(self, rate: float):
+        """Set the starting rate, widening the configured bounds only as far as it needs
+
+        The bounds are recomputed from the constructor's max_rate/min_rate each
+        time, so setting a faster rate and then restoring the old one restores
+        the old ceiling too.
+        """
+        with self._lock:
+            self.base_rate = self.rate = rate
+            self.max_rate = max(self._ceiling, rate)
+            self.min_rate = min(self._floor, rate)
+
+    def _effective_interval(self, now: float) -> float:
+        interval = 1.0 / self.rate
+        if self._budget_remaining and now < self._budget_reset_at:
+            # Spread what is left of the window over the time until it resets
+            interval = max(interval, (self._budget_reset_at - now) / self._budget_remaining)
+        return interval
+
+    def acquire(self) -> float:
+        """Wait for the next request slot; returns the seconds waited"""
+        with self._lock:
+            now = time.time()
+            slot = max(now, self._next_slot, self._paused_until)
+            if self._budget_remaining == 0 and now < self._budget_reset_at:
+                slot = max(slot, self._budget_reset_at)
+            self._next_slot = slot + self._effective_interval(slot)
+            if self._budget_remaining:
+                self._budget_remaining -= 1
+            self.stats['acquired'] += 1
+        wait = slot - now
+        if wait > 0:
+            self.stats['waited_seconds'] += wait
+            time.sleep(wait)
+        return max(wait, 0.0)
+
+    def observe(self, headers: Mapping[str, str]):
+        """Take the server's remaining budget from response headers"""
+        budget = parse_rate_limit_headers(headers)
+        if budget is None:
+            return
+        with self._lock:
+            self._budget_remaining, self._budget_reset_at = budget
+            self.stats['header_updates'] += 1
+
+    def on_success(self, headers: Mapping[str, str] = None):
+        """Additive increase after a request that wasn't throttled"""
+        self.observe(headers)
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.rate + self.additive_increase, self.max_rate)
+                self.stats['increases'] += 1
+
+    def on_throttle(self, headers: Mapping[str, str] = None, fallback_wait: float = 0.0,
+                    max_wait: float = 300.0) -> float:
+        """Multiplicative decrease after a 429; returns the pause before the next request
+
+        The pause is the server's Retry-After when given, otherwise fallback_wait,
+        capped at max_wait.
+        """
+        self.observe(headers)
+        retry_after = parse_retry_after((headers or {}).get('Retry-After'))
+        wait = min(retry_after if retry_after is not None else fallback_wait, max_wait)
+        with self._lock:
+            now = time.time()
+            if now - self._last_decrease >= DECREASE_HOLDOFF:
+                self.rate = max(self.rate * self.multiplicative_decrease, self.min_rate)
+                self._last_decrease = now
+                self.stats['decreases'] += 1
+            if retry_after is not None:
+                self.stats['server_pauses'] += 1
+            self._paused_until = max(self._paused_until, now + wait)
+        return wait
+
+    def paused_for(self) -> float:
+        """Seconds until requests may resume after a Retry-After or exhausted budget"""
+        now = time.time()
+        until = self._paused_until
+        if self._budget_remaining == 0 and now < self._budget_reset_at:
+            until = max(until, self._budget_reset_at)
+        return max(until - now, 0.0)
+
+    def get_stats(self) -> Dict:
+        now = time.time()
+        budget_active = self._budget_remaining is not None and now < self._budget_reset_at
+        return dict(
+            self.stats,
+            waited_seconds=round(self.stats['waited_seconds'], 2),
+            rate=round(self.rate, 2),
+            effective_rate=round(1.0 / self._effective_interval(now), 2),
+            base_rate=round(self.base_rate, 2),
+            max_rate=round(self.max_rate, 2),
+            min_rate=round(self.min_rate, 2),
+            budget_remaining=self._budget_remaining if budget_active else None,
+            budget_reset_in=round(self._budget_reset_at - now, 1) if budget_active else None,
+            paused_for=round(self.paused_for(), 1)
+        )
@@ -0,0 +1,81 @@
+"""
+Compact artist records
+
+Artists travel from parsing through SQLite writes and search results as
+tuple-backed records (named tuples with no per-instance __dict__) instead of
+eleven-key dicts. The tuple is already in table column order, so it can be
+handed straight to executemany. Records also answer dict-style lookups
+(record['name'], .get, .keys, .items) so existing callers keep working;
+call to_dict() at the JSON boundary.
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+from typing import Dict, Iterable, Tuple
+
+# Columns of the artists table, in table order
+ARTIST_COLUMNS = (
+    'id', 'name', 'post_count', 'other_names', 'group_name', 'url_string',
+    'is_active', 'created_at', 'updated_at', 'is_banned', 'is_deleted'
+)
+
+
+class _MappingAccess:
+    """Read-only dict-style access by column name for named tuple records"""
+
+    __slots__ = ()
+    _fields: Tuple[str, ...]
+    _positions: Dict[str, int]
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            try:
+                key = self._positions[key]
+            except KeyError:
+                raise KeyError(key) from None
+        return tuple.__getitem__(self, key)
+
+    def __contains__(self, key) -> bool:
+        return key in self._positions
+
+    def get(self, key: str, default=None):
+        position = self._positions.get(key)
+        return default if position is None else tuple.__getitem__(self, position)
+
+    def keys(self) -> Tuple[str, ...]:
+        return self._fields
+
+    def values(self) -> tuple:
+        return tuple(self)
+
+    def items(self) -> Iterable[tuple]:
+        return zip(self._fields, tuple.__iter__(self))
+
+    def to_dict(self) -> Dict:
+        return dict(zip(self._fields, tuple.__iter__(self)))
+
+
+def _make_record_class(name: str, columns: Tuple[str, ...]) -> type:
+    base = namedtuple(f'_{name}Base', columns)
+    return type(name, (_MappingAccess, base), {
+        '__slots__': (),
+        '_positions': {column: i for i, column in enumerate(columns)},
+    })
+
+
+class ArtistRecord(_make_record_class('_ArtistRecord', ARTIST_COLUMNS)):
+    """One full artists table row"""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_dict(cls, artist: Dict) -> 'ArtistRecord':
+        return cls._make(artist[column] for column in ARTIST_COLUMNS)
+
+
+@lru_cache(maxsize=None)
+def record_type(columns: Tuple[str, ...]) -> type:
+    """Record class for a column projection (ArtistRecord for the full row)"""
+    if tuple(columns) == ARTIST_COLUMNS:
+        return ArtistRecord
+    return _make_record_class('ArtistProjection', tuple(columns))
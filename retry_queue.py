@@ -0,0 +1,220 @@
+"""
+Durable queue of failed upstream fetches, retried in the background with backoff
+
+When a page or a post count lookup fails after its inline retries, the work
+is recorded in the retry_queue table of the artists database with the error
+and the time it may next be tried, instead of being counted as empty. A
+RetryDrainer thread picks up due entries, runs the matching handler and
+either removes the entry or pushes its next attempt out exponentially.
+Entries that keep failing are parked as 'dead' after max_attempts, so they
+stay visible instead of retrying forever.
+"""
+
+import json
+import logging
+import random
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Entry states
+PENDING = 'pending'
+DEAD = 'dead'
+
+# Delay before the first retry, doubled per failed attempt up to the maximum
+RETRY_BASE_DELAY = 30.0
+RETRY_MAX_DELAY = 3600.0
+MAX_RETRY_ATTEMPTS = 10
+
+
+class RetryQueue:
+    """Failed fetches keyed by (kind, key), e.g. ('page', 'a12') or ('post_count', name)"""
+
+    def __init__(self, db, base_delay: float = RETRY_BASE_DELAY, max_delay: float = RETRY_MAX_DELAY,
+                 max_attempts: int = MAX_RETRY_ATTEMPTS):
+        self.db = db
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_attempts = max_attempts
+        self.setup_database()
+
+    def setup_database(self):
+        with self.db.write() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS retry_queue (
+                    kind TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    state TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    last_error TEXT,
+                    next_attempt_at REAL NOT NULL,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (kind, key)
+                )
+            ''')
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_retry_queue_due ON retry_queue (state, next_attempt_at)")
+
+    def backoff(self, attempts: int) -> float:
+        """Seconds until the next try after `attempts` failures, with jitter"""
+        delay = min(self.base_delay * 2 ** max(attempts - 1, 0), self.max_delay)
+        return delay * random.uniform(0.8, 1.2)
+
+    def add(self, kind: str, key: str, params: Dict = None, error: str = None):
+        """Record a failed fetch; re-adding a queued entry refreshes it without resetting its backoff"""
+        now = time.time()
+        with self.db.write() as conn:
+            conn.execute('''
+                INSERT INTO retry_queue (kind, key, params, state, last_error, next_attempt_at, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(kind, key) DO UPDATE SET
+                    params = excluded.params, state = excluded.state, last_error = excluded.last_error,
+                    updated_at = excluded.updated_at,
+                    attempts = CASE WHEN retry_queue.state = 'dead' THEN 0 ELSE retry_queue.attempts END,
+                    next_attempt_at = MIN(retry_queue.next_attempt_at, excluded.next_attempt_at)
+            ''', (kind, key, json.dumps(params or {}), PENDING, error, now + self.backoff(1), now, now))
+
+    def get(self, kind: str, key: str) -> Optional[Dict]:
+        with self.db.read() as conn:
+            row = conn.execute(f"SELECT {self._COLUMNS} FROM retry_queue WHERE kind = ? AND key = ?",
+                               (kind, key)).fetchone()
+        return self._row_to_entry(row) if row else None
+
+    def due(self, limit: int = 20, now: float = None) -> List[Dict]:
+        """Pending entries whose next attempt time has passed, oldest due first"""
+        with self.db.read() as conn:
+            rows = conn.execute(
+                f"SELECT {self._COLUMNS} FROM retry_queue WHERE state = ? AND next_attempt_at <= ? "
+                "ORDER BY next_attempt_at LIMIT ?",
+                (PENDING, time.time() if now is None else now, limit)
+            ).fetchall()
+        return [self._row_to_entry(row) for row in rows]
+
+    def succeeded(self, kind: str, key: str):
+        with self.db.write() as conn:
+            conn.execute("DELETE FROM retry_queue WHERE kind = ? AND key = ?", (kind, key))
+
+    def failed(self, kind: str, key: str, error: str) -> bool:
+        """Count a failed retry; returns False once the entry is given up on (dead)"""
+        now = time.time()
+        with self.db.write() as conn:
+            row = conn.execute("SELECT attempts FROM retry_queue WHERE kind = ? AND key = ?",
+                               (kind, key)).fetchone()
+            if row is None:
+                return False
+            attempts = row[0] + 1
+            state = DEAD if attempts >= self.max_attempts else PENDING
+            conn.execute(
+                "UPDATE retry_queue SET attempts = ?, state = ?, last_error = ?, next_attempt_at = ?, "
+                "updated_at = ? WHERE kind = ? AND key = ?",
+                (attempts, state, error, now + self.backoff(attempts + 1), now, kind, key)
+            )
+        return state == PENDING
+
+    def requeue_dead(self) -> int:
+        """Give every dead entry a fresh set of attempts"""
+        with self.db.write() as conn:
+            return conn.execute(
+                "UPDATE retry_queue SET state = ?, attempts = 0, next_attempt_at = ? WHERE state = ?",
+                (PENDING, time.time(), DEAD)
+            ).rowcount
+
+    def get_stats(self) -> Dict:
+        with self.db.read() as conn:
+            rows = conn.execute(
+                "SELECT kind, state, COUNT(*), MIN(next_attempt_at) FROM retry_queue GROUP BY kind, state"
+            ).fetchall()
+        stats = {'pending': 0, 'dead': 0, 'by_kind': {}, 'next_attempt_in': None}
+        for kind, state, count, next_attempt_at in rows:
+            stats[state] = stats.get(state, 0) + count
+            stats['by_kind'].setdefault(kind, {})[state] = count
+            if state == PENDING:
+                wait = max(next_attempt_at - time.time(), 0.0)
+                if stats['next_attempt_in'] is None or wait < stats['next_attempt_in']:
+                    stats['next_attempt_in'] = round(wait, 1)
+        return stats
+
+    _COLUMNS = "kind, key, params, state, attempts, last_error, next_attempt_at, created_at, updated_at"
+
+    @staticmethod
+    def _row_to_entry(row) -> Dict:
+        kind, key, params, state, attempts, last_error, next_attempt_at, created_at, updated_at = row
+        return {'kind': kind, 'key': key, 'params': json.loads(params), 'state': state,
+                'attempts': attempts, 'last_error': last_error, 'next_attempt_at': next_attempt_at,
+                'created_at': created_at, 'updated_at': updated_at}
+
+
+class RetryDrainer:
+    """Background thread that works through due RetryQueue entries
+
+    handlers maps an entry kind to fn(key, params); the entry is removed when
+    it returns and rescheduled with backoff when it raises. Entries are tried
+    one at a time, so the drainer adds at most one request at a time to the
+    shared rate budget.
+    """
+
+    def __init__(self, queue: RetryQueue, handlers: Dict[str, Callable[[str, Dict], None]],
+                 interval: float = 5.0, batch_size: int = 20):
+        self.queue = queue
+        self.handlers = handlers
+        self.interval = interval
+        self.batch_size = batch_size
+        self.stop_event = threading.Event()
+        self._thread = None
+        self.stats = {'attempts': 0, 'recovered': 0, 'failed': 0, 'given_up': 0}
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self.stop_event.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True, name='retry-drainer')
+            self._thread.start()
+
+    def stop(self, timeout: float = None):
+        self.stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        while not self.stop_event.is_set():
+            try:
+                self.drain_once()
+            except Exception as e:
+                logger.warning(f"Retry drainer pass failed: {e}")
+            self.stop_event.wait(self.interval)
+
+    def drain_once(self) -> int:
+        """Try every due entry once; returns how many were recovered"""
+        recovered = 0
+        for entry in self.queue.due(self.batch_size):
+            if self.stop_event.is_set():
+                break
+            kind, key = entry['kind'], entry['key']
+            handler = self.handlers.get(kind)
+            if handler is None:
+                continue
+            self.stats['attempts'] += 1
+            try:
+                handler(key, entry['params'])
+            except Exception as e:
+                self.stats['failed'] += 1
+                if self.queue.failed(kind, key, str(e)):
+                    logger.warning(f"🔁 Retry of {kind} {key} failed (attempt {entry['attempts'] + 1}): {e}")
+                else:
+                    self.stats['given_up'] += 1
+                    logger.error(f"🪦 Giving up on {kind} {key} after {entry['attempts'] + 1} retries: {e}")
+                continue
+            self.queue.succeeded(kind, key)
+            self.stats['recovered'] += 1
+            recovered += 1
+            logger.info(f"✅ Recovered {kind} {key} from the retry queue")
+        return recovered
+
+    def get_stats(self) -> Dict:
+        return dict(self.stats, running=self.running, interval=self.interval)
@@ -1,29 +1,314 @@
 import requests
 import json
 import time
-import sqlite3
 import os
 import csv
 import random
 from bs4 import BeautifulSoup
 from tqdm import tqdm
 import re
-from typing import List, Dict, Optional
+import threading
+from collections import OrderedDict
+from itertools import islice
+from contextlib import ExitStack
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
 import logging
 from dotenv import load_dotenv
-from datetime import datetime, timedelta
+from datetime import datetime, timezone
+from http_cache import HTTPCache, CachingAdapter
+from archive import PageArchive
+from rate_control import RateController
+from retry_queue import RetryDrainer, RetryQueue
+from json_stream import iter_json_array
+from records import ARTIST_COLUMNS, ArtistRecord, record_type
+import artist_index
+import autocomplete
+import trigram_index
+from db import ReadOnlyDatabaseError, WriteTicket, get_connection_manager
 
 # Load environment variables
 load_dotenv()
 
+# Named column sets for callers that only need part of each artist
+FIELD_SETS = {
+    'minimal': ('id', 'name', 'post_count'),
+    'card': ('id', 'name', 'post_count', 'other_names', 'group_name'),
+    'full': ARTIST_COLUMNS,
+}
+
+# Upstream fields actually used by parse_artist_data and the preview builder,
+# requested with the API's only= parameter to slim response payloads
+ARTIST_API_FIELDS = (
+    'id', 'name', 'other_names', 'group_name', 'is_deleted', 'is_banned',
+    'created_at', 'updated_at'
+)
+POST_PREVIEW_FIELDS = (
+    'id', 'preview_file_url', 'large_file_url', 'file_url', 'score', 'rating',
+    'tag_string', 'created_at', 'image_width', 'image_height'
+)
+
+# Approximate size in bytes of one unfiltered upstream record, used to
+# estimate the bytes saved by field selection
+FULL_RECORD_SIZE_ESTIMATE = {
+    'artists': 350,
+    'posts': 3500,
+}
+
+# Read size for streamed page bodies
+STREAM_CHUNK_SIZE = 64 * 1024
+# Names resolved per bulk lookup query
+LOOKUP_CHUNK_SIZE = 5000
+# Ids checked per verification request (the API's maximum page size)
+VERIFY_RANGE_SIZE = 1000
+# Ids refetched per request, keeping the search[id] list in the URL short
+REFETCH_CHUNK_SIZE = 100
+
+# Seconds a fuzzy search waits for the trigram index before scoring in SQLite
+FUZZY_INDEX_WAIT = 0.5
+
+# SQLite's LIKE only folds ASCII letters, so cache keys must fold no further
+_ASCII_LOWER = str.maketrans('ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')
+
+def resolve_fields(fields=None) -> tuple:
+    """Turn a field set name, comma-separated string or list into artist columns
+
+    Raises ValueError for unknown field sets or column names.
+    """
+    if not fields:
+        return ARTIST_COLUMNS
+    if isinstance(fields, str):
+        if fields in FIELD_SETS:
+            return FIELD_SETS[fields]
+        fields = fields.split(',')
+    
+    resolved = []
+    for field in fields:
+        field = field.strip()
+        if field in FIELD_SETS:
+            names = FIELD_SETS[field]
+        elif field in ARTIST_COLUMNS:
+            names = (field,)
+        else:
+            raise ValueError(f"Unknown field '{field}' (columns: {', '.join(ARTIST_COLUMNS)}; "
+                             f"field sets: {', '.join(FIELD_SETS)})")
+        resolved.extend(name for name in names if name not in resolved)
+    return tuple(resolved) or ARTIST_COLUMNS
+
+def to_epoch(value) -> Optional[int]:
+    """Epoch seconds (UTC) from an int, datetime or ISO 8601 string; None for empty"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if not isinstance(value, datetime):
+        text = str(value).strip()
+        if text.lstrip('-').isdigit():
+            return int(text)
+        value = datetime.fromisoformat(text.replace('Z', '+00:00'))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+def typed_filters(created_after=None, created_before=None, updated_since=None,
+                  exclude_deleted: bool = False, exclude_banned: bool = False) -> tuple:
+    """SQL conditions for the date and status filters, as ((clause, param), ...)
+
+    Dates are compared on the indexed created_ts/updated_ts columns; the flag
+    conditions match the partial indexes' predicates so SQLite can use them.
+    """
+    filters = []
+    for column, operator, value in (('created_ts', '>=', created_after), ('created_ts', '<', created_before),
+                                    ('updated_ts', '>=', updated_since)):
+        epoch = to_epoch(value)
+        if epoch is not None:
+            filters.append((f"{column} {operator} ?", epoch))
+    if exclude_deleted:
+        filters.append(("is_deleted = 0", None))
+    if exclude_banned:
+        filters.append(("is_banned = 0", None))
+    return tuple(filters)
+
+def parse_artist_json(artist_json: Dict, post_count: int = 0) -> Optional[ArtistRecord]:
+    """Convert a raw artist object from the API into a database row record"""
+    try:
+        other_names = artist_json.get('other_names')
+        group_name = artist_json.get('group_name')
+        is_deleted = bool(artist_json.get('is_deleted', False))
+        return ArtistRecord(
+            artist_json.get('id'),
+            (artist_json.get('name') or '').strip(),
+            post_count,
+            ', '.join(other_names) if other_names else "",
+            group_name.strip() if group_name else "",
+            "",  # url_string: not available in public API
+            not is_deleted,  # Active if not deleted
+            artist_json.get('created_at', ''),
+            artist_json.get('updated_at', ''),
+            bool(artist_json.get('is_banned', False)),
+            is_deleted
+        )
+    except Exception as e:
+        logging.getLogger(__name__).error(f"Error parsing artist data: {e}")
+        return None
+
+# Lookup key for a name or alias: lowercase, spaces as underscores (Danbooru tag style)
+NAME_KEY_SQL = "lower(replace(trim({0}), ' ', '_'))"
+# other_names is stored ", "-joined; this turns it into a JSON array for json_each.
+# json_quote escapes quotes, backslashes and control characters, and never emits ", "
+ALIASES_JSON_SQL = """'[' || replace(json_quote({0}.other_names), ', ', '","') || ']'"""
+
+def _name_key_inserts(row: str, from_artists: bool = False) -> List[str]:
+    """Statements adding the artist_names keys of row (NEW in triggers, or every artist)"""
+    aliases = ALIASES_JSON_SQL.format(row)
+    return [
+        f"INSERT INTO artist_names (key, artist_id, is_alias) "
+        f"SELECT {NAME_KEY_SQL.format(row + '.name')}, {row}.id, 0 "
+        f"{'FROM artists ' if from_artists else ''}WHERE {row}.name IS NOT NULL",
+        f"INSERT INTO artist_names (key, artist_id, is_alias) "
+        f"SELECT DISTINCT {NAME_KEY_SQL.format('value')}, {row}.id, 1 "
+        f"FROM {'artists, ' if from_artists else ''}"
+        f"json_each(CASE WHEN json_valid({aliases}) THEN {aliases} ELSE '[]' END) "
+        f"WHERE trim(value) != ''",
+    ]
+
+class PageFetchError(Exception):
+    """A streamed page could not be fetched or parsed"""
+
+class SingleFlight:
+    """Coalesce concurrent identical calls so only one of them does the work
+
+    The first caller for a key runs the function; callers that arrive while it
+    is still in flight block on the same call and receive its result (or its
+    exception). Nothing is cached once the call completes.
+    """
+
+    class _Call:
+        __slots__ = ('event', 'result', 'error', 'waiters')
+
+        def __init__(self):
+            self.event = threading.Event()
+            self.result = None
+            self.error = None
+            self.waiters = 0
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, 'SingleFlight._Call'] = {}
+        self.stats = {'executed': 0, 'coalesced': 0}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Run fn() for key, or wait for the in-flight call with the same key"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.stats['coalesced'] += 1
+                leader = False
+            else:
+                call = self._Call()
+                self._calls[key] = call
+                self.stats['executed'] += 1
+                leader = True
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result
+
+    def in_flight(self) -> int:
+        """Number of distinct keys currently being fetched"""
+        with self._lock:
+            return len(self._calls)
+
+
+class SearchResultCache:
+    """LRU cache of search results tagged with the database generation
+
+    Entries are only served while their generation matches the current one,
+    so any write that bumps the generation invalidates them without an
+    explicit purge.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'stale': 0}
+
+    def get(self, key: Hashable, generation: int):
+        """Return the cached value for key at this generation, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            if entry[0] != generation:
+                del self._entries[key]
+                self.stats['stale'] += 1
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry[1]
+
+    def put(self, key: Hashable, generation: int, value):
+        with self._lock:
+            self._entries[key] = (generation, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.stats['hits'],
+                'misses': self.stats['misses'],
+                'stale_evictions': self.stats['stale'],
+                'hit_rate': self.stats['hits'] / lookups if lookups else 0.0
+            }
+
 class DanbooruArtistScraper:
-    def __init__(self, db_path: str = "artists.db", username: str = None, api_key: str = None):
+    def __init__(self, db_path: str = "artists.db", username: str = None, api_key: str = None,
+                 http_cache_dir: str = None, archive_dir: str = None, read_only: bool = False):
         self.base_url = "https://danbooru.donmai.us/artists.json"
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'DanbooruArtistScraper/1.0 (Contact: yourcontact@example.com)'
         })
         
+        # Optional on-disk HTTP cache with conditional revalidation
+        http_cache_dir = http_cache_dir or os.getenv('HTTP_CACHE_DIR')
+        self.http_cache = None
+        if http_cache_dir:
+            self.http_cache = HTTPCache(
+                http_cache_dir,
+                max_bytes=int(float(os.getenv('HTTP_CACHE_MAX_MB', 256)) * 1024 * 1024)
+            )
+            self.session.mount('https://', CachingAdapter(self.http_cache))
+        
+        # Optional append-only archive of raw page responses (see archive.py)
+        archive_dir = archive_dir or os.getenv('PAGE_ARCHIVE_DIR')
+        self.page_archive = PageArchive(archive_dir) if archive_dir else None
+        
         # Setup logging first
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
@@ -36,13 +321,42 @@ class DanbooruArtistScraper:
         self.authenticated = False
         self._configure_authentication()
         
-        # Database setup
+        # Database setup (connections are shared per database file, see db.py).
+        # read_only serves a published snapshot: immutable, memory-mapped, no writes
         self.db_path = db_path
-        self.setup_database()
+        self.read_only = read_only
+        self.db = get_connection_manager(db_path, read_only=read_only)
+        self.group_writer = None
+        self._snapshot_generation = None
+        # Failed page and post count fetches wait here for the retry drainer (see retry_queue.py)
+        self.retry_queue = None
+        self.retry_drainer = None
+        if not read_only:
+            self.setup_database()
+            # Bulk writes from every producer share one writer thread and group commits
+            self.group_writer = self.db.group_writer(commit_hook=self._bump_generation)
+            self.retry_queue = RetryQueue(self.db)
+        
+        # Search results are cached per database generation (bumped on every write)
+        self.search_cache = SearchResultCache()
+        
+        # Optional in-memory columnar index (see enable_artist_index)
+        self.artist_index = None
         
-        # Enhanced rate limiting and 429 detection
-        self.min_request_interval = 0.15  # ~6.7 requests per second to stay safe
+        # In-memory name/alias prefix index for typeahead, built on first use
+        self.autocomplete_index = None
+        # In-memory trigram index for fuzzy searches, built on first use
+        self.fuzzy_index = None
+        self._lazy_index_lock = threading.Lock()
+        
+        # Enhanced rate limiting and 429 detection: AIMD pacing shared by every
+        # thread, starting at ~6.7 requests per second and probing up towards
+        # MAX_REQUESTS_PER_SECOND (see rate_control.py)
         self.original_min_interval = 0.15  # Keep track of original setting
+        self.rate_controller = RateController(
+            1 / self.original_min_interval,
+            max_rate=float(os.getenv('MAX_REQUESTS_PER_SECOND', 10))
+        )
         self.last_request_time = 0
         
         # Advanced 429 rate limit handling
@@ -57,14 +371,21 @@ class DanbooruArtistScraper:
             'total_requests': 0,
             'total_429s': 0,
             'avg_response_time': 0,
+            'bytes_received': 0,
+            'bytes_saved_estimate': 0,
+            'transfer_by_endpoint': {},
             'last_reset': datetime.now(),
-            'consecutive_successes': 0,
-            'adaptive_cooldown_until': None
+            'consecutive_successes': 0
         }
         
-        # Adaptive rate limiting thresholds
-        self.adaptive_threshold_429s = 3  # Start adapting after 3 429s
-        self.recovery_success_threshold = 10  # Reset after 10 consecutive successes
+        # Concurrent identical upstream lookups share one in-flight request
+        self.single_flight = SingleFlight()
+        
+        # Ask the API for only the fields we use (only= parameter)
+        self.use_field_selection = True
+        
+        # Parse page bodies incrementally instead of loading whole pages (low-memory hosts)
+        self.stream_pages = os.getenv('STREAM_PAGES', '').lower() in ('1', 'true', 'yes')
         
     def _configure_authentication(self):
         """Configure API authentication with current credentials"""
@@ -112,55 +433,176 @@ class DanbooruArtistScraper:
     
     def setup_database(self):
         """Initialize SQLite database for storing artist data"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self.db.write() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS artists (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT UNIQUE,
+                    post_count INTEGER,
+                    other_names TEXT,
+                    group_name TEXT,
+                    url_string TEXT,
+                    is_active BOOLEAN,
+                    created_at TEXT,
+                    updated_at TEXT,
+                    is_banned BOOLEAN,
+                    is_deleted BOOLEAN
+                )
+            ''')
+            
+            # Generation counter bumped by every write, used to validate cached reads
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS db_meta (
+                    key TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                )
+            ''')
+            cursor.execute("INSERT OR IGNORE INTO db_meta (key, value) VALUES ('generation', 0)")
+            
+            self._setup_name_keys(cursor)
+            self._setup_typed_columns(cursor)
+    
+    def _setup_typed_columns(self, cursor):
+        """Epoch timestamp columns and indexes for date, status and post count filters
+
+        created_at/updated_at stay as the API's ISO text (with mixed timezone
+        offsets); created_ts/updated_ts are virtual generated columns holding
+        UTC epoch seconds, so only their indexes take space.
+        """
+        existing = {row[1] for row in cursor.execute("PRAGMA table_xinfo(artists)")}
+        for column, source in (('created_ts', 'created_at'), ('updated_ts', 'updated_at')):
+            if column not in existing:
+                cursor.execute(f"""
+                    ALTER TABLE artists ADD COLUMN {column} INTEGER
+                    GENERATED ALWAYS AS (CAST(strftime('%s', {source}) AS INTEGER)) VIRTUAL
+                """)
+        if 'created_ts' not in existing:
+            # Older rows may hold NULL or text flags; make them 0/1 for the partial indexes
+            for flag in ('is_active', 'is_banned', 'is_deleted'):
+                cursor.execute(f"UPDATE artists SET {flag} = CASE WHEN {flag} IN (1, '1', 'true', 'True') "
+                               f"THEN 1 ELSE 0 END WHERE {flag} IS NULL OR {flag} NOT IN (0, 1)")
         
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_artists_post_count ON artists (post_count)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_artists_created_ts ON artists (created_ts)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_artists_updated_ts ON artists (updated_ts)")
+        # Most artists are live, so exclude-deleted searches get their own post count order
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_artists_live_post_count "
+                       "ON artists (post_count) WHERE is_deleted = 0")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_artists_deleted ON artists (updated_ts) WHERE is_deleted = 1")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_artists_banned ON artists (updated_ts) WHERE is_banned = 1")
+    
+    def _setup_name_keys(self, cursor):
+        """Indexed lookup keys for every artist name and alias, kept in sync by triggers"""
+        created = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'artist_names'"
+        ).fetchone() is None
         cursor.execute('''
-            CREATE TABLE IF NOT EXISTS artists (
-                id INTEGER PRIMARY KEY,
-                name TEXT UNIQUE,
-                post_count INTEGER,
-                other_names TEXT,
-                group_name TEXT,
-                url_string TEXT,
-                is_active BOOLEAN,
-                created_at TEXT,
-                updated_at TEXT,
-                is_banned BOOLEAN,
-                is_deleted BOOLEAN
+            CREATE TABLE IF NOT EXISTS artist_names (
+                key TEXT NOT NULL,
+                artist_id INTEGER NOT NULL,
+                is_alias INTEGER NOT NULL
             )
         ''')
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_artist_names_key ON artist_names (key)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_artist_names_artist ON artist_names (artist_id)")
         
-        conn.commit()
-        conn.close()
+        # INSERT OR REPLACE of a name under a new id deletes the old row without
+        # firing the delete trigger (recursive_triggers is off), so the insert
+        # trigger drops the keys of the artist it displaced
+        displaced = f'''
+            DELETE FROM artist_names WHERE artist_id IN (
+                SELECT artist_id FROM artist_names
+                WHERE key = {NAME_KEY_SQL.format('NEW.name')} AND is_alias = 0 AND artist_id != NEW.id
+                  AND NOT EXISTS (SELECT 1 FROM artists WHERE artists.id = artist_names.artist_id)
+            );'''
+        triggers = {
+            trigger: f'''
+                CREATE TRIGGER {trigger} AFTER {event} ON artists BEGIN
+                    DELETE FROM artist_names WHERE artist_id = NEW.id;{displaced if event == 'INSERT' else ''}
+                    {'; '.join(_name_key_inserts('NEW'))};
+                END'''
+            for trigger, event in (('artist_names_insert', 'INSERT'),
+                                   ('artist_names_update', 'UPDATE OF name, other_names'))
+        }
+        triggers['artist_names_delete'] = '''
+                CREATE TRIGGER artist_names_delete AFTER DELETE ON artists BEGIN
+                    DELETE FROM artist_names WHERE artist_id = OLD.id;
+                END'''
+        existing = dict(cursor.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'artists'"
+        ).fetchall())
+        replaced = False
+        for trigger, sql in triggers.items():
+            if existing.get(trigger) != sql.strip():
+                # Older definitions are replaced, and the keys they wrote rebuilt below
+                replaced = replaced or trigger in existing
+                cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+                cursor.execute(sql)
+        if replaced and not created:
+            cursor.execute("DELETE FROM artist_names")
+        if created or replaced:
+            # Databases from before this table (or these triggers) existed: index the artists already saved
+            for statement in _name_key_inserts('artists', from_artists=True):
+                cursor.execute(statement)
+    
+    def _bump_generation(self, cursor):
+        """Advance the database generation inside the caller's write transaction"""
+        cursor.execute("UPDATE db_meta SET value = value + 1 WHERE key = 'generation'")
+    
+    def get_db_generation(self) -> int:
+        """Current database generation; changes whenever artist data is written"""
+        if self.read_only and self._snapshot_generation is not None:
+            return self._snapshot_generation  # Immutable snapshots never change
+        with self.db.read() as conn:
+            row = conn.execute("SELECT value FROM db_meta WHERE key = 'generation'").fetchone()
+        generation = row[0] if row else 0
+        if self.read_only:
+            self._snapshot_generation = generation
+        return generation
+    
+    @property
+    def min_request_interval(self) -> float:
+        """Current seconds between requests, as set by the rate controller"""
+        return self.rate_controller.interval
+    
+    @min_request_interval.setter
+    def min_request_interval(self, interval: float):
+        self.rate_controller.configure(1 / interval)
+        self.original_min_interval = interval
     
     def ensure_rate_limit(self):
-        """Enhanced rate limiting with adaptive behavior based on 429 responses"""
-        current_time = time.time()
-        
-        # Check if we're in an adaptive cooldown period
-        if (self.rate_limit_stats['adaptive_cooldown_until'] and 
-            datetime.now() < self.rate_limit_stats['adaptive_cooldown_until']):
-            remaining_cooldown = (self.rate_limit_stats['adaptive_cooldown_until'] - datetime.now()).total_seconds()
-            if remaining_cooldown > 0:
-                self.logger.info(f"⏸️  In adaptive cooldown for {remaining_cooldown:.1f} more seconds")
-                time.sleep(min(remaining_cooldown, 5))  # Sleep in chunks of max 5 seconds
-                return
-        
-        time_since_last_request = current_time - self.last_request_time
-        
-        if time_since_last_request < self.min_request_interval:
-            sleep_time = self.min_request_interval - time_since_last_request
-            self.logger.debug(f"Rate limiting: sleeping for {sleep_time:.2f} seconds (current rate: {1/self.min_request_interval:.1f} req/sec)")
-            time.sleep(sleep_time)
-        
+        """Wait for this request's slot in the shared, adaptively paced rate budget"""
+        waited = self.rate_controller.acquire()
+        if waited > 1:
+            self.logger.info(f"⏸️  Waited {waited:.1f}s for the rate limit "
+                             f"(current rate: {1/self.min_request_interval:.1f} req/sec)")
         self.last_request_time = time.time()
     
-    def handle_rate_limit_response(self, response: requests.Response, attempt: int) -> bool:
+    def ensure_rate_limit_for(self, url: str):
+        """Apply rate limiting unless the HTTP cache will answer this GET from disk"""
+        if self.http_cache is not None:
+            prepared = self.session.prepare_request(requests.Request('GET', url))
+            if self.http_cache.is_fresh(prepared):
+                return
+        self.ensure_rate_limit()
+    
+    def handle_rate_limit_response(self, response: requests.Response, attempt: int, wait: bool = True) -> bool:
         """
-        Enhanced 429 handling with intelligent backoff and adaptive rate limiting
+        Feed a response to the rate controller; on a 429, wait and report a retry
         Returns True if request should be retried, False otherwise
+
+        A 429 halves the request rate and waits out the server's Retry-After
+        (or a short exponential backoff). Successes raise the rate again a
+        step at a time, and rate limit headers pace requests before the
+        server has to refuse any. Responses answered from the HTTP cache never
+        reached the server and are left out of the accounting. With wait=False
+        a 429 is recorded (and pauses later requests) without sleeping here,
+        for callers that give up instead of retrying.
         """
+        if getattr(response, 'from_cache', False) and not getattr(response, 'revalidated', False):
+            return False
         if response.status_code == 429:
             self.total_429_count += 1
             self.consecutive_429_count += 1
@@ -172,35 +614,22 @@ class DanbooruArtistScraper:
             self.logger.warning(f"🚫 Rate limited (429) - Attempt {attempt + 1}")
             self.logger.info(f"📊 429 Stats: Total={self.total_429_count}, Consecutive={self.consecutive_429_count}")
             
-            # Check for Retry-After header (RFC compliance)
-            retry_after = response.headers.get('Retry-After')
-            if retry_after:
-                try:
-                    wait_time = float(retry_after)
-                    self.logger.info(f"🕐 Server requested wait of {wait_time} seconds (Retry-After header)")
-                except ValueError:
-                    # If Retry-After is not a number, fall back to exponential backoff
-                    wait_time = self._calculate_backoff_time(attempt)
-                    self.logger.warning(f"⚠️  Invalid Retry-After header, using calculated backoff: {wait_time:.1f}s")
-            else:
-                # Use intelligent exponential backoff
-                wait_time = self._calculate_backoff_time(attempt)
-                self.logger.info(f"📈 Using exponential backoff: {wait_time:.1f} seconds")
-            
-            # Cap wait time to reasonable maximum
-            wait_time = min(wait_time, self.max_rate_limit_wait)
-            
-            # Apply adaptive rate limiting if we're getting too many 429s
-            if self.consecutive_429_count >= self.adaptive_threshold_429s:
-                self._apply_adaptive_rate_limiting()
-            
-            self.logger.info(f"⏳ Waiting {wait_time:.1f} seconds before retry...")
+            old_rate = 1 / self.min_request_interval
+            wait_time = self.rate_controller.on_throttle(
+                response.headers, fallback_wait=self._calculate_backoff_time(attempt),
+                max_wait=self.max_rate_limit_wait
+            )
+            if not wait:
+                self.logger.info(f"📉 Rate: {old_rate:.1f} → {1/self.min_request_interval:.1f} req/sec, "
+                                 f"requests paused for {wait_time:.1f} seconds")
+                return True
+            self.logger.info(f"📉 Rate: {old_rate:.1f} → {1/self.min_request_interval:.1f} req/sec, "
+                             f"waiting {wait_time:.1f} seconds before retry...")
             
             # Show progress for long waits
             if wait_time > 10:
                 self._show_wait_progress(wait_time)
-            else:
-                time.sleep(wait_time)
+            self.ensure_rate_limit()  # The retry takes its own slot
             
             return True  # Retry the request
         
@@ -208,59 +637,24 @@ class DanbooruArtistScraper:
         if response.status_code == 200:
             self.consecutive_429_count = 0  # Reset consecutive 429 counter
             self.rate_limit_stats['consecutive_successes'] += 1
-            
-            # Gradually recover rate limiting after consecutive successes
-            if self.rate_limit_stats['consecutive_successes'] >= self.recovery_success_threshold:
-                self._gradually_recover_rate_limiting()
+            self.rate_controller.on_success(response.headers)
+        else:
+            self.rate_controller.observe(response.headers)
         
         return False  # Don't retry for non-429 errors
     
     def _calculate_backoff_time(self, attempt: int) -> float:
-        """Calculate intelligent exponential backoff time"""
-        # Base backoff with jitter
+        """Exponential backoff with jitter for 429s that carry no Retry-After"""
         base_backoff = self.rate_limit_wait_time * (2 ** attempt)
         
         # Add factor based on consecutive 429s
         consecutive_factor = 1 + (self.consecutive_429_count * 0.5)
         
         # Add some randomization to prevent thundering herd
-        import random
         jitter = random.uniform(0.8, 1.2)
         
         return base_backoff * consecutive_factor * jitter
     
-    def _apply_adaptive_rate_limiting(self):
-        """Apply more conservative rate limiting when getting many 429s"""
-        # Increase minimum request interval significantly
-        old_interval = self.min_request_interval
-        self.min_request_interval = min(self.min_request_interval * 2, 2.0)  # Cap at 0.5 req/sec
-        
-        # Set adaptive cooldown period
-        cooldown_minutes = min(5 + self.consecutive_429_count, 30)  # 5-30 minutes based on consecutive 429s
-        self.rate_limit_stats['adaptive_cooldown_until'] = datetime.now() + timedelta(minutes=cooldown_minutes)
-        
-        self.logger.warning(f"🔄 Adaptive rate limiting activated!")
-        self.logger.info(f"   Rate: {1/old_interval:.1f} → {1/self.min_request_interval:.1f} req/sec")
-        self.logger.info(f"   Cooldown: {cooldown_minutes} minutes")
-        
-        # Also increase base wait time for future 429s
-        self.rate_limit_wait_time = min(self.rate_limit_wait_time * 1.5, 30.0)
-    
-    def _gradually_recover_rate_limiting(self):
-        """Gradually recover rate limiting after consecutive successes"""
-        if self.min_request_interval > self.original_min_interval:
-            old_rate = 1/self.min_request_interval
-            self.min_request_interval = max(self.min_request_interval * 0.9, self.original_min_interval)
-            new_rate = 1/self.min_request_interval
-            
-            self.logger.info(f"🟢 Rate limiting recovery: {old_rate:.1f} → {new_rate:.1f} req/sec")
-            
-            # Reset success counter
-            self.rate_limit_stats['consecutive_successes'] = 0
-            
-            # Gradually decrease base wait time
-            self.rate_limit_wait_time = max(self.rate_limit_wait_time * 0.9, 1.0)
-    
     def _show_wait_progress(self, wait_time: float):
         """Show progress bar for long waits"""
         steps = int(wait_time)
@@ -278,7 +672,7 @@ class DanbooruArtistScraper:
     
     def get_rate_limit_status(self) -> Dict:
         """Get detailed rate limiting status for monitoring"""
-        now = datetime.now()
+        paused_for = self.rate_controller.paused_for()
         return {
             'current_rate_limit': f"{1/self.min_request_interval:.1f} req/sec",
             'original_rate_limit': f"{1/self.original_min_interval:.1f} req/sec",
@@ -288,17 +682,21 @@ class DanbooruArtistScraper:
             'consecutive_429s': self.consecutive_429_count,
             'consecutive_successes': self.rate_limit_stats['consecutive_successes'],
             'last_429_time': self.last_429_time.isoformat() if self.last_429_time else None,
-            'adaptive_cooldown_active': (
-                self.rate_limit_stats['adaptive_cooldown_until'] and 
-                now < self.rate_limit_stats['adaptive_cooldown_until']
-            ),
-            'adaptive_cooldown_remaining': (
-                (self.rate_limit_stats['adaptive_cooldown_until'] - now).total_seconds()
-                if self.rate_limit_stats['adaptive_cooldown_until'] and now < self.rate_limit_stats['adaptive_cooldown_until']
-                else 0
-            ),
+            # Only a server-requested pause (Retry-After or exhausted budget) holds requests now
+            'adaptive_cooldown_active': paused_for > 0,
+            'adaptive_cooldown_remaining': paused_for,
             'current_wait_time': self.rate_limit_wait_time,
             'max_wait_time': self.max_rate_limit_wait,
+            'rate_control': self.rate_controller.get_stats(),
+            'coalesced_requests': self.single_flight.stats['coalesced'],
+            'bytes_received': self.rate_limit_stats['bytes_received'],
+            'bytes_saved_estimate': self.rate_limit_stats['bytes_saved_estimate'],
+            'field_selection': self.use_field_selection,
+            'transfer_by_endpoint': {
+                endpoint: dict(stats) for endpoint, stats in self.rate_limit_stats['transfer_by_endpoint'].items()
+            },
+            'http_cache': self.http_cache.get_stats() if self.http_cache else None,
+            'in_flight_requests': self.single_flight.in_flight(),
             'health_status': self._get_health_status()
         }
     
@@ -312,42 +710,123 @@ class DanbooruArtistScraper:
             return "recovering"
         else:
             return "healthy"
+    
+    def _only_param(self, fields: tuple) -> str:
+        """Query string fragment selecting upstream fields, if enabled"""
+        return f"&only={','.join(fields)}" if self.use_field_selection else ""
+    
+    def _page_only_param(self) -> str:
+        """only= fragment for artist pages; archived pages are fetched untrimmed
+
+        The archive exists so a changed parser can be re-run over raw pages, which
+        is only useful if the pages carry the fields the old parser ignored.
+        """
+        return "" if self.page_archive is not None else self._only_param(ARTIST_API_FIELDS)
+    
+    def _record_transfer(self, endpoint: str, response: requests.Response, records: int,
+                         size: int = None):
+        """Track downloaded bytes and the estimated savings from field selection
+
+        Pass size for streamed responses, whose content can't be read again.
+        """
+        if getattr(response, 'from_cache', False) and not getattr(response, 'revalidated', False):
+            return  # Served from disk, nothing was downloaded
+        if getattr(response, 'revalidated', False):
+            size = 0
+        elif size is None:
+            size = len(response.content or b'')
+        stats = self.rate_limit_stats['transfer_by_endpoint'].setdefault(
+            endpoint, {'requests': 0, 'bytes': 0, 'records': 0}
+        )
+        stats['requests'] += 1
+        stats['bytes'] += size
+        stats['records'] += records
+        self.rate_limit_stats['bytes_received'] += size
+        
+        full_size = FULL_RECORD_SIZE_ESTIMATE.get(endpoint)
+        if self.use_field_selection and full_size and records:
+            self.rate_limit_stats['bytes_saved_estimate'] += max(full_size * records - size, 0)
 
     def get_artist_post_count(self, artist_name: str) -> int:
-        """Get post count for a specific artist by querying counts API"""
+        """Get post count for a specific artist by querying counts API
+
+        Concurrent calls for the same artist are coalesced into one request.
+        A failed lookup returns 0 (and is queued for retry).
+        """
+        post_count = self._lookup_post_count(artist_name)
+        return 0 if post_count is None else post_count
+    
+    def _lookup_post_count(self, artist_name: str) -> Optional[int]:
+        """Coalesced counts lookup; None if it failed"""
+        return self.single_flight.do(
+            ('post_count', artist_name),
+            lambda: self._fetch_artist_post_count(artist_name)
+        )
+    
+    def _fetch_artist_post_count(self, artist_name: str) -> Optional[int]:
+        """Query the counts API for a single artist (no coalescing)
+
+        A failed lookup returns None and is queued for the retry drainer, which
+        stores the real count once it gets one. Writers keep the stored count
+        for None, so a late page save can't undo what the drainer stored.
+        """
         try:
-            self.ensure_rate_limit()
-            
-            # Use the counts API which is much more efficient
-            counts_url = f"https://danbooru.donmai.us/counts/posts.json?tags={artist_name}"
-            response = self.session.get(counts_url, timeout=30)
-            
-            if response.status_code == 200:
-                data = response.json()
-                # Extract post count from the counts object
-                post_count = data.get('counts', {}).get('posts', 0)
-                self.logger.debug(f"Artist {artist_name}: {post_count} posts")
-                return int(post_count)
-            else:
-                self.logger.warning(f"Failed to get post count for {artist_name}: {response.status_code}")
-                return 0
-                
+            return self._request_post_count(artist_name)
         except Exception as e:
-            self.logger.error(f"Error getting post count for {artist_name}: {e}")
-            return 0
+            self.logger.warning(f"Failed to get post count for {artist_name}: {e}")
+            self._queue_retry('post_count', artist_name, {}, str(e))
+            return None
+    
+    def _request_post_count(self, artist_name: str) -> int:
+        """One counts API request; raises on HTTP or decoding errors"""
+        # Use the counts API which is much more efficient
+        counts_url = f"https://danbooru.donmai.us/counts/posts.json?tags={artist_name}"
+        self.ensure_rate_limit_for(counts_url)
+        self.rate_limit_stats['total_requests'] += 1
+        response = self.session.get(counts_url, timeout=30)
+        if self.handle_rate_limit_response(response, 0, wait=False):
+            # The shared rate is already lowered; the retry queue picks this lookup up later
+            raise requests.exceptions.HTTPError("HTTP 429", response=response)
+        if response.status_code != 200:
+            raise requests.exceptions.HTTPError(f"HTTP {response.status_code}", response=response)
+        
+        data = response.json()
+        self._record_transfer('counts', response, 1)
+        # Extract post count from the counts object
+        post_count = data.get('counts', {}).get('posts', 0)
+        self.logger.debug(f"Artist {artist_name}: {post_count} posts")
+        return int(post_count)
     
     def get_artist_sample_images(self, artist_name: str, limit: int = 4) -> List[Dict]:
-        """Get sample images for an artist to display as preview, prioritized by rating"""
+        """Get sample images for an artist to display as preview, prioritized by rating
+
+        Concurrent calls for the same artist and limit are coalesced into one
+        request; each caller gets its own copy of the result list.
+        """
+        images = self.single_flight.do(
+            ('sample_images', artist_name, limit),
+            lambda: self._fetch_artist_sample_images(artist_name, limit)
+        )
+        return [dict(image) for image in images]
+    
+    def _fetch_artist_sample_images(self, artist_name: str, limit: int = 4) -> List[Dict]:
+        """Fetch and rank sample images for an artist (no coalescing)"""
         try:
-            self.ensure_rate_limit()
-            
             # Get more posts than needed to allow for rating-based filtering/sorting
             fetch_limit = min(limit * 3, 20)  # Get more images to sort by rating
-            posts_url = f"https://danbooru.donmai.us/posts.json?tags={artist_name}&limit={fetch_limit}&page=1"
+            posts_url = (
+                f"https://danbooru.donmai.us/posts.json?tags={artist_name}&limit={fetch_limit}&page=1"
+                + self._only_param(POST_PREVIEW_FIELDS)
+            )
+            self.ensure_rate_limit_for(posts_url)
+            self.rate_limit_stats['total_requests'] += 1
             response = self.session.get(posts_url, timeout=30)
+            # Previews are counted and feed the shared rate controller, but never wait out a 429 themselves
+            self.handle_rate_limit_response(response, 0, wait=False)
             
             if response.status_code == 200:
                 posts_data = response.json()
+                self._record_transfer('posts', response, len(posts_data))
                 images = []
                 
                 for post in posts_data:
@@ -402,11 +881,10 @@ class DanbooruArtistScraper:
 
     def get_page(self, page_id: str, retries: int = 5) -> Optional[List[Dict]]:
         """Fetch a single page of artists using JSON API with enhanced 429 detection"""
-        self.ensure_rate_limit()
-        
         # Use maximum limit of 1000 as per API documentation
         limit = 1000
-        url = f"{self.base_url}?page={page_id}&limit={limit}"
+        url = f"{self.base_url}?page={page_id}&limit={limit}" + self._page_only_param()
+        self.ensure_rate_limit_for(url)
         
         for attempt in range(retries):
             try:
@@ -438,11 +916,18 @@ class DanbooruArtistScraper:
                     response.raise_for_status()
                 
                 artists_data = response.json()
+                self._record_transfer('artists', response, len(artists_data))
                 
                 if not artists_data:
                     self.logger.info(f"📄 Page {page_id} returned empty results - reached end")
                     return []
                 
+                if self.page_archive is not None:
+                    try:
+                        self.page_archive.append_page(page_id, artists_data)
+                    except Exception as e:
+                        self.logger.warning(f"⚠️  Failed to archive page {page_id}: {e}")
+                
                 self.logger.info(f"✅ Successfully fetched {len(artists_data)} artists from page {page_id}")
                 self.logger.debug(f"📊 Response time: {response_time:.2f}s, Avg: {self.rate_limit_stats['avg_response_time']:.2f}s")
                 
@@ -499,38 +984,164 @@ class DanbooruArtistScraper:
         self.logger.error(f"❌ All retry attempts exhausted for page {page_id}")
         return None
     
-    def parse_artist_data(self, artist_json: Dict, fetch_post_count: bool = True) -> Optional[Dict]:
-        """Parse artist data from JSON response with optional post count fetching"""
+    def _fetch_json(self, url: str, endpoint: str, label: str, retries: int = 5,
+                    bypass_cache: bool = False) -> Optional[List[Dict]]:
+        """GET a JSON list with get_page's rate limiting and retries; None if every attempt failed
+
+        bypass_cache sends the request upstream even when the HTTP cache holds a
+        fresh copy, for callers that must see the current data.
+        """
+        headers = None
+        if bypass_cache:
+            headers = {'Cache-Control': 'no-cache'}
+            self.ensure_rate_limit()
+        else:
+            self.ensure_rate_limit_for(url)
+        for attempt in range(retries):
+            try:
+                self.rate_limit_stats['total_requests'] += 1
+                response = self.session.get(url, timeout=30, headers=headers)
+                
+                if self.handle_rate_limit_response(response, attempt):
+                    continue
+                
+                if response.status_code != 200:
+                    if response.status_code in [502, 503, 504] and attempt < retries - 1:
+                        time.sleep(min(5 * (2 ** attempt), 60))
+                        continue
+                    response.raise_for_status()
+                
+                data = response.json()
+                self._record_transfer(endpoint, response, len(data))
+                return data
+                
+            except (requests.exceptions.RequestException, ValueError) as e:
+                self.logger.warning(f"⚠️  Request failed for {label} (attempt {attempt + 1}): {e}")
+                if attempt < retries - 1:
+                    time.sleep(min(2 ** attempt, 30))
+        
+        self.logger.error(f"❌ Failed to fetch {label} after {retries} attempts")
+        return None
+    
+    def _open_page_stream(self, url: str, page_id: str, retries: int = 5) -> Optional[requests.Response]:
+        """Request a page with stream=True, retrying like get_page; None if every attempt failed"""
+        for attempt in range(retries):
+            try:
+                self.logger.info(f"🌐 Streaming page {page_id} (attempt {attempt + 1}/{retries})")
+                self.rate_limit_stats['total_requests'] += 1
+                response = self.session.get(url, timeout=30, stream=True)
+                
+                if self.handle_rate_limit_response(response, attempt):
+                    response.close()
+                    self.logger.info(f"🔄 Retrying page {page_id} after rate limit handling...")
+                    continue
+                
+                if response.status_code != 200:
+                    response.close()
+                    if response.status_code in [502, 503, 504] and attempt < retries - 1:
+                        wait_time = min(5 * (2 ** attempt), 60)
+                        self.logger.warning(f"🔧 Server error {response.status_code} for page {page_id}, "
+                                            f"waiting {wait_time} seconds...")
+                        time.sleep(wait_time)
+                        continue
+                    response.raise_for_status()
+                
+                return response
+                
+            except requests.exceptions.RequestException as e:
+                self.logger.warning(f"⚠️  Request failed for page {page_id} (attempt {attempt + 1}): {e}")
+                if attempt < retries - 1:
+                    time.sleep(min(2 ** attempt, 30))
+        
+        self.logger.error(f"❌ Failed to fetch page {page_id} after {retries} attempts")
+        return None
+    
+    def iter_page(self, page_id: str, retries: int = 5) -> Iterator[Dict]:
+        """Yield a page's raw artist objects as they are parsed off the network
+
+        Streaming counterpart of get_page: only one artist and one network
+        chunk are held in memory at a time. Raw artists are archived as they
+        stream. Raises PageFetchError if the page can't be fetched or the body
+        is cut off or malformed (artists already yielded stay valid).
+        """
+        url = f"{self.base_url}?page={page_id}&limit=1000" + self._page_only_param()
+        self.ensure_rate_limit_for(url)
+        
+        response = self._open_page_stream(url, page_id, retries)
+        if response is None:
+            raise PageFetchError(f"Failed to fetch page {page_id}")
+        
+        received = 0
+        count = 0
+        
+        def chunks():
+            nonlocal received
+            for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                received += len(chunk)
+                yield chunk
+        
+        try:
+            with ExitStack() as stack:
+                writer = None
+                if self.page_archive is not None:
+                    try:
+                        writer = stack.enter_context(self.page_archive.page_writer(page_id))
+                    except Exception as e:
+                        self.logger.warning(f"⚠️  Failed to archive page {page_id}: {e}")
+                
+                for artist_json in iter_json_array(chunks()):
+                    if writer is not None:
+                        try:
+                            writer.write(artist_json)
+                        except Exception as e:
+                            self.logger.warning(f"⚠️  Failed to archive page {page_id}: {e}")
+                            writer = None
+                    count += 1
+                    yield artist_json
+        except (ValueError, requests.exceptions.RequestException) as e:
+            raise PageFetchError(f"Failed to read page {page_id} after {count} artists: {e}") from e
+        finally:
+            response.close()
+            self._record_transfer('artists', response, count, size=received)
+        
+        if count:
+            self.logger.info(f"✅ Streamed {count} artists from page {page_id}")
+        else:
+            self.logger.info(f"📄 Page {page_id} returned empty results - reached end")
+    
+    def parse_artist_data(self, artist_json: Dict, fetch_post_count: bool = True) -> Optional[ArtistRecord]:
+        """Parse artist data from JSON response with optional post count fetching
+
+        post_count is None when its lookup failed; save_artists then keeps the
+        stored count (0 for new artists) until the retry drainer fills it in.
+        """
         try:
             artist_name = artist_json.get('name', '').strip()
             
             # Get post count if requested and artist name is available
             post_count = 0
             if fetch_post_count and artist_name:
-                post_count = self.get_artist_post_count(artist_name)
+                post_count = self._lookup_post_count(artist_name)
                 self.logger.debug(f"Artist {artist_name}: {post_count} posts")
             
-            return {
-                'id': artist_json.get('id'),
-                'name': artist_name,
-                'post_count': post_count,
-                'other_names': ', '.join(artist_json.get('other_names', [])) if artist_json.get('other_names') else "",
-                'group_name': artist_json.get('group_name', '').strip() if artist_json.get('group_name') else "",
-                'url_string': "",  # Not available in public API
-                'is_active': not artist_json.get('is_deleted', False),  # Active if not deleted
-                'created_at': artist_json.get('created_at', ''),
-                'updated_at': artist_json.get('updated_at', ''),
-                'is_banned': artist_json.get('is_banned', False),
-                'is_deleted': artist_json.get('is_deleted', False)
-            }
+            return parse_artist_json(artist_json, post_count)
         except Exception as e:
             self.logger.error(f"Error parsing artist data: {e}")
             self.logger.debug(f"Problematic data: {artist_json}")
             return None
     
-    def scrape_page(self, page_id: str, fetch_post_counts: bool = True, batch_size: int = 50) -> List[Dict]:
-        """Scrape artists from a single page using JSON API with optional batch post count fetching"""
+    def scrape_page(self, page_id: str, fetch_post_counts: bool = True, batch_size: int = 50,
+                    cancel_event: threading.Event = None) -> List[ArtistRecord]:
+        """Scrape artists from a single page using JSON API with optional batch post count fetching
+
+        If cancel_event is set while post counts are being fetched, the artists
+        parsed so far are returned without making further requests.
+        """
         artists_json = self.get_page(page_id)
+        if artists_json is None:
+            self._queue_retry('page', page_id, {'fetch_post_counts': fetch_post_counts},
+                              "get_page exhausted its retries")
+            return []
         if not artists_json:
             return []
         
@@ -548,6 +1159,9 @@ class DanbooruArtistScraper:
                 self.logger.info(f"📦 Processing batch {i//batch_size + 1}/{(total_artists + batch_size - 1)//batch_size} (artists {i+1}-{batch_end})")
                 
                 for artist_json in batch:
+                    if cancel_event is not None and cancel_event.is_set():
+                        self.logger.info(f"🛑 Cancelled while fetching post counts for page {page_id}")
+                        return artists
                     artist_data = self.parse_artist_data(artist_json, fetch_post_count=True)
                     if artist_data:
                         artists.append(artist_data)
@@ -565,45 +1179,118 @@ class DanbooruArtistScraper:
         
         return artists
     
-    def save_artists(self, artists: List[Dict]):
-        """Save artists to database"""
+    def scrape_page_streaming(self, page_id: str, fetch_post_counts: bool = True, batch_size: int = 100,
+                              cancel_event: threading.Event = None) -> Iterator[List[ArtistRecord]]:
+        """Scrape a page in batches of parsed artists as the response streams in
+
+        Each batch can be saved before the rest of the page is read, so memory
+        stays bounded by batch_size. A page that fails to download ends early
+        and is queued for retry, like a failed page in scrape_page.
+        """
+        batch = []
+        try:
+            for artist_json in self.iter_page(page_id):
+                if cancel_event is not None and cancel_event.is_set() and fetch_post_counts:
+                    self.logger.info(f"🛑 Cancelled while fetching post counts for page {page_id}")
+                    break
+                artist_data = self.parse_artist_data(artist_json, fetch_post_count=fetch_post_counts)
+                if artist_data:
+                    batch.append(artist_data)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+                    if fetch_post_counts:
+                        time.sleep(0.5)  # Small delay between batches to be respectful
+        except PageFetchError as e:
+            self.logger.error(f"❌ {e}")
+            self._queue_retry('page', page_id, {'fetch_post_counts': fetch_post_counts}, str(e))
+        
+        if batch:
+            yield batch
+    
+    def save_artists(self, artists: List[ArtistRecord], preserve_post_counts: bool = False,
+                     wait: bool = True) -> Optional[WriteTicket]:
+        """Save artists (ArtistRecords or row dicts) to database
+
+        With preserve_post_counts, existing rows keep their stored post_count
+        (used when re-ingesting archived pages, which carry no counts). So do
+        rows whose post_count is None (a failed lookup). Rows go through the
+        group commit writer; with wait=False the returned ticket can be waited
+        on later. Rows the writer had to skip are listed in the ticket's
+        failed_rows.
+        """
         if not artists:
-            return
+            return None
+        if self.read_only:
+            raise ReadOnlyDatabaseError("Cannot save artists in read-only serving mode")
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        rows = [artist if isinstance(artist, ArtistRecord) else ArtistRecord.from_dict(artist)
+                for artist in artists]
         
-        for artist in artists:
-            try:
-                cursor.execute('''
-                    INSERT OR REPLACE INTO artists 
-                    (id, name, post_count, other_names, group_name, url_string, is_active, created_at, updated_at, is_banned, is_deleted)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    artist['id'],
-                    artist['name'],
-                    artist['post_count'],
-                    artist['other_names'],
-                    artist['group_name'],
-                    artist['url_string'],
-                    artist['is_active'],
-                    artist['created_at'],
-                    artist['updated_at'],
-                    artist['is_banned'],
-                    artist['is_deleted']
-                ))
-            except sqlite3.Error as e:
-                self.logger.error(f"Database error saving artist {artist.get('name', 'unknown')}: {e}")
+        # Writes that keep stored counts can't be mirrored by the in-memory indexes
+        kind = 'artists_merge'
+        if preserve_post_counts:
+            # REPLACE also drops another id still holding this name, like the other paths
+            statement = '''
+                INSERT OR REPLACE INTO artists 
+                (id, name, post_count, other_names, group_name, url_string, is_active, created_at, updated_at, is_banned, is_deleted)
+                SELECT ?1, ?2, COALESCE((SELECT post_count FROM artists WHERE id = ?1), ?3, 0),
+                       ?4, ?5, ?6, ?7, ?8, ?9, ?10, ?11
+            '''
+        elif any(row.post_count is None for row in rows):
+            # Unknown counts keep the stored value (the drainer may already have filled it in)
+            statement = '''
+                INSERT OR REPLACE INTO artists 
+                (id, name, post_count, other_names, group_name, url_string, is_active, created_at, updated_at, is_banned, is_deleted)
+                SELECT ?1, ?2, COALESCE(?3, (SELECT post_count FROM artists WHERE id = ?1), 0),
+                       ?4, ?5, ?6, ?7, ?8, ?9, ?10, ?11
+            '''
+        else:
+            kind = 'artists'
+            statement = '''
+                INSERT OR REPLACE INTO artists 
+                (id, name, post_count, other_names, group_name, url_string, is_active, created_at, updated_at, is_banned, is_deleted)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            '''
         
-        conn.commit()
-        conn.close()
+        # Records are already in column order
+        ticket = self.group_writer.submit(kind, statement, rows)
+        if wait:
+            ticket.wait()
+        return ticket
+    
+    def save_post_counts(self, updates: List[tuple], wait: bool = True) -> Optional[WriteTicket]:
+        """Store post counts given as (post_count, artist_id) pairs"""
+        if not updates:
+            return None
+        if self.read_only:
+            raise ReadOnlyDatabaseError("Cannot save post counts in read-only serving mode")
+        
+        ticket = self.group_writer.submit('post_counts', "UPDATE artists SET post_count = ? WHERE id = ?",
+                                          updates)
+        if wait:
+            ticket.wait()
+        return ticket
     
     def generate_page_id(self, page_num: int) -> str:
         """Generate page ID for the API (a0, a1, a2, etc.)"""
         return f"a{page_num}"
     
-    def scrape_all_pages(self, start_page: int = 0, max_pages: int = None, fetch_post_counts: bool = True):
-        """Scrape all pages starting from start_page until no more artists are found"""
+    def scrape_all_pages(self, start_page: int = 0, max_pages: int = None, fetch_post_counts: bool = True,
+                         progress_callback: Callable[[Dict], None] = None,
+                         cancel_event: threading.Event = None, streaming: bool = None):
+        """Scrape all pages starting from start_page until no more artists are found
+
+        If progress_callback is given it is called with a progress dict (see
+        _progress_event) when the scrape starts, after every page and when it
+        finishes. Setting cancel_event stops the scrape before its next request;
+        artists already fetched are still saved. With streaming (default:
+        self.stream_pages) pages are parsed and saved in batches as they download.
+        Pages that fail to download are queued for the retry drainer and
+        skipped; they don't count as the empty pages that end the scrape.
+        """
+        if streaming is None:
+            streaming = self.stream_pages
         self.logger.info(f"🚀 Starting comprehensive scrape from page {start_page}")
         if fetch_post_counts:
             self.logger.info("📊 Will fetch individual post counts (this will be slower but more accurate)")
@@ -614,12 +1301,53 @@ class DanbooruArtistScraper:
         total_artists_scraped = 0
         consecutive_empty_pages = 0
         max_consecutive_empty = 3  # Stop after 3 consecutive empty pages
+        consecutive_failed_pages = 0
+        max_consecutive_failed = 10  # Upstream looks down; queued pages are retried later
         
         # Reset rate limiting stats at start
         self.rate_limit_stats['last_reset'] = datetime.now()
         
+        progress = {
+            'state': 'running',
+            'start_page': start_page,
+            'max_pages': max_pages,
+            'started_at': time.time(),
+            'start_requests': self.rate_limit_stats['total_requests'],
+            'start_429s': self.total_429_count,
+            'pages_processed': 0,
+            'pages_queued': 0,
+            'artists_scraped': 0,
+            'current_page': start_page,
+            'page_id': self.generate_page_id(start_page),
+        }
+        
+        # Saves are handed to the writer thread while the next page downloads;
+        # at most one write is outstanding, so memory stays bounded
+        pending_write = None
+        
+        def save(artists):
+            nonlocal pending_write
+            if pending_write is not None:
+                pending_write.wait()
+            pending_write = self.save_artists(artists, wait=False)
+        
+        def report(**changes):
+            progress.update(changes)
+            if progress_callback:
+                try:
+                    progress_callback(self._progress_event(progress))
+                except Exception as e:
+                    self.logger.warning(f"Progress callback failed: {e}")
+        
+        report()
+        
         with tqdm(desc="Scraping artists", unit="artists") as pbar:
             while True:
+                if cancel_event is not None and cancel_event.is_set():
+                    self.logger.info(f"🛑 Scrape cancelled before page {self.generate_page_id(page_num)}")
+                    progress['state'] = 'cancelled'
+                    break
+                
                 if max_pages and page_num >= start_page + max_pages:
                     self.logger.info(f"🏁 Reached maximum page limit ({max_pages})")
                     break
@@ -634,10 +1362,39 @@ class DanbooruArtistScraper:
                         self.logger.info(f"   429 Stats: {status['total_429s']} total, {status['consecutive_429s']} consecutive")
                 
                 self.logger.info(f"📄 Processing page {page_id} (page number {page_num})")
+                page_started = time.time()
                 
-                artists = self.scrape_page(page_id, fetch_post_counts=fetch_post_counts)
+                if streaming:
+                    saved = 0
+                    for batch in self.scrape_page_streaming(page_id, fetch_post_counts=fetch_post_counts,
+                                                            cancel_event=cancel_event):
+                        save(batch)
+                        saved += len(batch)
+                        pbar.update(len(batch))
+                else:
+                    artists = self.scrape_page(page_id, fetch_post_counts=fetch_post_counts,
+                                               cancel_event=cancel_event)
+                    if artists:
+                        save(artists)
+                        pbar.update(len(artists))
+                    saved = len(artists)
                 
-                if not artists:
+                if not saved and self._queued_since('page', page_id, page_started):
+                    consecutive_failed_pages += 1
+                    self.logger.warning(f"📮 Page {page_id} failed and was queued for retry "
+                                        f"(consecutive failures: {consecutive_failed_pages})")
+                    if consecutive_failed_pages >= max_consecutive_failed:
+                        self.logger.error(f"🛑 Stopping after {consecutive_failed_pages} consecutive failed pages; "
+                                          f"resume from page {page_num + 1} once upstream recovers")
+                        progress['pages_queued'] += 1
+                        break
+                    page_num += 1
+                    report(pages_processed=progress['pages_processed'] + 1, current_page=page_num,
+                           page_id=page_id, pages_queued=progress['pages_queued'] + 1)
+                    continue
+                consecutive_failed_pages = 0
+                
+                if not saved:
                     consecutive_empty_pages += 1
                     self.logger.warning(f"📭 Page {page_id} returned no artists (consecutive empty: {consecutive_empty_pages})")
                     
@@ -646,17 +1403,17 @@ class DanbooruArtistScraper:
                         break
                     
                     page_num += 1
+                    report(pages_processed=progress['pages_processed'] + 1, current_page=page_num,
+                           page_id=page_id)
                     continue
                 
                 # Reset consecutive empty counter if we found artists
                 consecutive_empty_pages = 0
                 
-                self.save_artists(artists)
-                total_artists_scraped += len(artists)
-                pbar.update(len(artists))
+                total_artists_scraped += saved
                 pbar.set_description(f"Scraped {total_artists_scraped} artists (page {page_id})")
                 
-                self.logger.info(f"💾 Saved {len(artists)} artists from page {page_id} (total: {total_artists_scraped})")
+                self.logger.info(f"💾 Saved {saved} artists from page {page_id} (total: {total_artists_scraped})")
                 
                 # Check if we need to slow down due to rate limiting issues
                 status = self.get_rate_limit_status()
@@ -665,6 +1422,11 @@ class DanbooruArtistScraper:
                     time.sleep(2)  # Extra delay for unhealthy rate limiting
                 
                 page_num += 1
+                report(pages_processed=progress['pages_processed'] + 1, current_page=page_num,
+                       page_id=page_id, artists_scraped=total_artists_scraped)
+        
+        if pending_write is not None:
+            pending_write.wait()
         
         # Final statistics
         final_status = self.get_rate_limit_status()
@@ -675,19 +1437,530 @@ class DanbooruArtistScraper:
         self.logger.info(f"   Final rate: {final_status['current_rate_limit']}")
         self.logger.info(f"   Health status: {final_status['health_status']}")
         
+        if progress['state'] == 'running':
+            progress['state'] = 'completed'
+        report(artists_scraped=total_artists_scraped)
         return total_artists_scraped
     
+    def _progress_event(self, progress: Dict) -> Dict:
+        """Build a scrape progress snapshot with throughput and rate limit health"""
+        elapsed = max(time.time() - progress['started_at'], 1e-6)
+        requests_made = self.rate_limit_stats['total_requests'] - progress['start_requests']
+        max_pages = progress['max_pages']
+        return {
+            'state': progress['state'],
+            'page_id': progress['page_id'],
+            'current_page': progress['current_page'],
+            'pages_processed': progress['pages_processed'],
+            'pages_queued': progress['pages_queued'],
+            'max_pages': max_pages,
+            'percent': (
+                100.0 if progress['state'] == 'completed'
+                else min(100.0 * progress['pages_processed'] / max_pages, 100.0) if max_pages
+                else None
+            ),
+            'artists_scraped': progress['artists_scraped'],
+            'requests': requests_made,
+            'rate_limited_429s': self.total_429_count - progress['start_429s'],
+            'elapsed_seconds': round(elapsed, 1),
+            'artists_per_second': round(progress['artists_scraped'] / elapsed, 2),
+            'requests_per_second': round(requests_made / elapsed, 2),
+            'current_rate_limit': f"{1/self.min_request_interval:.1f} req/sec",
+            'health_status': self._get_health_status()
+        }
+    
+    def update_post_counts(self, limit: int = None, batch_size: int = 50,
+                           progress_callback: Callable[[Dict], None] = None,
+                           cancel_event: threading.Event = None) -> int:
+        """Fetch post counts for stored artists that don't have one yet
+
+        Updates are committed every batch_size artists. Returns the number of
+        artists updated; stops early (keeping committed batches) when
+        cancel_event is set.
+        """
+        query = "SELECT id, name FROM artists WHERE post_count = 0 ORDER BY name"
+        if limit:
+            query += f" LIMIT {int(limit)}"
+        with self.db.read() as conn:
+            artists_to_update = conn.execute(query).fetchall()
+        
+        self.logger.info(f"🔢 Updating post counts for {len(artists_to_update)} artists")
+        started_at = time.time()
+        start_requests = self.rate_limit_stats['total_requests']
+        start_429s = self.total_429_count
+        updated = 0
+        pending = []
+        state = 'running'
+        
+        def report():
+            if not progress_callback:
+                return
+            elapsed = max(time.time() - started_at, 1e-6)
+            requests_made = self.rate_limit_stats['total_requests'] - start_requests
+            try:
+                progress_callback({
+                    'state': state,
+                    'artists_total': len(artists_to_update),
+                    'artists_updated': updated,
+                    'percent': 100.0 * updated / len(artists_to_update) if artists_to_update else 100.0,
+                    'requests': requests_made,
+                    'rate_limited_429s': self.total_429_count - start_429s,
+                    'elapsed_seconds': round(elapsed, 1),
+                    'requests_per_second': round(requests_made / elapsed, 2),
+                    'health_status': self._get_health_status()
+                })
+            except Exception as e:
+                self.logger.warning(f"Progress callback failed: {e}")
+        
+        def flush():
+            self.save_post_counts(pending)
+            pending.clear()
+        
+        report()
+        for artist_id, artist_name in artists_to_update:
+            if cancel_event is not None and cancel_event.is_set():
+                self.logger.info(f"🛑 Post count update cancelled after {updated} artists")
+                state = 'cancelled'
+                break
+            
+            post_count = self.get_artist_post_count(artist_name)
+            # The row already holds 0; writing it again could only undo a count the
+            # retry drainer stored since (failed lookups also come back as 0)
+            if post_count:
+                pending.append((post_count, artist_id))
+            updated += 1
+            if len(pending) >= batch_size:
+                flush()
+                report()
+        
+        flush()
+        if state == 'running':
+            state = 'completed'
+        report()
+        return updated
+    
+    def _queue_retry(self, kind: str, key: str, params: Dict, error: str):
+        """Record a failed fetch in the retry queue (no-op without one)"""
+        if self.retry_queue is None:
+            return
+        try:
+            self.retry_queue.add(kind, key, params, error)
+            self.logger.info(f"📮 Queued {kind} {key} for retry")
+        except Exception as e:
+            self.logger.error(f"Failed to queue {kind} {key} for retry: {e}")
+    
+    def _queued_since(self, kind: str, key: str, since: float) -> bool:
+        """Whether the fetch was queued for retry at or after `since`"""
+        if self.retry_queue is None:
+            return False
+        entry = self.retry_queue.get(kind, key)
+        return entry is not None and entry['updated_at'] >= since
+    
+    def _retry_page(self, page_id: str, params: Dict):
+        """Retry drainer handler: fetch a queued page once and save its artists"""
+        artists_json = self.get_page(page_id, retries=1)
+        if artists_json is None:
+            raise PageFetchError(f"Failed to fetch page {page_id}")
+        fetch_post_counts = bool(params.get('fetch_post_counts', False))
+        artists = [self.parse_artist_data(artist_json, fetch_post_count=fetch_post_counts)
+                   for artist_json in artists_json]
+        ticket = self.save_artists([artist for artist in artists if artist], preserve_post_counts=not fetch_post_counts)
+        if ticket and ticket.failed_rows:
+            # Keep the page queued rather than dropping the rows that didn't land
+            raise RuntimeError(f"{len(ticket.failed_rows)} artists from page {page_id} could not be saved")
+    
+    def _retry_post_count(self, artist_name: str, params: Dict):
+        """Retry drainer handler: look up a queued post count and store it"""
+        post_count = self._request_post_count(artist_name)
+        with self.db.read() as conn:
+            row = conn.execute("SELECT id FROM artists WHERE name = ?", (artist_name,)).fetchone()
+        if row is None:
+            # Its page isn't saved yet; keep the entry queued until it is
+            raise LookupError(f"Artist {artist_name} is not in the database yet")
+        self.save_post_counts([(post_count, row[0])])
+    
+    def start_retry_drainer(self, interval: float = 5.0) -> RetryDrainer:
+        """Work through the retry queue on a background thread (idempotent)"""
+        if self.retry_queue is None:
+            raise ReadOnlyDatabaseError("No retry queue in read-only serving mode")
+        if self.retry_drainer is None:
+            self.retry_drainer = RetryDrainer(self.retry_queue, {
+                'page': self._retry_page,
+                'post_count': self._retry_post_count,
+            }, interval=interval)
+        self.retry_drainer.start()
+        return self.retry_drainer
+    
+    def get_retry_stats(self) -> Dict:
+        """Retry queue contents and drainer counters"""
+        if self.retry_queue is None:
+            return {'enabled': False}
+        stats = self.retry_queue.get_stats()
+        stats['enabled'] = True
+        stats['drainer'] = self.retry_drainer.get_stats() if self.retry_drainer else None
+        return stats
+    
+    def verify_catalogue(self, start_id: int = 1, end_id: int = None, range_size: int = VERIFY_RANGE_SIZE,
+                         retries: int = 5, progress_callback: Callable[[Dict], None] = None,
+                         cancel_event: threading.Event = None) -> Dict:
+        """Compare stored artists with upstream id range by id range and repair the differences
+
+        Each range costs one request for just id and updated_at. Artists missing
+        locally (e.g. lost to a page that failed during a scrape) and artists
+        whose updated_at changed (renamed, deleted upstream) are refetched with
+        full fields, keeping stored post counts. Local artists upstream no
+        longer lists are flagged deleted. end_id defaults to the newest id on
+        either side. Ranges whose request failed are returned in
+        'failed_ranges' and left untouched; so are ranges where a refetch
+        failed, after whatever could be repaired. Every request goes upstream,
+        bypassing the HTTP cache.
+        """
+        if self.read_only:
+            raise ReadOnlyDatabaseError("Cannot verify artists in read-only serving mode")
+        
+        range_size = max(1, min(int(range_size), VERIFY_RANGE_SIZE))
+        started_at = time.time()
+        start_requests = self.rate_limit_stats['total_requests']
+        start_429s = self.total_429_count
+        if end_id is None:
+            newest = self._fetch_json(f"{self.base_url}?limit=1&only=id", 'artists_verify',
+                                      'newest artist id', retries, bypass_cache=True) or []
+            with self.db.read() as conn:
+                local_max = conn.execute("SELECT MAX(id) FROM artists").fetchone()[0] or 0
+            end_id = max([local_max] + [artist['id'] for artist in newest])
+        
+        ranges = [(lo, min(lo + range_size - 1, end_id)) for lo in range(start_id, end_id + 1, range_size)]
+        result = {'state': 'running', 'ranges_total': len(ranges), 'ranges_checked': 0,
+                  'missing': 0, 'changed': 0, 'deleted': 0, 'refetched': 0, 'failed_ranges': []}
+        self.logger.info(f"🔍 Verifying artist ids {start_id}..{end_id} in {len(ranges)} ranges")
+        
+        def report():
+            elapsed = max(time.time() - started_at, 1e-6)
+            requests_made = self.rate_limit_stats['total_requests'] - start_requests
+            result['requests'] = requests_made
+            if not progress_callback:
+                return
+            try:
+                progress_callback(dict(
+                    result, failed_ranges=len(result['failed_ranges']),
+                    percent=100.0 * result['ranges_checked'] / len(ranges) if ranges else 100.0,
+                    rate_limited_429s=self.total_429_count - start_429s, elapsed_seconds=round(elapsed, 1),
+                    requests_per_second=round(requests_made / elapsed, 2),
+                    health_status=self._get_health_status()
+                ))
+            except Exception as e:
+                self.logger.warning(f"Progress callback failed: {e}")
+        
+        report()
+        for lo, hi in ranges:
+            if cancel_event is not None and cancel_event.is_set():
+                self.logger.info(f"🛑 Verification cancelled after {result['ranges_checked']} ranges")
+                result['state'] = 'cancelled'
+                break
+            
+            remote = self._fetch_json(
+                f"{self.base_url}?search[id]={lo}..{hi}&limit={range_size}&only=id,updated_at",
+                'artists_verify', f"ids {lo}..{hi}", retries, bypass_cache=True
+            )
+            if remote is None:
+                result['failed_ranges'].append([lo, hi])
+                continue
+            
+            with self.db.read() as conn:
+                local = {artist_id: (updated_ts, is_deleted) for artist_id, updated_ts, is_deleted in conn.execute(
+                    "SELECT id, updated_ts, is_deleted FROM artists WHERE id BETWEEN ? AND ?", (lo, hi))}
+            remote_updated = {artist['id']: to_epoch(artist.get('updated_at')) for artist in remote}
+            missing = [artist_id for artist_id in remote_updated if artist_id not in local]
+            changed = [artist_id for artist_id, updated in remote_updated.items()
+                       if artist_id in local and local[artist_id][0] != updated]
+            extra = [artist_id for artist_id, (_, is_deleted) in local.items()
+                     if artist_id not in remote_updated and not is_deleted]
+            
+            refetched, unfetched = self._refetch_artists(sorted(missing + changed), retries)
+            if extra:
+                self.group_writer.submit('artists_deleted',
+                                         "UPDATE artists SET is_deleted = 1, is_active = 0 WHERE id = ?",
+                                         [(artist_id,) for artist_id in extra]).wait()
+            
+            result['missing'] += len(missing)
+            result['changed'] += len(changed)
+            result['deleted'] += len(extra)
+            result['refetched'] += refetched
+            if unfetched:
+                # Not repaired yet: report the range so the next sweep covers it again
+                result['failed_ranges'].append([lo, hi])
+            else:
+                result['ranges_checked'] += 1
+            if missing or changed or extra:
+                self.logger.info(f"🩹 Ids {lo}..{hi}: {len(missing)} missing, {len(changed)} changed, "
+                                 f"{len(extra)} gone upstream")
+            report()
+        
+        if result['state'] == 'running':
+            result['state'] = 'completed'
+        report()
+        self.logger.info(f"✅ Verified {result['ranges_checked']}/{len(ranges)} ranges with "
+                         f"{result['requests']} requests: {result['missing']} missing, "
+                         f"{result['changed']} changed, {result['deleted']} flagged deleted")
+        return result
+    
+    def _refetch_artists(self, artist_ids: List[int], retries: int = 5) -> Tuple[int, int]:
+        """Fetch full records for the given ids and save them
+
+        Returns (artists saved, ids whose request or write failed).
+        """
+        saved = failed = 0
+        for start in range(0, len(artist_ids), REFETCH_CHUNK_SIZE):
+            chunk = artist_ids[start:start + REFETCH_CHUNK_SIZE]
+            url = (f"{self.base_url}?search[id]={','.join(map(str, chunk))}&limit={len(chunk)}"
+                   + self._only_param(ARTIST_API_FIELDS))
+            artists = self._fetch_json(url, 'artists', f"{len(chunk)} artists by id", retries, bypass_cache=True)
+            if artists is None:
+                failed += len(chunk)
+                continue
+            records = [record for record in map(parse_artist_json, artists) if record]
+            ticket = self.save_artists(records, preserve_post_counts=True)
+            unsaved = len(ticket.failed_rows) if ticket else 0
+            saved += len(records) - unsaved
+            failed += unsaved
+        return saved, failed
+    
     def get_artists_by_criteria(self, 
                               name_starts_with: str = None,
                               min_post_count: int = None,
                               max_post_count: int = None,
                               name_contains: str = None,
-                              limit: int = 100) -> List[Dict]:
-        """Query artists by various criteria"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+                              limit: int = 100,
+                              fields=None,
+                              fuzzy: str = None,
+                              min_similarity: float = trigram_index.DEFAULT_MIN_SIMILARITY,
+                              created_after=None,
+                              created_before=None,
+                              updated_since=None,
+                              exclude_deleted: bool = False,
+                              exclude_banned: bool = False) -> List[tuple]:
+        """Query artists by various criteria
+
+        Dates (created_after, created_before, updated_since) take epoch
+        seconds, datetimes or ISO 8601 strings; see typed_filters.
+        
+        With fuzzy, artists are matched by trigram similarity of their name or
+        aliases to that text (tolerating misspellings) and ranked by it; the
+        name filters are ignored and the post count range still applies.
+        
+        fields limits the columns read and returned: a field set name from
+        FIELD_SETS ('minimal', 'card', 'full'), a comma-separated string or a
+        list of column names. Defaults to every column.
+        
+        Rows are immutable records (ArtistRecord, or a projection record with
+        only the requested columns) that support dict-style access; use
+        to_dict() to serialize them. Results are served from the search cache
+        while the database generation is unchanged.
+        """
+        columns = resolve_fields(fields)
+        filters = typed_filters(created_after, created_before, updated_since, exclude_deleted, exclude_banned)
+        if fuzzy:
+            return self._fuzzy_search(fuzzy, min_similarity, min_post_count, max_post_count, limit, columns,
+                                      filters)
+        # LIKE is case-insensitive for ASCII, so queries differing only in ASCII case share an entry
+        cache_key = (
+            (name_starts_with or '').translate(_ASCII_LOWER) or None,
+            (name_contains or '').translate(_ASCII_LOWER) or None,
+            min_post_count,
+            max_post_count,
+            int(limit),
+            columns,
+            filters
+        )
+        generation = self.get_db_generation()
+        # The columnar index only holds names and post counts
+        if self.artist_index is not None and not filters:
+            artists = self.artist_index.search(generation, name_starts_with, min_post_count,
+                                               max_post_count, name_contains, limit, columns)
+            if artists is not None:
+                return artists
         
-        query = "SELECT * FROM artists WHERE 1=1"
+        cached = self.search_cache.get(cache_key, generation)
+        if cached is not None:
+            return list(cached)
+        
+        artists = self._query_artists(name_starts_with, min_post_count, max_post_count,
+                                      name_contains, limit, columns, filters)
+        self.search_cache.put(cache_key, generation, artists)
+        return list(artists)
+    
+    def enable_artist_index(self, background: bool = False):
+        """Serve searches from an in-memory columnar index kept in step with writes
+
+        Needs the optional numpy package; returns None (searches keep using
+        SQLite) when it isn't installed.
+        """
+        if artist_index.np is None:
+            self.logger.warning("⚠️  numpy is not installed; artist index disabled")
+            return None
+        if self.artist_index is None:
+            self.artist_index = artist_index.ColumnarArtistIndex(self.db)
+            if self.group_writer is not None:
+                self.group_writer.add_commit_listener(self.artist_index.apply_commit)
+            if background:
+                self.artist_index.rebuild_in_background()
+            else:
+                self.artist_index.rebuild()
+        return self.artist_index
+    
+    def autocomplete(self, prefix: str, limit: int = 10) -> List[Dict]:
+        """Top artists (by post count) whose name or alias starts with prefix
+
+        The prefix index is built in the background on the first call; until
+        it's ready, suggestions come from SQLite. Writes from other processes
+        trigger a background rebuild and slightly stale suggestions are served
+        meanwhile, which is fine for typeahead.
+        """
+        with self._lazy_index_lock:
+            index = self.autocomplete_index
+            if index is None:
+                index = self.autocomplete_index = autocomplete.AutocompleteIndex(self.db)
+                if self.group_writer is not None:
+                    self.group_writer.add_commit_listener(index.apply_commit)
+                index.rebuild_in_background()
+        if not index.ready:
+            with self.db.read() as conn:
+                return autocomplete.query_suggestions(conn, prefix, limit)
+        if not index.is_fresh(self.get_db_generation()):
+            index.rebuild_in_background()
+        return index.suggest(prefix, limit)
+    
+    def enable_fuzzy_index(self, background: bool = False) -> trigram_index.TrigramIndex:
+        """Build the trigram index used by fuzzy searches (otherwise built on first use)"""
+        with self._lazy_index_lock:
+            if self.fuzzy_index is None:
+                self.fuzzy_index = trigram_index.TrigramIndex(self.db)
+                if self.group_writer is not None:
+                    self.group_writer.add_commit_listener(self.fuzzy_index.apply_commit)
+                self.fuzzy_index.rebuild_in_background()
+        if not background:
+            self.fuzzy_index.wait_ready()
+        return self.fuzzy_index
+    
+    def _fuzzy_search(self, query: str, min_similarity: float, min_post_count: int,
+                      max_post_count: int, limit: int, columns: tuple, filters: tuple = ()) -> List[tuple]:
+        """Closest artists to query by trigram similarity, from the trigram index
+
+        The index is built in the background on the first call. A search that
+        finds it still building waits up to FUZZY_INDEX_WAIT seconds, then
+        scores candidates from SQLite instead of blocking on the build.
+        """
+        index = self.enable_fuzzy_index(background=True)
+        # Date/status filters are checked in SQLite, so overfetch candidates for them
+        wanted = limit * 4 if filters else limit
+        if not index.wait_ready(FUZZY_INDEX_WAIT):
+            with self.db.read() as conn:
+                matches = trigram_index.query_matches(conn, query, wanted, min_similarity,
+                                                      min_post_count, max_post_count)
+        else:
+            if not index.is_fresh(self.get_db_generation()):
+                index.rebuild_in_background()  # Serve slightly stale matches meanwhile
+            matches = index.search(query, wanted, min_similarity, min_post_count, max_post_count)
+        if not filters and all(column in FIELD_SETS['minimal'] for column in columns):
+            positions = [FIELD_SETS['minimal'].index(column) for column in columns]
+            make = record_type(columns)._make
+            return [make(match[p] for p in positions) for match in matches]
+        
+        # Other columns are read by id, keeping the similarity order
+        artist_ids = [match[0] for match in matches]
+        if not artist_ids:
+            return []
+        sql = f"SELECT id, {', '.join(columns)} FROM artists WHERE id IN ({','.join('?' * len(artist_ids))})"
+        params = list(artist_ids)
+        for clause, param in filters:
+            sql += f" AND {clause}"
+            if param is not None:
+                params.append(param)
+        with self.db.read() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        by_id = {row[0]: row[1:] for row in rows}
+        make = record_type(columns)._make
+        return [make(by_id[artist_id]) for artist_id in artist_ids if artist_id in by_id][:limit]
+    
+    def lookup_artists(self, names: Iterable[str], fields=None,
+                       chunk_size: int = LOOKUP_CHUNK_SIZE) -> Iterator[Tuple[str, List[tuple]]]:
+        """Resolve many names or aliases at once, yielding (name, matches) in input order
+
+        Matching is exact on the name/alias key (case-insensitive, spaces as
+        underscores). matches is empty for a miss; an alias shared by several
+        artists returns all of them, direct name matches first. Each chunk of
+        names is one indexed join against artist_names, with the names passed
+        as a JSON array (json_each works on read-only snapshots, unlike a
+        temporary table).
+        """
+        columns = resolve_fields(fields)
+        make = record_type(columns)._make
+        query = f'''
+            SELECT wanted.key, artists.id, {', '.join('artists.' + column for column in columns)}
+            FROM json_each(?) AS wanted
+            JOIN artist_names ON artist_names.key = {NAME_KEY_SQL.format('wanted.value')}
+            JOIN artists ON artists.id = artist_names.artist_id
+            ORDER BY wanted.key, artist_names.is_alias, artists.post_count DESC
+        '''
+        names = iter(names)
+        while True:
+            chunk = list(islice(names, chunk_size))
+            if not chunk:
+                return
+            with self.db.read() as conn:
+                rows = conn.execute(query, (json.dumps(chunk),)).fetchall()
+            matches: Dict[int, Dict[int, tuple]] = {}
+            for position, artist_id, *values in rows:
+                matches.setdefault(position, {}).setdefault(artist_id, make(values))
+            for position, name in enumerate(chunk):
+                yield name, list(matches.get(position, {}).values())
+    
+    def iter_artists_by_criteria(self,
+                                 name_starts_with: str = None,
+                                 min_post_count: int = None,
+                                 max_post_count: int = None,
+                                 name_contains: str = None,
+                                 limit: int = None,
+                                 fields=None,
+                                 fuzzy: str = None,
+                                 created_after=None,
+                                 created_before=None,
+                                 updated_since=None,
+                                 exclude_deleted: bool = False,
+                                 exclude_banned: bool = False) -> Iterator[tuple]:
+        """Stream every artist matching the get_artists_by_criteria criteria (for exports)
+
+        Rows come straight from one SQLite cursor, so memory stays flat however
+        many artists match; limit=None means all of them. Nothing is cached.
+        Fuzzy searches are ranked from the trigram index and need a limit
+        (1000 if none is given).
+        """
+        if fuzzy:
+            yield from self.get_artists_by_criteria(
+                min_post_count=min_post_count, max_post_count=max_post_count, limit=limit or 1000,
+                fields=fields, fuzzy=fuzzy, created_after=created_after, created_before=created_before,
+                updated_since=updated_since, exclude_deleted=exclude_deleted, exclude_banned=exclude_banned)
+            return
+        
+        columns = resolve_fields(fields)
+        filters = typed_filters(created_after, created_before, updated_since, exclude_deleted, exclude_banned)
+        query, params = self._search_sql(name_starts_with, min_post_count, max_post_count,
+                                         name_contains, limit, columns, filters)
+        make = record_type(columns)._make
+        with self.db.read() as conn:
+            cursor = conn.execute(query, params)
+            try:
+                for row in cursor:
+                    yield make(row)
+            finally:
+                cursor.close()
+    
+    def _search_sql(self, name_starts_with: str, min_post_count: int, max_post_count: int,
+                    name_contains: str, limit: Optional[int], columns: tuple = ARTIST_COLUMNS,
+                    filters: tuple = ()) -> Tuple[str, list]:
+        """SQL and parameters for an artist search, best post counts first"""
+        # Column names come from the ARTIST_COLUMNS whitelist (see resolve_fields)
+        query = f"SELECT {', '.join(columns)} FROM artists WHERE 1=1"
         params = []
         
         if name_starts_with:
@@ -706,36 +1979,42 @@ class DanbooruArtistScraper:
             query += " AND post_count <= ?"
             params.append(max_post_count)
         
-        query += " ORDER BY post_count DESC LIMIT ?"
-        params.append(limit)
-        
-        cursor.execute(query, params)
-        results = cursor.fetchall()
+        for clause, param in filters:
+            query += f" AND {clause}"
+            if param is not None:
+                params.append(param)
         
-        # Convert to dictionaries
-        columns = [description[0] for description in cursor.description]
-        artists = [dict(zip(columns, row)) for row in results]
-        
-        conn.close()
-        return artists
+        # id breaks ties so results are stable (and match the columnar index)
+        query += " ORDER BY post_count DESC, id DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(int(limit))
+        return query, params
+    
+    def _query_artists(self, name_starts_with: str, min_post_count: int, max_post_count: int,
+                       name_contains: str, limit: int, columns: tuple = ARTIST_COLUMNS,
+                       filters: tuple = ()) -> List[tuple]:
+        """Run the artist search query against SQLite (uncached)"""
+        query, params = self._search_sql(name_starts_with, min_post_count, max_post_count,
+                                         name_contains, limit, columns, filters)
+        with self.db.read() as conn:
+            return list(map(record_type(columns)._make, conn.execute(query, params)))
     
     def get_database_stats(self) -> Dict:
         """Get statistics about the database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT COUNT(*) FROM artists")
-        total_artists = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT AVG(post_count), MAX(post_count) FROM artists WHERE post_count > 0")
-        result = cursor.fetchone()
-        avg_posts = result[0] if result[0] is not None else 0
-        max_posts = result[1] if result[1] is not None else 0
-        
-        cursor.execute("SELECT name, post_count FROM artists ORDER BY post_count DESC LIMIT 10")
-        top_artists = cursor.fetchall()
-        
-        conn.close()
+        with self.db.read() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("SELECT COUNT(*) FROM artists")
+            total_artists = cursor.fetchone()[0]
+            
+            cursor.execute("SELECT AVG(post_count), MAX(post_count) FROM artists WHERE post_count > 0")
+            result = cursor.fetchone()
+            avg_posts = result[0] if result[0] is not None else 0
+            max_posts = result[1] if result[1] is not None else 0
+            
+            cursor.execute("SELECT name, post_count FROM artists ORDER BY post_count DESC LIMIT 10")
+            top_artists = cursor.fetchall()
         
         return {
             'total_artists': total_artists,
@@ -746,32 +2025,24 @@ class DanbooruArtistScraper:
 
     def export_to_csv(self, filename: str = "danbooru_artists.csv", limit: int = None) -> str:
         """Export all artists to CSV file"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        query = "SELECT * FROM artists ORDER BY name"
+        query = f"SELECT {', '.join(ARTIST_COLUMNS)} FROM artists ORDER BY name"
         if limit:
-            query += f" LIMIT {limit}"
-        
-        cursor.execute(query)
-        results = cursor.fetchall()
+            query += f" LIMIT {int(limit)}"
         
-        # Get column names
-        columns = [description[0] for description in cursor.description]
-        
-        # Write to CSV
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+        exported = 0
+        with self.db.read() as conn, open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+            cursor = conn.execute(query)
             writer = csv.writer(csvfile)
             
             # Write header
-            writer.writerow(columns)
+            writer.writerow([description[0] for description in cursor.description])
             
-            # Write data
-            writer.writerows(results)
-        
-        conn.close()
+            # Write data straight from the cursor
+            for row in cursor:
+                writer.writerow(row)
+                exported += 1
         
-        self.logger.info(f"📁 Exported {len(results)} artists to {filename}")
+        self.logger.info(f"📁 Exported {exported} artists to {filename}")
         return filename
 
 if __name__ == "__main__":
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Diff two artist snapshots: which artists were added, removed or changed
+
+A snapshot is an artists database, a CSV export (danbooru_artists.csv) or an
+NDJSON export (/search/export?format=ndjson). Both sides are read as streams
+ordered by id and merge-joined, so memory stays constant however large the
+catalogue is. The database is read in primary key order. Files that aren't
+already sorted by id (CSV exports are sorted by name) are external-sorted
+first, using sorted runs spilled to a temporary directory.
+
+Output is NDJSON, one line per difference:
+    {"change": "added", "id": 7, "record": {...}}
+    {"change": "removed", "id": 3, "record": {...}}
+    {"change": "changed", "id": 5, "name": "...", "fields": {"post_count": [10, 12]}}
+
+Usage:
+    python snapshot_diff.py OLD NEW [--output diff.ndjson] [--ignore post_count]
+"""
+
+import argparse
+import csv
+import heapq
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import sys
+import tempfile
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+from records import ARTIST_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+# Records per sorted run when a file has to be external-sorted
+SORT_RUN_SIZE = 200000
+
+_TRUE_VALUES = {True, 1, '1', 'true', 'True', 'TRUE'}
+
+
+def _to_int(value):
+    return int(value) if value not in (None, '') else None
+
+
+def _to_flag(value) -> bool:
+    return value in _TRUE_VALUES
+
+
+def _to_text(value) -> str:
+    return '' if value is None else str(value)
+
+
+# Records are tuples in ARTIST_COLUMNS order; these make values comparable across sources
+_CONVERTERS = tuple(_to_int if column in ('id', 'post_count') else
+                    _to_flag if column in ('is_active', 'is_banned', 'is_deleted') else
+                    _to_text for column in ARTIST_COLUMNS)
+
+
+def normalize_record(record: Dict) -> tuple:
+    """Comparable record tuple whatever the source: ints, True/False flags and '' for missing text"""
+    return tuple(convert(record.get(column)) for column, convert in zip(ARTIST_COLUMNS, _CONVERTERS))
+
+
+def _id(record: tuple) -> int:
+    return record[0]
+
+
+def _read_database(path: str) -> Iterator[tuple]:
+    conn = sqlite3.connect(f"file:{os.path.abspath(path)}?mode=ro", uri=True)
+    try:
+        cursor = conn.execute(f"SELECT {', '.join(ARTIST_COLUMNS)} FROM artists ORDER BY id")
+        for row in cursor:
+            yield tuple(convert(value) for convert, value in zip(_CONVERTERS, row))
+    finally:
+        conn.close()
+
+
+def _read_file(path: str) -> Iterator[tuple]:
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.endswith('.csv'):
+            records = csv.DictReader(f)
+        else:
+            records = (json.loads(line) for line in f if line.strip())
+        for record in records:
+            yield normalize_record(record)
+
+
+def _is_sorted(records: Iterable[tuple]) -> bool:
+    previous = None
+    for record in records:
+        if previous is not None and record[0] < previous:
+            return False
+        previous = record[0]
+    return True
+
+
+def _read_run(path: str) -> Iterator[tuple]:
+    with open(path, 'rb') as f:
+        while True:
+            try:
+                yield from pickle.load(f)
+            except EOFError:
+                return
+
+
+def external_sort(records: Iterable[tuple], run_size: int = SORT_RUN_SIZE) -> Iterator[tuple]:
+    """Records ordered by id, holding at most run_size of them in memory
+
+    Input order is kept for equal ids, so the last duplicate stays last.
+    """
+    with tempfile.TemporaryDirectory(prefix='snapshot-diff-') as tmp_dir:
+        runs = []
+        batch = []
+
+        def spill():
+            batch.sort(key=_id)
+            path = os.path.join(tmp_dir, f'run-{len(runs)}')
+            with open(path, 'wb') as f:
+                # Pickled in blocks: one object per record would dominate the run time
+                for start in range(0, len(batch), 1000):
+                    pickle.dump(batch[start:start + 1000], f, pickle.HIGHEST_PROTOCOL)
+            runs.append(path)
+            batch.clear()
+
+        for record in records:
+            batch.append(record)
+            if len(batch) >= run_size:
+                spill()
+        if batch:
+            spill()
+        logger.info(f"📦 External sort: {len(runs)} run(s) of up to {run_size} records")
+        yield from heapq.merge(*(_read_run(path) for path in runs), key=_id)
+
+
+def open_snapshot(path: str, run_size: int = SORT_RUN_SIZE) -> Iterator[tuple]:
+    """Normalized record tuples of a snapshot, ordered by id (see module docstring)"""
+    if path.endswith(('.csv', '.ndjson', '.jsonl')):
+        # One cheap streaming pass decides whether the file needs sorting
+        if _is_sorted(_read_file(path)):
+            return _read_file(path)
+        return external_sort(_read_file(path), run_size)
+    return _read_database(path)
+
+
+def _unique_ids(records: Iterable[tuple]) -> Iterator[tuple]:
+    """Collapse repeated ids to their last record"""
+    pending = None
+    for record in records:
+        if pending is not None and record[0] != pending[0]:
+            yield pending
+        pending = record
+    if pending is not None:
+        yield pending
+
+
+def diff_snapshots(old: Iterable[tuple], new: Iterable[tuple],
+                   ignore: Sequence[str] = ()) -> Iterator[Dict]:
+    """Merge-join two id-ordered record streams and yield their differences"""
+    compared = [i for i, column in enumerate(ARTIST_COLUMNS) if i and column not in ignore]
+    old, new = _unique_ids(old), _unique_ids(new)
+    old_record, new_record = next(old, None), next(new, None)
+    while old_record is not None or new_record is not None:
+        if new_record is None or (old_record is not None and old_record[0] < new_record[0]):
+            yield {'change': 'removed', 'id': old_record[0], 'record': dict(zip(ARTIST_COLUMNS, old_record))}
+            old_record = next(old, None)
+        elif old_record is None or new_record[0] < old_record[0]:
+            yield {'change': 'added', 'id': new_record[0], 'record': dict(zip(ARTIST_COLUMNS, new_record))}
+            new_record = next(new, None)
+        else:
+            # Whole-tuple comparison first: most artists don't change between scrapes
+            if old_record != new_record:
+                changed = {ARTIST_COLUMNS[i]: [old_record[i], new_record[i]]
+                           for i in compared if old_record[i] != new_record[i]}
+                if changed:
+                    yield {'change': 'changed', 'id': new_record[0], 'name': new_record[1], 'fields': changed}
+            old_record, new_record = next(old, None), next(new, None)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Diff two artist snapshots (database, CSV or NDJSON)")
+    parser.add_argument('old', help="Earlier snapshot (artists.db, .csv or .ndjson)")
+    parser.add_argument('new', help="Later snapshot (artists.db, .csv or .ndjson)")
+    parser.add_argument('--output', help="Write the NDJSON diff here instead of stdout")
+    parser.add_argument('--ignore', action='append', default=[], choices=ARTIST_COLUMNS[1:],
+                        help="Column to leave out of the comparison (repeatable)")
+    parser.add_argument('--run-size', type=int, default=SORT_RUN_SIZE,
+                        help="Records per external sort run (memory bound for unsorted files)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+    counts = Counter()
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        for difference in diff_snapshots(open_snapshot(args.old, args.run_size),
+                                         open_snapshot(args.new, args.run_size), args.ignore):
+            counts[difference['change']] += 1
+            out.write(json.dumps(difference, ensure_ascii=False) + '\n')
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"✅ {counts['added']} added, {counts['removed']} removed, {counts['changed']} changed",
+          file=sys.stderr)
+    return counts
+
+
+if __name__ == "__main__":
+    main()
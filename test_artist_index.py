@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test the in-memory columnar artist index against the SQLite search path
+"""
+
+import os
+import random
+import tempfile
+import time
+import artist_index
+from scraper import DanbooruArtistScraper, resolve_fields
+
+def make_artist(artist_id, name, post_count):
+    return {
+        'id': artist_id, 'name': name, 'post_count': post_count, 'other_names': '',
+        'group_name': f'group_{artist_id % 7}', 'url_string': '', 'is_active': True,
+        'created_at': '', 'updated_at': '', 'is_banned': False, 'is_deleted': False
+    }
+
+def same_results(index_rows, sql_rows):
+    """Both paths order by post count; ties may come back in either order"""
+    def key(row):
+        return (-row['post_count'], row['id'] if 'id' in row else row['name'])
+    return sorted(index_rows, key=key) == sorted(sql_rows, key=key)
+
+def test_artist_index():
+    print("🧪 Testing Columnar Artist Index")
+    print("=" * 50)
+
+    if artist_index.np is None:
+        print("  ⏭️  numpy not installed, index disabled - skipping")
+        scraper = DanbooruArtistScraper(db_path=os.path.join(tempfile.mkdtemp(), "artists.db"))
+        assert scraper.enable_artist_index() is None
+        return
+
+    rng = random.Random(7)
+    syllables = ['ka', 'ki', 'ku', 'sa', 'shi', 'to', 'na', 'mi', 'ya', 'ra']
+    names = set()
+    while len(names) < 20000:
+        names.add(''.join(rng.choice(syllables) for _ in range(rng.randint(2, 5))))
+    artists = [make_artist(i + 1, name, rng.choice([0, 0, 1, 5, 10, 50, rng.randint(0, 5000)]))
+               for i, name in enumerate(sorted(names))]
+    artists[0]['name'] = 'Kantoku'
+    artists[1]['name'] = 'Émilie'
+
+    scraper = DanbooruArtistScraper(db_path=os.path.join(tempfile.mkdtemp(), "artists.db"))
+    scraper.save_artists(artists)
+    index = scraper.enable_artist_index()
+    print(f"  Built index of {index.get_stats()['artists']} artists in {index.build_seconds * 1000:.0f}ms")
+
+    queries = [
+        {'name_starts_with': 'ka'}, {'name_starts_with': 'KA', 'min_post_count': 10},
+        {'min_post_count': 5, 'max_post_count': 50, 'limit': 1000}, {'max_post_count': 0, 'limit': 5},
+        {'name_starts_with': 'shira', 'max_post_count': 100}, {'name_starts_with': 'zz'},
+        {'limit': 100}, {'name_starts_with': 'kantoku'}, {'name_starts_with': 'Émi'},
+        {'name_starts_with': 'émi'},
+    ]
+
+    def both(fields=None, **criteria):
+        generation = scraper.get_db_generation()
+        sql = scraper._query_artists(criteria.get('name_starts_with'), criteria.get('min_post_count'),
+                                     criteria.get('max_post_count'), None, criteria.get('limit', 100),
+                                     resolve_fields(fields))
+        indexed = index.search(generation, limit=criteria.pop('limit', 100),
+                               columns=resolve_fields(fields), **criteria)
+        return indexed, sql
+
+    for query in queries:
+        for fields in ('minimal', None):
+            indexed, sql = both(fields=fields, **dict(query))
+            assert indexed is not None
+            assert same_results([r.to_dict() for r in indexed], [r.to_dict() for r in sql]), (query, fields)
+    assert both(name_starts_with='kantoku')[0][0]['name'] == 'Kantoku'
+    # Only ASCII letters fold, as with LIKE
+    assert both(name_starts_with='Émi')[0][0]['name'] == 'Émilie' and both(name_starts_with='émi')[0] == []
+
+    # Timing of index-only queries
+    generation = scraper.get_db_generation()
+    columns = ('id', 'name', 'post_count')
+    started = time.perf_counter()
+    for _ in range(200):
+        index.search(generation, name_starts_with='ka', min_post_count=5, columns=columns)
+        index.search(generation, min_post_count=10, max_post_count=1000, columns=columns)
+    per_query = (time.perf_counter() - started) / 400
+    print(f"  Average indexed query: {per_query * 1000:.3f}ms")
+
+    # Writes through the group commit writer land in the overlay, not a rebuild
+    scraper.save_artists([make_artist(50001, 'kazoo', 999999), make_artist(2, 'renamed', 3)])
+    scraper.save_post_counts([(888888, 3)])
+    stats = index.get_stats()
+    assert stats['rebuilds'] == 1 and stats['overlay'] == 3
+    top = scraper.get_artists_by_criteria(limit=3, fields='minimal')
+    assert [a['name'] for a in top[:2]] == ['kazoo', artists[2]['name']]
+    assert index.stats['queries'] > 0
+    for query in queries:
+        indexed, sql = both(fields='minimal', **dict(query))
+        assert same_results([r.to_dict() for r in indexed], [r.to_dict() for r in sql]), query
+
+    # Queries the index can't answer exactly fall back to SQLite
+    assert index.search(scraper.get_db_generation(), name_contains='ka') is None
+    assert index.search(scraper.get_db_generation(), name_starts_with='k_') is None
+    assert len(scraper.get_artists_by_criteria(name_contains='kazoo')) == 1
+
+    # Writes from elsewhere (another process) make the index stale until rebuilt
+    with scraper.db.write() as conn:
+        conn.execute("UPDATE artists SET post_count = 7777777 WHERE id = 10")
+        scraper._bump_generation(conn)
+    assert scraper.get_artists_by_criteria(limit=1)[0]['id'] == 10
+    deadline = time.time() + 10
+    while not index.is_fresh(scraper.get_db_generation()) and time.time() < deadline:
+        time.sleep(0.05)
+    assert index.get_stats()['rebuilds'] == 2
+    assert index.search(scraper.get_db_generation(), limit=1, columns=('id',))[0]['id'] == 10
+
+    print("\n✅ Artist index test completed!")
+
+if __name__ == "__main__":
+    test_artist_index()
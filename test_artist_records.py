@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Test compact artist records from parsing through storage and search results
+"""
+
+import json
+import os
+import pickle
+import sys
+import tempfile
+from records import ARTIST_COLUMNS, ArtistRecord, record_type
+from scraper import DanbooruArtistScraper, parse_artist_json
+
+def test_artist_records():
+    print("🧪 Testing Compact Artist Records")
+    print("=" * 50)
+
+    record = parse_artist_json({'id': 7, 'name': ' kantoku ', 'other_names': ['カントク'],
+                                'group_name': '5年目の放課後', 'is_deleted': False}, post_count=42)
+    assert isinstance(record, ArtistRecord)
+
+    # Dict-style access keeps existing callers working
+    assert record['name'] == record.name == 'kantoku'
+    assert record['post_count'] == 42 and record.get('missing', 'x') == 'x'
+    assert 'other_names' in record and 'missing' not in record
+    assert list(record.keys()) == list(ARTIST_COLUMNS)
+    assert dict(record) == record.to_dict() and record.to_dict()['other_names'] == 'カントク'
+    assert tuple(record) == tuple(record.to_dict()[column] for column in ARTIST_COLUMNS)
+
+    # No per-instance dict, and smaller than the dict it replaces
+    assert not hasattr(record, '__dict__')
+    print(f"  Record: {sys.getsizeof(record)} bytes, dict: {sys.getsizeof(record.to_dict())} bytes")
+    assert sys.getsizeof(record) < sys.getsizeof(record.to_dict())
+
+    # Records survive the process pool used by archive re-ingest
+    assert pickle.loads(pickle.dumps(record)) == record
+
+    # Storage round trip: records and legacy dicts are both accepted
+    scraper = DanbooruArtistScraper(db_path=os.path.join(tempfile.mkdtemp(), "artists.db"))
+    legacy = dict(record.to_dict(), id=8, name='kantoku2', post_count=5)
+    scraper.save_artists([record, legacy])
+
+    results = scraper.get_artists_by_criteria(name_starts_with='kan')
+    assert [artist.name for artist in results] == ['kantoku', 'kantoku2']
+    assert results[0] == ArtistRecord(7, 'kantoku', 42, 'カントク', '5年目の放課後', '', 1,
+                                      '', '', 0, 0)
+
+    # Projections get their own record class with only the requested columns
+    cards = scraper.get_artists_by_criteria(name_starts_with='kan', fields='minimal')
+    assert type(cards[0]) is record_type(('id', 'name', 'post_count'))
+    assert cards[0].to_dict() == {'id': 7, 'name': 'kantoku', 'post_count': 42}
+
+    # Converted to plain objects at the JSON boundary
+    payload = json.loads(json.dumps([artist.to_dict() for artist in cards], ensure_ascii=False))
+    assert payload[1] == {'id': 8, 'name': 'kantoku2', 'post_count': 5}
+
+    print("\n✅ Artist records test completed!")
+
+if __name__ == "__main__":
+    test_artist_records()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test the prefix typeahead index against a brute-force scan
+"""
+
+import os
+import random
+import tempfile
+import time
+from autocomplete import AutocompleteIndex, normalize, query_suggestions, split_aliases
+from scraper import DanbooruArtistScraper
+
+def make_artist(artist_id, name, post_count, other_names=''):
+    return {
+        'id': artist_id, 'name': name, 'post_count': post_count, 'other_names': other_names,
+        'group_name': '', 'url_string': '', 'is_active': True, 'created_at': '',
+        'updated_at': '', 'is_banned': False, 'is_deleted': False
+    }
+
+def brute_force(artists, prefix, limit):
+    """Best post count per matching artist, ties by name"""
+    key = normalize(prefix)
+    matches = [a for a in artists.values()
+               if any(normalize(t).startswith(key) for t in [a['name']] + split_aliases(a['other_names']))]
+    matches.sort(key=lambda a: (-a['post_count'], a['name']))
+    return [(a['name'], a['post_count']) for a in matches[:limit]]
+
+def names_of(suggestions):
+    return [(s['name'], s['post_count']) for s in suggestions]
+
+def test_autocomplete():
+    print("🧪 Testing Autocomplete Prefix Index")
+    print("=" * 50)
+
+    rng = random.Random(11)
+    syllables = ['ka', 'ki', 'ku', 'sa', 'shi', 'to', 'na', 'mi', 'ya', 'ra']
+    names = set()
+    while len(names) < 30000:
+        names.add(''.join(rng.choice(syllables) for _ in range(rng.randint(2, 5))))
+    artists = {}
+    for i, name in enumerate(sorted(names)):
+        aliases = ', '.join(f'{rng.choice(syllables)} {name}' for _ in range(rng.randint(0, 2)))
+        artists[i + 1] = make_artist(i + 1, name, rng.randint(0, 100000), aliases)
+    artists[1]['name'] = 'Ōkami_e'
+
+    scraper = DanbooruArtistScraper(db_path=os.path.join(tempfile.mkdtemp(), "artists.db"))
+    scraper.save_artists(list(artists.values()))
+
+    # Before the index is ready, SQLite answers the same way
+    with scraper.db.read() as conn:
+        assert names_of(query_suggestions(conn, 'kas', 10)) == brute_force(artists, 'kas', 10)
+
+    index = AutocompleteIndex(scraper.db)
+    index.rebuild()
+    scraper.autocomplete_index = index
+    scraper.group_writer.add_commit_listener(index.apply_commit)
+    stats = index.get_stats()
+    print(f"  Built {stats['entries']} names and aliases in {index.build_seconds * 1000:.0f}ms")
+
+    prefixes = ['k', 'ka', 'KAS', 'kasa', 'shira', 'mi ka', 'zz', 'to_na', 'sakinakumi']
+    for prefix in prefixes:
+        assert names_of(scraper.autocomplete(prefix, 10)) == brute_force(artists, prefix, 10), prefix
+
+    # Only ASCII letters fold, so the index and the LIKE fallback agree on other scripts
+    with scraper.db.read() as conn:
+        for prefix in ['Ōka', 'ōka', 'KAS']:
+            assert names_of(index.suggest(prefix, 10)) == names_of(query_suggestions(conn, prefix, 10)), prefix
+    assert names_of(index.suggest('Ōka', 10))[0][0] == 'Ōkami_e' and index.suggest('ōka', 10) == []
+
+    # Alias matches report which alias matched
+    alias_hit = next(a for a in artists.values() if a['other_names'])
+    alias = split_aliases(alias_hit['other_names'])[0]
+    suggestion = next(s for s in index.suggest(alias, 25) if s['id'] == alias_hit['id'])
+    assert suggestion['is_alias'] and suggestion['match'] == alias
+
+    # Typeahead latency over every 1-6 character prefix of real names
+    queries = [name[:rng.randint(1, 6)] for name in rng.sample(sorted(names), 2000)]
+    timings = []
+    for prefix in queries:
+        started = time.perf_counter()
+        index.suggest(prefix, 10)
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    p99 = timings[int(len(timings) * 0.99)]
+    print(f"  p50 {timings[len(timings) // 2] * 1000:.3f}ms, p99 {p99 * 1000:.3f}ms")
+    assert p99 < 0.005
+
+    # Writes through save_artists/save_post_counts show up without a rebuild
+    top = scraper.autocomplete('ka', 1)[0]
+    artists[40001] = make_artist(40001, 'kazoo', 10 ** 7, 'the kazoo artist')
+    artists[top['id']]['post_count'] = 0
+    scraper.save_artists([artists[40001]])
+    scraper.save_post_counts([(0, top['id'])])
+    assert index.get_stats()['rebuilds'] == 1
+    for prefix in ['ka', 'kaz', 'the_k', top['name'][:4]]:
+        assert names_of(scraper.autocomplete(prefix, 10)) == brute_force(artists, prefix, 10), prefix
+
+    # Writes the overlay can't model trigger a background rebuild
+    with scraper.db.write() as conn:
+        conn.execute("UPDATE artists SET post_count = 99999999 WHERE id = 5")
+        scraper._bump_generation(conn)
+    artists[5]['post_count'] = 99999999
+    scraper.autocomplete('k', 1)
+    deadline = time.time() + 10
+    while not index.is_fresh(scraper.get_db_generation()) and time.time() < deadline:
+        time.sleep(0.05)
+    assert index.get_stats()['rebuilds'] == 2
+    first = artists[5]['name'][0]
+    assert names_of(scraper.autocomplete(first, 10)) == brute_force(artists, first, 10)
+
+    # Endpoint
+    os.environ.setdefault('ARTISTS_DB_PATH', os.path.join(tempfile.mkdtemp(), "app.db"))
+    import app as app_module
+    client = app_module.app.test_client()
+    payload = client.get('/autocomplete?q=a&limit=5').get_json()
+    assert payload['success'] and payload['query'] == 'a'
+    assert client.get('/autocomplete?q=a&limit=x').status_code == 400
+
+    print("\n✅ Autocomplete test completed!")
+
+if __name__ == "__main__":
+    test_autocomplete()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test bulk name/alias lookup through the artist_names join
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from scraper import DanbooruArtistScraper
+
+def make_artist(artist_id, name, post_count, other_names=''):
+    return {
+        'id': artist_id, 'name': name, 'post_count': post_count, 'other_names': other_names,
+        'group_name': '', 'url_string': '', 'is_active': True, 'created_at': '',
+        'updated_at': '', 'is_banned': False, 'is_deleted': False
+    }
+
+def test_bulk_lookup():
+    print("🧪 Testing Bulk Artist Lookup")
+    print("=" * 50)
+
+    db_path = os.path.join(tempfile.mkdtemp(), "artists.db")
+    scraper = DanbooruArtistScraper(db_path=db_path)
+    artists = [make_artist(i, f'artist_{i}', i, f'alias {i}, 別名{i}') for i in range(1, 50001)]
+    artists += [make_artist(60001, 'Kantoku', 5000, 'shared alias'),
+                make_artist(60002, 'kantoku_2', 10, 'Shared Alias')]
+    scraper.save_artists(artists)
+
+    # Names, aliases (any case, spaces or underscores), misses, in input order
+    queries = ['kantoku', 'alias_7', '別名42', 'nobody', 'SHARED alias', 'artist_1']
+    results = list(scraper.lookup_artists(queries, fields='minimal'))
+    assert [name for name, _ in results] == queries
+    assert results[0][1][0]['id'] == 60001
+    assert results[1][1][0]['name'] == 'artist_7'
+    assert results[2][1][0]['id'] == 42
+    assert results[3][1] == []
+    assert [a['id'] for a in results[4][1]] == [60001, 60002]
+    assert [a['id'] for a in results[5][1]] == [1]
+
+    # Thousands of names per second, chunked into indexed joins
+    names = [f'artist_{i}' for i in range(1, 20001)] + [f'missing_{i}' for i in range(5000)]
+    started = time.time()
+    found = sum(1 for _, matches in scraper.lookup_artists(names) if matches)
+    elapsed = time.time() - started
+    print(f"  {len(names)} lookups in {elapsed * 1000:.0f}ms ({len(names) / elapsed:.0f}/s)")
+    assert found == 20000
+    assert len(names) / elapsed > 5000
+
+    # Renames and alias edits keep the keys in sync (triggers on the artists table)
+    scraper.save_artists([make_artist(7, 'renamed_7', 7, 'new alias')])
+    scraper.save_artists([make_artist(8, 'artist_8', 8, 'merged alias')], preserve_post_counts=True)
+    with scraper.db.write() as conn:
+        conn.execute("DELETE FROM artists WHERE id = 9")
+    lookups = dict(scraper.lookup_artists(['artist_7', 'alias 7', 'new_alias', 'merged alias', 'artist_9']))
+    assert lookups['artist_7'] == [] and lookups['alias 7'] == [] and lookups['artist_9'] == []
+    assert lookups['new_alias'][0]['name'] == 'renamed_7' and lookups['merged alias'][0]['id'] == 8
+
+    # Re-saving a name under a new id drops the displaced artist's keys;
+    # aliases with control characters are indexed instead of voiding the list
+    scraper.save_artists([make_artist(70001, 'moved', 1, 'old alias')])
+    scraper.save_artists([make_artist(70002, 'moved', 1, 'tab\there, fine alias')])
+    lookups = dict(scraper.lookup_artists(['moved', 'old alias', 'tab\there', 'fine alias']))
+    assert [a['id'] for a in lookups['moved']] == [70002] and lookups['old alias'] == []
+    assert lookups['tab\there'][0]['id'] == 70002 and lookups['fine alias'][0]['id'] == 70002
+    with scraper.db.read() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM artist_names WHERE artist_id = 70001").fetchone()[0] == 0
+
+    # Triggers from older versions are replaced and the keys they wrote rebuilt
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("DROP TRIGGER artist_names_insert")
+        conn.execute("CREATE TRIGGER IF NOT EXISTS artist_names_insert AFTER INSERT ON artists BEGIN "
+                     "DELETE FROM artist_names WHERE artist_id = NEW.id; END")
+        conn.execute("INSERT INTO artist_names VALUES ('stale', 999999, 0)")
+    scraper = DanbooruArtistScraper(db_path=db_path)
+    lookups = dict(scraper.lookup_artists(['stale', 'alias 5', 'fine alias']))
+    assert lookups['stale'] == [] and lookups['alias 5'][0]['id'] == 5 and lookups['fine alias']
+    scraper.save_artists([make_artist(70003, 'after_migration', 1, 'fresh alias')])
+    assert dict(scraper.lookup_artists(['fresh alias']))['fresh alias'][0]['id'] == 70003
+
+    # Databases from before artist_names existed are backfilled on open
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("DROP TABLE artist_names")
+    scraper = DanbooruArtistScraper(db_path=db_path)
+    assert [a['id'] for a in dict(scraper.lookup_artists(['alias 5']))['alias 5']] == [5]
+
+    # NDJSON endpoint (JSON list or one name per line)
+    os.environ.setdefault('ARTISTS_DB_PATH', os.path.join(tempfile.mkdtemp(), "app.db"))
+    import app as app_module
+    app_module.scraper.save_artists([make_artist(1, 'lookup_me', 3, 'other')])
+    client = app_module.app.test_client()
+    response = client.post('/artists/lookup', json={'names': ['lookup_me', 'nope']})
+    assert response.mimetype == 'application/x-ndjson'
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [line['found'] for line in lines] == [True, False]
+    assert lines[0]['artists'][0] == {'id': 1, 'name': 'lookup_me', 'post_count': 3}
+    response = client.post('/artists/lookup?fields=card', data='other\n\nnope\n', content_type='text/plain')
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert len(lines) == 2 and lines[0]['artists'][0]['other_names'] == 'other'
+    assert client.post('/artists/lookup', json={'names': 'x'}).status_code == 400
+
+    print("\n✅ Bulk lookup test completed!")
+
+if __name__ == "__main__":
+    test_bulk_lookup()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test ETag revalidation and gzip/brotli compression of JSON responses
+"""
+
+import gzip
+import json
+import os
+import tempfile
+from scraper import DanbooruArtistScraper
+
+def make_artist(artist_id, post_count):
+    return {
+        'id': artist_id, 'name': f'artist_{artist_id}', 'post_count': post_count, 'other_names': '',
+        'group_name': '', 'url_string': '', 'is_active': True, 'created_at': '',
+        'updated_at': '', 'is_banned': False, 'is_deleted': False
+    }
+
+def test_conditional_responses():
+    print("🧪 Testing Conditional and Compressed Responses")
+    print("=" * 50)
+
+    os.environ.setdefault('ARTISTS_DB_PATH', os.path.join(tempfile.mkdtemp(), "app.db"))
+    import app as app_module
+
+    scraper = DanbooruArtistScraper(db_path=os.path.join(tempfile.mkdtemp(), "artists.db"))
+    scraper.save_artists([make_artist(i, i) for i in range(1, 201)])
+    app_scraper, app_module.scraper = app_module.scraper, scraper
+    try:
+        check_revalidation(app_module.app.test_client(), scraper)
+        check_compression(app_module)
+    finally:
+        app_module.scraper = app_scraper
+
+    print("\n✅ Conditional responses test completed!")
+
+def check_revalidation(client, scraper):
+    # A matching If-None-Match gets an empty 304 with the same validator
+    first = client.get('/search?name_starts_with=artist_1&limit=5')
+    etag = first.headers['ETag']
+    assert first.status_code == 200 and etag.startswith('W/')
+    assert first.headers['Cache-Control'] == 'no-cache'
+    again = client.get('/search?name_starts_with=artist_1&limit=5', headers={'If-None-Match': etag})
+    assert again.status_code == 304 and again.data == b'' and again.headers['ETag'] == etag
+    assert client.get('/stats', headers={'If-None-Match': client.get('/stats').headers['ETag']}).status_code == 304
+
+    # Other criteria get their own validator
+    other = client.get('/search?name_starts_with=artist_2&limit=5', headers={'If-None-Match': etag})
+    assert other.status_code == 200 and other.headers['ETag'] != etag
+
+    # A write bumps the generation, so the old ETag no longer matches
+    scraper.save_artists([make_artist(1000, 5000)])
+    changed = client.get('/search?name_starts_with=artist_1&limit=5', headers={'If-None-Match': etag})
+    assert changed.status_code == 200 and changed.headers['ETag'] != etag
+    assert changed.get_json()['artists'][0]['name'] == 'artist_1000'
+    print("  ✅ 304 on a matching ETag, fresh body after a write")
+
+def check_compression(app_module):
+    client = app_module.app.test_client()
+    url = '/search?name_starts_with=artist_&limit=200'
+    plain = client.get(url)
+    assert len(plain.data) >= app_module.COMPRESS_MIN_SIZE
+    assert 'Content-Encoding' not in plain.headers
+
+    gzipped = client.get(url, headers={'Accept-Encoding': 'gzip'})
+    assert gzipped.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in gzipped.headers['Vary']
+    assert json.loads(gzip.decompress(gzipped.data)) == plain.get_json()
+    print(f"  ✅ gzip: {len(plain.data)} -> {len(gzipped.data)} bytes")
+
+    # brotli is preferred when installed; without it br-only clients get identity
+    brotli_response = client.get(url, headers={'Accept-Encoding': 'br, gzip'})
+    if app_module.brotli is not None:
+        assert brotli_response.headers['Content-Encoding'] == 'br'
+        assert 'Accept-Encoding' in brotli_response.headers['Vary']
+        assert json.loads(app_module.brotli.decompress(brotli_response.data)) == plain.get_json()
+        print(f"  ✅ br: {len(plain.data)} -> {len(brotli_response.data)} bytes")
+    else:
+        assert brotli_response.headers['Content-Encoding'] == 'gzip'
+        assert 'Content-Encoding' not in client.get(url, headers={'Accept-Encoding': 'br'}).headers
+        print("  ⚠️ brotli not installed, br clients fall back to gzip/identity")
+
+    # Small bodies and 304s are left alone
+    small = client.get('/search?name_starts_with=artist_1&limit=1', headers={'Accept-Encoding': 'gzip'})
+    assert len(small.data) < app_module.COMPRESS_MIN_SIZE and 'Content-Encoding' not in small.headers
+    revalidated = client.get(url, headers={'Accept-Encoding': 'gzip', 'If-None-Match': gzipped.headers['ETag']})
+    assert revalidated.status_code == 304 and 'Content-Encoding' not in revalidated.headers
+
+if __name__ == "__main__":
+    test_conditional_responses()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test shared SQLite connections: pooled readers, one writer and pragmas
+"""
+
+import os
+import tempfile
+import threading
+import time
+from db import get_connection_manager
+from scraper import DanbooruArtistScraper
+
+def make_artist(artist_id, name, post_count):
+    return {
+        'id': artist_id, 'name': name, 'post_count': post_count, 'other_names': '',
+        'group_name': '', 'url_string': '', 'is_active': True, 'created_at': '',
+        'updated_at': '', 'is_banned': False, 'is_deleted': False
+    }
+
+def test_connection_manager():
+    print("🧪 Testing SQLite Connection Manager")
+    print("=" * 50)
+
+    db_path = os.path.join(tempfile.mkdtemp(), "artists.db")
+    scraper = DanbooruArtistScraper(db_path=db_path)
+
+    # The scraper and any other component share one manager per database file
+    manager = get_connection_manager(db_path)
+    assert scraper.db is manager
+    assert DanbooruArtistScraper(db_path=db_path).db is manager
+
+    with manager.read() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] < 0
+
+    # Concurrent readers and writers reuse a handful of connections
+    scraper.save_artists([make_artist(1, 'abe', 10)])
+    opened = manager.stats['connections_opened']
+    errors = []
+
+    def reader():
+        try:
+            for _ in range(50):
+                scraper.get_artists_by_criteria(name_contains='a', limit=5)
+                scraper.get_database_stats()
+        except Exception as e:
+            errors.append(e)
+
+    def writer(offset):
+        try:
+            for i in range(20):
+                scraper.save_artists([make_artist(offset + i, f'artist_{offset + i}', i)])
+        except Exception as e:
+            errors.append(e)
+
+    started = time.time()
+    threads = [threading.Thread(target=reader) for _ in range(4)]
+    threads += [threading.Thread(target=writer, args=(offset,)) for offset in (100, 200)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.time() - started
+
+    stats = manager.get_stats()
+    print(f"  {stats['reads']} reads / {stats['writes']} writes in {elapsed:.2f}s "
+          f"using {stats['connections_opened']} connections")
+    assert not errors, errors
+    assert stats['connections_opened'] - opened <= 4
+    assert scraper.get_database_stats()['total_artists'] == 41
+
+    # A failed write block is rolled back and leaves the writer usable
+    try:
+        with manager.write() as conn:
+            conn.execute("UPDATE artists SET post_count = 999 WHERE id = 1")
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    assert scraper.get_artists_by_criteria(name_starts_with='abe')[0]['post_count'] == 10
+    scraper.save_post_counts([(11, 1)])
+    assert scraper.get_artists_by_criteria(name_starts_with='abe')[0]['post_count'] == 11
+
+    print("\n✅ Connection manager test completed!")
+
+if __name__ == "__main__":
+    test_connection_manager()
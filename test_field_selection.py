@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test that upstream requests only ask for the fields the scraper uses
+"""
+
+import json
+import os
+import tempfile
+from scraper import DanbooruArtistScraper, ARTIST_API_FIELDS, POST_PREVIEW_FIELDS
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+        self.status_code = 200
+        self.headers = {}
+        self.content = json.dumps(payload).encode()
+
+    def json(self):
+        return self.payload
+
+def test_field_selection():
+    print("🧪 Testing Upstream Field Selection")
+    print("=" * 50)
+
+    db_path = os.path.join(tempfile.mkdtemp(), "artists.db")
+    scraper = DanbooruArtistScraper(db_path=db_path)
+    scraper.min_request_interval = 0.001
+
+    urls = []
+
+    def fake_get(url, **kwargs):
+        urls.append(url)
+        if 'artists.json' in url:
+            return FakeResponse([{'id': 1, 'name': 'kantoku', 'other_names': ['カントク']}])
+        return FakeResponse([{'id': 5, 'preview_file_url': 'p', 'rating': 'g', 'score': 3}])
+
+    scraper.session.get = fake_get
+
+    artists = scraper.get_page("a0")
+    images = scraper.get_artist_sample_images("kantoku", limit=1)
+    assert artists[0]['name'] == 'kantoku' and images[0]['id'] == 5
+
+    print(f"  Page URL: {urls[0]}")
+    assert urls[0].endswith("&only=" + ",".join(ARTIST_API_FIELDS))
+    assert urls[1].endswith("&only=" + ",".join(POST_PREVIEW_FIELDS))
+
+    # Every field parse_artist_data reads is requested
+    parsed = scraper.parse_artist_data(artists[0], fetch_post_count=False)
+    assert parsed['other_names'] == 'カントク'
+
+    status = scraper.get_rate_limit_status()
+    print(f"  Bytes received: {status['bytes_received']}, estimated saved: {status['bytes_saved_estimate']}")
+    assert status['bytes_received'] == sum(s['bytes'] for s in status['transfer_by_endpoint'].values())
+    assert status['transfer_by_endpoint']['artists']['records'] == 1
+    assert status['bytes_saved_estimate'] > 0
+
+    # Field selection can be switched off
+    scraper.use_field_selection = False
+    scraper.get_page("a1")
+    assert "only=" not in urls[-1]
+
+    print("\n✅ Field selection test completed!")
+
+if __name__ == "__main__":
+    test_field_selection()
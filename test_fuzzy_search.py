@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test fuzzy artist search backed by the trigram index
+"""
+
+import os
+import random
+import tempfile
+import time
+import scraper as scraper_module
+from scraper import DanbooruArtistScraper
+from trigram_index import TrigramIndex, trigrams
+
+def make_artist(artist_id, name, post_count, other_names=''):
+    return {
+        'id': artist_id, 'name': name, 'post_count': post_count, 'other_names': other_names,
+        'group_name': f'group_{artist_id}', 'url_string': '', 'is_active': True, 'created_at': '',
+        'updated_at': '', 'is_banned': False, 'is_deleted': False
+    }
+
+def jaccard(a, b):
+    a, b = trigrams(a), trigrams(b)
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+def test_fuzzy_search():
+    print("🧪 Testing Fuzzy Artist Search")
+    print("=" * 50)
+
+    rng = random.Random(3)
+    syllables = ['ka', 'ki', 'ku', 'sa', 'shi', 'to', 'na', 'mi', 'ya', 'ra', 'ho', 'n']
+    names = set()
+    while len(names) < 20000:
+        names.add(''.join(rng.choice(syllables) for _ in range(rng.randint(2, 5))))
+    names -= {'kantoku', 'kantokuu', 'kantoko'}
+    artists = [make_artist(i + 1, name, rng.randint(0, 1000)) for i, name in enumerate(sorted(names))]
+    artists += [make_artist(30001, 'kantoku', 5000, 'カントク, kantoku_art'),
+                make_artist(30002, 'kantoko', 10)]
+
+    scraper = DanbooruArtistScraper(db_path=os.path.join(tempfile.mkdtemp(), "artists.db"))
+    scraper.save_artists(artists)
+
+    # Exact LIKE matching finds nothing for a misspelling; fuzzy does
+    assert scraper.get_artists_by_criteria(name_starts_with='kantokuu') == []
+    started = time.time()
+    results = scraper.get_artists_by_criteria(fuzzy='kantokuu', limit=5, fields='minimal')
+    print(f"  First fuzzy search (builds the index): {(time.time() - started) * 1000:.0f}ms")
+    assert results[0]['name'] == 'kantoku'
+    print(f"  'kantokuu' -> {[r['name'] for r in results]}")
+
+    # Ranking matches a brute-force similarity scan (ties by post count)
+    by_name = {a['name']: a for a in artists}
+    for query in ['kantoku', 'shiranai', 'mikasa', 'hoshino']:
+        got = scraper.get_artists_by_criteria(fuzzy=query, limit=10, fields='minimal')
+        expected = sorted((a for a in artists if jaccard(query, a['name']) >= 0.3
+                           or any(jaccard(query, alias) >= 0.3 for alias in a['other_names'].split(', ') if alias)),
+                          key=lambda a: (-max([jaccard(query, a['name'])] +
+                                              [jaccard(query, x) for x in a['other_names'].split(', ') if x]),
+                                         -a['post_count'], a['name']))[:10]
+        assert [r['name'] for r in got] == [a['name'] for a in expected], query
+        for r in got:
+            assert by_name[r['name']]['post_count'] == r['post_count']
+
+    # Aliases match too, full rows keep the similarity order, post count filters apply
+    assert scraper.get_artists_by_criteria(fuzzy='kantoku art', limit=1)[0]['group_name'] == 'group_30001'
+    assert [r['name'] for r in scraper.get_artists_by_criteria(fuzzy='kantoku', max_post_count=100)][:1] == ['kantoko']
+
+    index = scraper.fuzzy_index
+    queries = [name[:-1] + 'u' for name in rng.sample(sorted(names), 300)]
+    started = time.perf_counter()
+    for query in queries:
+        index.search(query, 20)
+    per_query = (time.perf_counter() - started) / len(queries)
+    stats = index.get_stats()
+    print(f"  {stats['entries']} entries, {stats['trigrams']} trigrams; average query {per_query * 1000:.2f}ms")
+
+    # Writes through the group commit writer are searchable right away
+    scraper.save_artists([make_artist(30003, 'kantokou', 1)])
+    assert scraper.get_artists_by_criteria(fuzzy='kantokou', limit=1)[0]['name'] == 'kantokou'
+    scraper.save_post_counts([(0, 30001)])
+    assert [r for r in scraper.get_artists_by_criteria(fuzzy='kantoku', fields='minimal')
+            if r['id'] == 30001][0]['post_count'] == 0
+    assert index.get_stats()['rebuilds'] == 1
+
+    # While the index is building, searches are scored from SQLite instead of waiting
+    building = DanbooruArtistScraper(db_path=scraper.db_path)
+    building.fuzzy_index = TrigramIndex(building.db)      # never built
+    wait, scraper_module.FUZZY_INDEX_WAIT = scraper_module.FUZZY_INDEX_WAIT, 0.05
+    try:
+        started = time.time()
+        fallback = building.get_artists_by_criteria(fuzzy='kantokuu', limit=5, fields='minimal')
+        assert time.time() - started < 2 and not building.fuzzy_index.ready
+        assert fallback[0]['name'] == 'kantoku'
+        for query, bounds in [('kantoku', {}), ('mikasa', {}), ('kantoku art', {}),
+                              ('kantoku', {'min_post_count': 5, 'max_post_count': 100})]:
+            assert ([r['name'] for r in building.get_artists_by_criteria(fuzzy=query, limit=5, **bounds)]
+                    == [r['name'] for r in scraper.get_artists_by_criteria(fuzzy=query, limit=5, **bounds)]), query
+    finally:
+        scraper_module.FUZZY_INDEX_WAIT = wait
+    print("  ✅ SQLite fallback while the index builds")
+
+    # Endpoint
+    os.environ.setdefault('ARTISTS_DB_PATH', os.path.join(tempfile.mkdtemp(), "app.db"))
+    import app as app_module
+    payload = app_module.app.test_client().get('/search?fuzzy=anything&fields=minimal').get_json()
+    assert payload['success']
+
+    print("\n✅ Fuzzy search test completed!")
+
+if __name__ == "__main__":
+    test_fuzzy_search()
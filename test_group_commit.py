@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test the single writer thread: group commits from concurrent producers
+"""
+
+import os
+import tempfile
+import threading
+import time
+from scraper import DanbooruArtistScraper
+
+def make_artist(artist_id, name, post_count=0):
+    return {
+        'id': artist_id, 'name': name, 'post_count': post_count, 'other_names': '',
+        'group_name': '', 'url_string': '', 'is_active': True, 'created_at': '',
+        'updated_at': '', 'is_banned': False, 'is_deleted': False
+    }
+
+def test_group_commit():
+    print("🧪 Testing Group Commit Writer")
+    print("=" * 50)
+
+    scraper = DanbooruArtistScraper(db_path=os.path.join(tempfile.mkdtemp(), "artists.db"))
+    writer = scraper.group_writer
+    writer.max_delay = 0.02
+    committed = []
+    writer.add_commit_listener(lambda ops: committed.append([op.kind for op in ops]))
+
+    # Eight producers (scrape pages, post count updaters) writing at once
+    generation = scraper.get_db_generation()
+    errors = []
+
+    def producer(worker):
+        try:
+            for i in range(25):
+                artist_id = worker * 1000 + i
+                scraper.save_artists([make_artist(artist_id, f'artist_{artist_id}')])
+                scraper.save_post_counts([(i + 1, artist_id)])
+        except Exception as e:
+            errors.append(e)
+
+    def reader():
+        # WAL readers keep working while the writer commits
+        try:
+            for _ in range(50):
+                scraper.get_database_stats()
+        except Exception as e:
+            errors.append(e)
+
+    started = time.time()
+    threads = [threading.Thread(target=producer, args=(worker,)) for worker in range(8)]
+    threads.append(threading.Thread(target=reader))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = writer.get_stats()
+    print(f"  {stats['ops']} writes in {stats['commits']} commits "
+          f"({time.time() - started:.2f}s, largest commit {stats['largest_commit_rows']} rows)")
+    assert not errors, errors
+    assert stats['ops'] == 400 and stats['fallbacks'] == 0
+    assert stats['commits'] < stats['ops'] / 2
+    assert scraper.get_database_stats()['total_artists'] == 200
+    assert scraper.get_artists_by_criteria(name_starts_with='artist_7024')[0]['post_count'] == 25
+
+    # One generation bump per commit, and listeners see every committed write
+    assert scraper.get_db_generation() == generation + stats['commits']
+    assert sum(len(kinds) for kinds in committed) == 400
+
+    # Non-blocking submit returns a ticket; flush waits for everything queued
+    ticket = scraper.save_artists([make_artist(9000, 'late')], wait=False)
+    assert writer.flush(timeout=5) and ticket.done
+
+    # A bad row only costs itself: the group is retried op by op, row by row
+    bad = writer.submit('raw', "INSERT INTO artists (id, name) VALUES (?, ?)",
+                        [(9001, 'fresh'), (9000, 'duplicate id')])
+    good = scraper.save_artists([make_artist(9002, 'unaffected')], wait=False)
+    bad.wait(timeout=5)
+    good.wait(timeout=5)
+    names = {artist['name'] for artist in scraper.get_artists_by_criteria(limit=1000)}
+    assert {'late', 'fresh', 'unaffected'} <= names and 'duplicate id' not in names
+    stats = writer.get_stats()
+    print(f"  Fallbacks: {stats['fallbacks']}, failed rows: {stats['failed_rows']}")
+    assert stats['fallbacks'] == 1 and stats['failed_rows'] == 1
+
+    print("\n✅ Group commit test completed!")
+
+if __name__ == "__main__":
+    test_group_commit()
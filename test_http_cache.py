@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test the on-disk HTTP cache with TTLs, conditional revalidation and eviction
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import requests
+from http_cache import HTTPCache, CachingAdapter
+from rate_control import RateController
+from scraper import DanbooruArtistScraper
+
+class ArtistsHandler(BaseHTTPRequestHandler):
+    hits = []
+    body = json.dumps([{'id': 1, 'name': 'kantoku'}]).encode()
+
+    def do_GET(self):
+        self.hits.append((self.path, self.headers.get('If-None-Match')))
+        if self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(304)
+            self.send_header('ETag', '"v1"')
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('ETag', '"v1"')
+        self.send_header('Content-Length', str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+def test_http_cache():
+    print("🧪 Testing HTTP Cache")
+    print("=" * 50)
+
+    server = HTTPServer(('127.0.0.1', 0), ArtistsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+
+    cache = HTTPCache(tempfile.mkdtemp(), ttl_rules=[('/artists.json', 0.3), ('/counts/', 0)])
+    session = requests.Session()
+    session.mount('http://', CachingAdapter(cache))
+
+    # Miss, then a fresh hit that never reaches the server
+    first = session.get(f"{base}/artists.json?page=a0")
+    second = session.get(f"{base}/artists.json?page=a0")
+    assert first.json() == second.json() == [{'id': 1, 'name': 'kantoku'}]
+    assert getattr(second, 'from_cache', False)
+    assert len(ArtistsHandler.hits) == 1
+    assert cache.is_fresh(session.prepare_request(requests.Request('GET', f"{base}/artists.json?page=a0")))
+
+    # After the TTL the entry is revalidated with a conditional GET -> 304
+    time.sleep(0.35)
+    third = session.get(f"{base}/artists.json?page=a0")
+    assert third.status_code == 200 and third.json() == first.json()
+    assert third.revalidated
+    assert ArtistsHandler.hits[-1] == ('/artists.json?page=a0', '"v1"')
+
+    # URLs without a TTL rule bypass the cache
+    session.get(f"{base}/counts/posts.json?tags=x")
+    session.get(f"{base}/counts/posts.json?tags=x")
+    assert sum(1 for path, _ in ArtistsHandler.hits if path.startswith('/counts/')) == 2
+
+    stats = cache.get_stats()
+    print(f"  Hits: {stats['hits']}, revalidated: {stats['revalidated']}, misses: {stats['misses']}")
+    assert (stats['hits'], stats['revalidated'], stats['misses']) == (1, 1, 1)
+
+    # Rules match the exact path: /posts.json doesn't swallow /counts/posts.json
+    defaults = HTTPCache(tempfile.mkdtemp())
+    assert defaults.ttl_for(f"{base}/counts/posts.json?tags=x") == 600
+    assert defaults.ttl_for(f"{base}/posts.json?tags=x") == 3600
+    assert defaults.ttl_for(f"{base}/artists.json?page=a0&only=id,name") == 6 * 3600
+    assert defaults.ttl_for(f"{base}/artists/1.json") == 0
+
+    # Streamed responses reach the caller unbuffered and aren't stored
+    streamed = session.get(f"{base}/artists.json?page=s0", stream=True)
+    assert not streamed._content_consumed
+    assert b''.join(streamed.iter_content(64)) == ArtistsHandler.body
+    assert cache.lookup(HTTPCache.key_for(streamed.request)) is None
+    # ...but they are still answered from a fresh entry stored by a plain GET
+    session.get(f"{base}/artists.json?page=s1")
+    assert getattr(session.get(f"{base}/artists.json?page=s1", stream=True), 'from_cache', False)
+
+    # Cache hits are not upstream successes for the rate controller
+    scraper = DanbooruArtistScraper(db_path=os.path.join(tempfile.mkdtemp(), "artists.db"))
+    scraper.rate_controller = RateController(5, max_rate=10)
+    hit = session.get(f"{base}/artists.json?page=s1")
+    assert hit.from_cache and not scraper.handle_rate_limit_response(hit, 0)
+    assert scraper.rate_controller.rate == 5 and scraper.rate_limit_stats['consecutive_successes'] == 0
+    assert not scraper.handle_rate_limit_response(first, 0)
+    assert scraper.rate_controller.rate > 5
+
+    # Size bound: least recently used entries are evicted
+    cache.max_bytes = cache.total_bytes * 2
+    for page in range(1, 6):
+        session.get(f"{base}/artists.json?page=a{page}")
+    assert cache.total_bytes <= cache.max_bytes
+    assert cache.get_stats()['evictions'] > 0
+    assert not cache.is_fresh(session.prepare_request(requests.Request('GET', f"{base}/artists.json?page=a0")))
+
+    server.shutdown()
+    print("\n✅ HTTP cache test completed!")
+
+if __name__ == "__main__":
+    test_http_cache()
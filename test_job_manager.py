@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test the job queue, bounded worker pool and cooperative cancellation
+"""
+
+import os
+import tempfile
+import time
+from scraper import DanbooruArtistScraper
+from jobs import JobManager, QUEUED, RUNNING, COMPLETED, CANCELLED
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+def test_job_manager():
+    print("🧪 Testing Job Manager")
+    print("=" * 50)
+
+    db_path = os.path.join(tempfile.mkdtemp(), "artists.db")
+    scraper = DanbooruArtistScraper(db_path=db_path)
+
+    pages_fetched = []
+
+    def fake_page(page_id, retries=5):
+        pages_fetched.append(page_id)
+        time.sleep(0.05)
+        page_num = int(page_id[1:])
+        return [{'id': page_num * 10 + i, 'name': f'artist_{page_num}_{i}'} for i in range(3)]
+
+    scraper.get_page = fake_page
+    scraper.get_artist_post_count = lambda name: 7
+
+    manager = JobManager(scraper, max_workers=1)
+
+    # An unbounded scrape only stops when cancelled
+    scrape_job = manager.submit('scrape', {'start_page': 0, 'fetch_post_counts': False})
+    queued_job = manager.submit('post_counts', {})
+    assert wait_for(lambda: scrape_job.state == RUNNING and len(pages_fetched) >= 3)
+    assert queued_job.state == QUEUED  # Single worker: second job waits its turn
+
+    manager.cancel(scrape_job.id)
+    assert wait_for(lambda: scrape_job.is_finished)
+    fetched_at_cancel = len(pages_fetched)
+    time.sleep(0.2)
+    print(f"  Scrape cancelled after {fetched_at_cancel} pages")
+    assert scrape_job.state == CANCELLED
+    assert len(pages_fetched) == fetched_at_cancel  # No more upstream requests
+    assert scrape_job.metrics['pages_processed'] >= 3
+    assert scrape_job.result == scrape_job.metrics['artists_scraped']
+
+    # The queued post count job runs once the worker is free
+    assert wait_for(lambda: queued_job.state == COMPLETED)
+    print(f"  Post count job updated {queued_job.result} artists")
+    assert queued_job.result == scrape_job.result
+    assert queued_job.metrics['artists_updated'] == queued_job.result
+    assert scraper.get_artists_by_criteria(max_post_count=0) == []
+
+    # Queued jobs can be cancelled before they start
+    blocker = manager.submit('sync', {'start_page': 0})
+    pending = manager.submit('sync', {'start_page': 0, 'max_pages': 1})
+    manager.cancel(pending.id)
+    assert pending.state == CANCELLED and pending.started_at is None
+    manager.cancel(blocker.id)
+    assert wait_for(lambda: blocker.is_finished)
+
+    # Cancelling as a job finishes never turns a completed job into a cancelled one
+    for _ in range(50):
+        racer = manager.submit('post_counts', {})
+        assert wait_for(lambda: racer.state != QUEUED)
+        manager.cancel(racer.id)
+        assert wait_for(lambda: racer.is_finished)
+        assert racer.state in (COMPLETED, CANCELLED) and racer.finished_at is not None
+    manager.cancel(racer.id)
+    assert racer.state in (COMPLETED, CANCELLED)
+    finished = manager.submit('post_counts', {})
+    assert wait_for(lambda: finished.is_finished)
+    manager.cancel(finished.id)
+    assert finished.state == COMPLETED and not finished.cancel_event.is_set()
+
+    try:
+        manager.submit('bogus')
+        assert False, "Unknown job kinds should be rejected"
+    except ValueError:
+        pass
+
+    assert [job.id for job in manager.list(active_only=True)] == []
+    print("\n✅ Job manager test completed!")
+
+if __name__ == "__main__":
+    test_job_manager()
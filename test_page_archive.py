@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test the raw page archive and offline re-ingest
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from scraper import DanbooruArtistScraper
+from archive import PageArchive, iter_segment, reingest
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+        self.status_code = 200
+        self.headers = {}
+        self.content = json.dumps(payload).encode()
+
+    def json(self):
+        return self.payload
+
+def test_page_archive():
+    print("🧪 Testing Raw Page Archive")
+    print("=" * 50)
+
+    tmp_dir = tempfile.mkdtemp()
+    db_path = os.path.join(tmp_dir, "artists.db")
+    archive_dir = os.path.join(tmp_dir, "page_archive")
+    scraper = DanbooruArtistScraper(db_path=db_path, archive_dir=archive_dir)
+    scraper.min_request_interval = 0.001
+    scraper.page_archive.pages_per_segment = 2
+
+    urls = []
+
+    def fake_get(url, **kwargs):
+        urls.append(url)
+        page_num = int(url.split('page=a')[1].split('&')[0])
+        return FakeResponse([
+            {'id': page_num * 10 + i, 'name': f'artist_{page_num}_{i}', 'other_names': ['alias'],
+             'group_name': 'circle'}
+            for i in range(4)
+        ])
+
+    scraper.session.get = fake_get
+    for page in range(5):
+        scraper.save_artists(scraper.scrape_page(f"a{page}", fetch_post_counts=False))
+
+    # Archived pages are fetched whole, not trimmed with only=
+    assert urls and not any('only=' in url for url in urls)
+
+    stats = scraper.page_archive.get_stats()
+    print(f"  Archived {stats['pages']} pages / {stats['records']} records in {stats['segments']} segments ({stats['compression']})")
+    assert (stats['pages'], stats['records'], stats['segments']) == (5, 20, 3)
+
+    # Every segment holds one compressed frame per page
+    records = [record for path in scraper.page_archive.segments() for record in iter_segment(path)]
+    assert [r['page'] for r in records[::4]] == ['a0', 'a1', 'a2', 'a3', 'a4']
+    assert records[0]['data']['other_names'] == ['alias']
+
+    # Reopening the archive continues the last segment
+    assert PageArchive(archive_dir, pages_per_segment=2)._pages_in_segment == 1
+
+    # Lose some data, keep a post count, then rebuild from the archive without network
+    conn = sqlite3.connect(db_path)
+    conn.execute("DELETE FROM artists WHERE id >= 20")
+    conn.execute("UPDATE artists SET post_count = 321, group_name = 'stale' WHERE id = 1")
+    conn.commit()
+    conn.close()
+
+    scraper.session.get = None  # Any network access would fail
+    written = reingest(archive_dir, db_path, workers=2)
+    print(f"  Re-ingested {written} artists")
+    assert written == 20
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT COUNT(*) FROM artists").fetchone()[0] == 20
+    assert conn.execute("SELECT post_count, group_name FROM artists WHERE id = 1").fetchone() == (321, 'circle')
+    conn.close()
+
+    check_page_writer_isolation(os.path.join(tmp_dir, "other_archive"))
+
+    print("\n✅ Page archive test completed!")
+
+def check_page_writer_isolation(archive_dir):
+    archive = PageArchive(archive_dir)
+    # A slow page doesn't block other pages from being archived meanwhile
+    with archive.page_writer('a0') as writer:
+        writer.write({'id': 1})
+        other = threading.Thread(target=archive.append_page, args=('a1', [{'id': 2}]))
+        other.start()
+        other.join(5)
+        assert not other.is_alive()
+        writer.write({'id': 3})
+
+    # A page that fails midway leaves nothing behind for reingest to pick up
+    try:
+        with archive.page_writer('a2') as writer:
+            writer.write({'id': 4})
+            raise ValueError("download interrupted")
+    except ValueError:
+        pass
+    assert [entry['page'] for entry in archive.read_index()] == ['a1', 'a0']
+    records = [record for path in archive.segments() for record in iter_segment(path)]
+    assert [record['data']['id'] for record in records] == [2, 1, 3]
+    assert len(os.listdir(archive_dir)) == 2       # one segment and the index, no leftovers
+    print("  ✅ Pages are staged separately; failed pages are discarded")
+
+if __name__ == "__main__":
+    test_page_archive()
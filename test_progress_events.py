@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test scrape progress events and their fan-out to Server-Sent Events clients
+"""
+
+import os
+import tempfile
+from scraper import DanbooruArtistScraper
+from events import EventBroadcaster
+
+def fake_page(page_id, retries=5):
+    page_num = int(page_id[1:])
+    if page_num >= 3:
+        return []
+    return [{'id': page_num * 10 + i, 'name': f'artist_{page_num}_{i}'} for i in range(5)]
+
+def test_progress_events():
+    print("🧪 Testing Scrape Progress Events")
+    print("=" * 50)
+
+    db_path = os.path.join(tempfile.mkdtemp(), "artists.db")
+    scraper = DanbooruArtistScraper(db_path=db_path)
+    scraper.get_page = fake_page
+
+    broadcaster = EventBroadcaster()
+    client = broadcaster.subscribe()
+
+    events = []
+
+    def on_progress(event):
+        events.append(event)
+        broadcaster.publish('scrape', event)
+
+    total = scraper.scrape_all_pages(start_page=0, max_pages=4, fetch_post_counts=False,
+                                     progress_callback=on_progress)
+
+    print(f"  Events emitted: {len(events)}")
+    assert total == 15
+    assert events[0]['state'] == 'running' and events[0]['pages_processed'] == 0
+    assert [e['pages_processed'] for e in events[1:-1]] == [1, 2, 3, 4]
+    assert events[-2]['percent'] == 100.0
+    assert events[-1]['state'] == 'completed'
+    assert events[-1]['artists_scraped'] == 15
+    for key in ('requests', 'rate_limited_429s', 'artists_per_second', 'health_status'):
+        assert key in events[-1]
+
+    # Every event reached the subscribed client as an SSE message
+    stream = broadcaster.stream(client, heartbeat=0.01)
+    messages = [next(stream) for _ in range(len(events))]
+    assert all(m.startswith("event: scrape\ndata: ") for m in messages)
+    assert next(stream) == ": keep-alive\n\n"
+    stream.close()
+    assert broadcaster.subscriber_count == 0
+
+    print("\n✅ Progress events test completed!")
+
+if __name__ == "__main__":
+    test_progress_events()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Test AIMD rate control: header-driven pacing, Retry-After and recovery without cooldowns
+"""
+
+import os
+import tempfile
+import threading
+import time
+import requests
+from email.utils import formatdate
+from rate_control import RateController, parse_rate_limit_headers, parse_retry_after
+from scraper import DanbooruArtistScraper
+
+class FakeResponse:
+    def __init__(self, status_code=200, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.content = b'[]'
+
+    def json(self):
+        return []
+
+class WindowLimiter:
+    """Upstream stand-in allowing `limit` requests per one-second window"""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.lock = threading.Lock()
+        self.window = None
+        self.used = 0
+        self.accepted = 0
+        self.rejected = 0
+
+    def get(self, url, **kwargs):
+        with self.lock:
+            now = time.time()
+            if self.window is None or now >= self.window + 1:
+                self.window, self.used = now, 0
+            reset = self.window + 1 - now
+            if self.used >= self.limit:
+                self.rejected += 1
+                return FakeResponse(429, {'Retry-After': f'{reset:.3f}'})
+            self.used += 1
+            self.accepted += 1
+            return FakeResponse(200)
+
+def check_header_parsing():
+    now = 1700000000.0
+    assert parse_rate_limit_headers({'X-RateLimit-Remaining': '7', 'X-RateLimit-Reset': '30'}, now) == (7, now + 30)
+    assert parse_rate_limit_headers({'ratelimit-remaining': '0', 'ratelimit-reset': str(now + 5)}, now) == (0, now + 5)
+    assert parse_rate_limit_headers({'Content-Type': 'application/json'}, now) is None
+    assert parse_retry_after('2.5') == 2.5 and parse_retry_after(None) is None
+    assert 8 <= parse_retry_after(formatdate(time.time() + 10, usegmt=True)) <= 10
+    print("  ✅ Rate limit and Retry-After headers parsed")
+
+def check_aimd():
+    controller = RateController(10, max_rate=12)
+    assert controller.on_throttle() == 0 and controller.rate == 5
+    controller.on_throttle()
+    assert controller.rate == 5            # one burst of 429s halves the rate once
+    for _ in range(200):
+        controller.on_success()
+    assert controller.rate == 12           # additive recovery up to the ceiling, no cooldown
+
+    # A faster configured rate lifts the ceiling; restoring the rate restores it
+    controller.configure(20)
+    assert controller.max_rate == 20
+    controller.configure(10)
+    assert controller.max_rate == 12 and controller.rate == 10
+    print("  ✅ Multiplicative decrease, additive increase, capped at max_rate")
+
+def check_proactive_pacing():
+    # Five requests left in a one-second window: they are spread out, not burst
+    controller = RateController(1000)
+    controller.observe({'X-RateLimit-Remaining': '5', 'X-RateLimit-Reset': '1'})
+    started = time.time()
+    for _ in range(5):
+        controller.acquire()
+    assert time.time() - started >= 0.7
+    # An exhausted budget waits for the reset instead of drawing a 429
+    controller.observe({'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': '0.3'})
+    assert controller.paused_for() > 0
+    started = time.time()
+    controller.acquire()
+    assert 0.2 <= time.time() - started <= 0.6
+    print("  ✅ Remaining budget paced over the reset window")
+
+def check_shared_slots():
+    # Threads share one budget: 200 slots at 200 req/sec take about a second whoever asks
+    controller = RateController(200)
+
+    def worker():
+        for _ in range(25):
+            controller.acquire()
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    started = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.time() - started
+    assert elapsed >= 199 / 200 * 0.95, elapsed
+    print(f"  ✅ 200 requests from 8 threads took {elapsed:.2f}s at 200 req/sec")
+
+def check_scraper_throughput():
+    scraper = DanbooruArtistScraper(db_path=os.path.join(tempfile.mkdtemp(), "artists.db"))
+    scraper.rate_controller = RateController(40, max_rate=60)
+    upstream = WindowLimiter(20)
+    scraper.session.get = upstream.get
+
+    started = time.time()
+    longest_pause = 0.0
+    while time.time() - started < 4:
+        request_started = time.time()
+        assert scraper._fetch_json(scraper.base_url, 'artists_verify', 'probe') == []
+        longest_pause = max(longest_pause, time.time() - request_started)
+    elapsed = time.time() - started
+    throughput = upstream.accepted / elapsed
+    print(f"  Throughput {throughput:.1f} req/sec against a 20 req/sec limit "
+          f"({upstream.rejected} 429s, longest wait {longest_pause:.2f}s)")
+    assert throughput >= 14 and longest_pause < 1.5
+
+    # Status keys used by the template and rate_limit_monitor.py are still there
+    status = scraper.get_rate_limit_status()
+    for key in ('current_rate_limit', 'is_rate_limited', 'total_429s', 'consecutive_429s',
+                'adaptive_cooldown_active', 'adaptive_cooldown_remaining', 'health_status'):
+        assert key in status, key
+    assert status['rate_control']['decreases'] >= 1
+
+    # Three 429s in a row without Retry-After no longer park the scraper for minutes
+    scraper.rate_limit_wait_time = 0.01
+    for attempt in range(3):
+        assert scraper.handle_rate_limit_response(FakeResponse(429), attempt)
+    assert scraper.get_rate_limit_status()['adaptive_cooldown_remaining'] < 1
+    assert not scraper.handle_rate_limit_response(FakeResponse(200), 0)
+
+    # A throttled image preview is counted like any other 429
+    scraper.session.get = lambda url, **kwargs: FakeResponse(429, {'Retry-After': '0'})
+    total_429s = scraper.total_429_count
+    assert scraper._fetch_artist_sample_images('someone') == []
+    assert scraper.total_429_count == total_429s + 1
+
+    # A throttled post count lookup fails at once; the pause applies to the next request
+    scraper.session.get = lambda url, **kwargs: FakeResponse(429, {'Retry-After': '3'})
+    total_429s = scraper.total_429_count
+    started = time.time()
+    try:
+        scraper._request_post_count('someone')
+        assert False, "A 429 should raise"
+    except requests.exceptions.HTTPError:
+        pass
+    assert time.time() - started < 1 and scraper.total_429_count == total_429s + 1
+    assert 2 < scraper.rate_controller.paused_for() <= 3
+
+def test_rate_control():
+    print("🧪 Testing AIMD Rate Control")
+    print("=" * 50)
+    check_header_parsing()
+    check_aimd()
+    check_proactive_pacing()
+    check_shared_slots()
+    check_scraper_throughput()
+    print("\n✅ Rate control test completed!")
+
+if __name__ == "__main__":
+    test_rate_control()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test read-only serving from an immutable, memory-mapped database snapshot
+"""
+
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+from db import ReadOnlyDatabaseError, check_snapshot, publish_snapshot
+from scraper import DanbooruArtistScraper
+
+def make_artist(artist_id, name, post_count):
+    return {
+        'id': artist_id, 'name': name, 'post_count': post_count, 'other_names': '',
+        'group_name': '', 'url_string': '', 'is_active': True, 'created_at': '',
+        'updated_at': '', 'is_banned': False, 'is_deleted': False
+    }
+
+def test_read_only_mode():
+    print("🧪 Testing Read-Only Snapshot Serving")
+    print("=" * 50)
+
+    tmp_dir = tempfile.mkdtemp()
+    scraper = DanbooruArtistScraper(db_path=os.path.join(tmp_dir, "artists.db"))
+    scraper.save_artists([make_artist(i, f'artist_{i}', i * 10) for i in range(1, 501)])
+
+    # Publish a compacted single-file snapshot while the live database stays writable
+    snapshot_path = publish_snapshot(scraper.db_path, os.path.join(tmp_dir, "snapshot.db"))
+    scraper.save_artists([make_artist(999, 'after_snapshot', 1)])
+    before = os.stat(snapshot_path)
+
+    serving = DanbooruArtistScraper(db_path=snapshot_path, read_only=True)
+    warmed = serving.db.warm()
+    print(f"  Warmed {warmed} bytes of {os.path.getsize(snapshot_path)}")
+    assert warmed == os.path.getsize(snapshot_path)
+
+    results = serving.get_artists_by_criteria(name_starts_with='artist_5', limit=5)
+    assert results[0]['name'] == 'artist_500' and len(results) == 5
+    assert serving.get_database_stats()['total_artists'] == 500
+    assert serving.get_db_generation() == scraper.get_db_generation() - 1
+
+    with serving.db.read() as conn:
+        assert conn.execute("PRAGMA query_only").fetchone()[0] == 1
+        assert conn.execute("PRAGMA mmap_size").fetchone()[0] >= warmed
+
+    # Every write path is turned off
+    for write in (lambda: serving.save_artists([make_artist(1, 'x', 1)]),
+                  lambda: serving.save_post_counts([(1, 1)]),
+                  lambda: serving.db.write().__enter__(),
+                  lambda: serving.db.group_writer()):
+        try:
+            write()
+            assert False, "Writes should be refused"
+        except ReadOnlyDatabaseError:
+            pass
+    assert serving.group_writer is None
+
+    # The snapshot file is never touched: no WAL/SHM files, no modifications
+    after = os.stat(snapshot_path)
+    assert (before.st_mtime, before.st_size) == (after.st_mtime, after.st_size)
+    assert not os.path.exists(snapshot_path + "-wal") and not os.path.exists(snapshot_path + "-shm")
+
+    # Only a published snapshot qualifies; live and old-schema databases are turned away
+    assert check_snapshot(snapshot_path) is None
+    assert 'WAL' in check_snapshot(scraper.db_path, require_published=False)
+    old_schema = os.path.join(tmp_dir, "old.db")
+    conn = sqlite3.connect(old_schema)
+    conn.execute('''CREATE TABLE artists (id INTEGER PRIMARY KEY, name TEXT UNIQUE, post_count INTEGER,
+                    other_names TEXT, group_name TEXT, url_string TEXT, is_active BOOLEAN, created_at TEXT,
+                    updated_at TEXT, is_banned BOOLEAN, is_deleted BOOLEAN)''')
+    conn.execute("INSERT INTO artists (id, name, post_count, other_names) VALUES (1, 'old_artist', 5, '')")
+    conn.commit()
+    conn.close()
+    assert 'db_meta' in check_snapshot(old_schema, require_published=False)
+    unpublished = os.path.join(tmp_dir, "unpublished.db")
+    shutil.copy(snapshot_path, unpublished)
+    conn = sqlite3.connect(unpublished)
+    conn.execute("DELETE FROM db_meta WHERE key = 'snapshot_published_at'")
+    conn.commit()
+    conn.close()
+    assert 'publish' in check_snapshot(unpublished) and check_snapshot(unpublished, require_published=False) is None
+
+    # app_hf serves only the snapshot read-only; the app falls back to read-write on a live database
+    for db_path, env, expected in ((snapshot_path, {}, 'True'), (scraper.db_path, {}, 'False'),
+                                   (old_schema, {}, 'False'),
+                                   (scraper.db_path, {'SERVE_READ_ONLY': '1'}, 'False')):
+        child_env = {key: value for key, value in os.environ.items() if key != 'SERVE_READ_ONLY'}
+        child_env.update(env, ARTISTS_DB_PATH=db_path)
+        output = subprocess.run([sys.executable, '-c', 'import app_hf, app; print(app.READ_ONLY)'],
+                                env=child_env, capture_output=True, text=True, timeout=60)
+        assert output.stdout.strip().splitlines()[-1] == expected, (db_path, env, output.stderr[-2000:])
+    print("  ✅ Live and old-schema databases fall back to read-write")
+
+    # Write routes answer 403 in read-only mode
+    os.environ.setdefault('ARTISTS_DB_PATH', os.path.join(tmp_dir, "app.db"))
+    import app as app_module
+    app_module.READ_ONLY = True
+    try:
+        client = app_module.app.test_client()
+        assert client.post('/scrape', json={}).status_code == 403
+        assert client.post('/jobs', json={'kind': 'sync'}).status_code == 403
+        assert client.post('/credentials', json={}).status_code == 403
+        assert client.get('/search?limit=1').status_code == 200
+    finally:
+        app_module.READ_ONLY = False
+
+    print("\n✅ Read-only mode test completed!")
+
+if __name__ == "__main__":
+    test_read_only_mode()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test that concurrent identical upstream lookups share a single request
+"""
+
+import os
+import tempfile
+import threading
+import time
+from scraper import DanbooruArtistScraper
+
+class FakeResponse:
+    def __init__(self, payload, status_code=200):
+        self.payload = payload
+        self.status_code = status_code
+        self.headers = {}
+        self.content = b''
+
+    def json(self):
+        return self.payload
+
+def test_request_coalescing():
+    print("🧪 Testing Request Coalescing")
+    print("=" * 50)
+
+    db_path = os.path.join(tempfile.mkdtemp(), "artists.db")
+    scraper = DanbooruArtistScraper(db_path=db_path)
+    scraper.min_request_interval = 0.001
+
+    calls = []
+
+    def fake_get(url, **kwargs):
+        calls.append(url)
+        time.sleep(0.2)  # Keep the first request in flight while others arrive
+        if 'counts/posts.json' in url:
+            return FakeResponse({'counts': {'posts': 42}})
+        return FakeResponse([
+            {'id': 1, 'preview_file_url': 'p1', 'rating': 'e', 'score': 5},
+            {'id': 2, 'preview_file_url': 'p2', 'rating': 'g', 'score': 1},
+        ])
+
+    scraper.session.get = fake_get
+
+    # Ten concurrent post count lookups for the same artist
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(scraper.get_artist_post_count("kantoku")))
+        for _ in range(10)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    print(f"  Post count requests made: {len(calls)} for {len(results)} callers")
+    assert results == [42] * 10
+    assert len(calls) == 1
+
+    # Ten concurrent preview lookups for the same artist
+    calls.clear()
+    previews = []
+    threads = [
+        threading.Thread(target=lambda: previews.append(scraper.get_artist_sample_images("kantoku", limit=2)))
+        for _ in range(10)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    print(f"  Preview requests made: {len(calls)} for {len(previews)} callers")
+    assert len(calls) == 1
+    assert all([image['id'] for image in images] == [2, 1] for images in previews)
+
+    # Callers get independent copies of the result
+    previews[0][0]['score'] = 999
+    assert previews[1][0]['score'] == 1
+
+    # Sequential calls are not cached
+    calls.clear()
+    scraper.get_artist_post_count("kantoku")
+    scraper.get_artist_post_count("kantoku")
+    assert len(calls) == 2
+
+    status = scraper.get_rate_limit_status()
+    print(f"  Coalesced requests: {status['coalesced_requests']}")
+    assert status['coalesced_requests'] == 18
+    assert status['in_flight_requests'] == 0
+
+    print("\n✅ Request coalescing test completed!")
+
+if __name__ == "__main__":
+    test_request_coalescing()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Test the durable retry queue for failed page and post count fetches
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from retry_queue import RetryQueue
+from scraper import DanbooruArtistScraper
+
+def make_page(page_num, count=100):
+    return [{'id': page_num * 1000 + i, 'name': f'artist_{page_num}_{i}', 'other_names': [],
+             'group_name': '', 'is_banned': False, 'is_deleted': False,
+             'created_at': '2024-01-01T00:00:00.000Z', 'updated_at': '2024-01-02T00:00:00.000Z'}
+            for i in range(count)]
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    pages = {page: json.dumps(make_page(page)).encode() for page in range(4)}
+    failing = set()
+
+    def do_GET(self):
+        page = int(self.path.split('page=a')[1].split('&')[0])
+        if page in self.failing or 'all' in self.failing:
+            self.send_response(404)
+            self.end_headers()
+            return
+        body = self.pages.get(page, b'[]')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def count_artists(scraper):
+    with scraper.db.read() as conn:
+        return conn.execute("SELECT COUNT(*) FROM artists").fetchone()[0]
+
+def wait_for(condition, timeout=10.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+def make_scraper(db_path, port):
+    scraper = DanbooruArtistScraper(db_path=db_path)
+    scraper.base_url = f"http://127.0.0.1:{port}/artists.json"
+    scraper.min_request_interval = 0.001
+    # One attempt per fetch keeps the inline retry sleeps out of the test
+    scraper.get_page = lambda page_id, retries=1: DanbooruArtistScraper.get_page(scraper, page_id, retries=1)
+    scraper.iter_page = lambda page_id, retries=1: DanbooruArtistScraper.iter_page(scraper, page_id, retries=1)
+    return scraper
+
+def test_retry_queue():
+    print("🧪 Testing Retry Queue")
+    print("=" * 50)
+
+    server = HTTPServer(('127.0.0.1', 0), FlakyHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    db_path = os.path.join(tempfile.mkdtemp(), "artists.db")
+    scraper = make_scraper(db_path, server.server_port)
+
+    # A failed page is queued and skipped; it doesn't end the scrape like an empty page
+    FlakyHandler.failing = {1}
+    events = []
+    total = scraper.scrape_all_pages(fetch_post_counts=False, progress_callback=events.append)
+    assert total == 300 and count_artists(scraper) == 300
+    assert events[-1]['pages_queued'] == 1
+    entry = scraper.retry_queue.get('page', 'a1')
+    assert entry['state'] == 'pending' and entry['attempts'] == 0 and entry['last_error']
+    assert entry['params'] == {'fetch_post_counts': False}
+    assert entry['next_attempt_at'] > time.time() + 10    # backed off, not retried in a hot loop
+
+    # Streaming scrapes queue their failures the same way
+    FlakyHandler.failing = {2}
+    scraper.scrape_all_pages(start_page=2, max_pages=1, fetch_post_counts=False, streaming=True)
+    assert scraper.retry_queue.get('page', 'a2') is not None
+    scraper.retry_queue.succeeded('page', 'a2')
+    FlakyHandler.failing = {1}
+
+    # The queue survives a restart; a failed retry pushes the next attempt further out
+    scraper = make_scraper(db_path, server.server_port)
+    scraper.retry_queue.base_delay = 0.01
+    with scraper.db.write() as conn:
+        conn.execute("UPDATE retry_queue SET next_attempt_at = 0")
+    drainer = scraper.start_retry_drainer(interval=0.05)
+    assert wait_for(lambda: scraper.retry_queue.get('page', 'a1')['attempts'] >= 1)
+    assert scraper.retry_queue.get('page', 'a1')['state'] == 'pending'
+
+    # Once upstream recovers the drainer saves the page and drops the entry
+    FlakyHandler.failing = set()
+    assert wait_for(lambda: scraper.retry_queue.get('page', 'a1') is None)
+    assert count_artists(scraper) == 400
+    assert drainer.get_stats()['recovered'] == 1
+
+    # Failed post count lookups are queued and stored once they succeed
+    original = scraper._request_post_count
+    def unavailable(name):
+        raise ConnectionError("counts API unavailable")
+    scraper._request_post_count = unavailable
+    assert scraper.get_artist_post_count('artist_0_5') == 0
+    assert scraper.retry_queue.get('post_count', 'artist_0_5') is not None
+    scraper._request_post_count = lambda name: 77
+    assert wait_for(lambda: scraper.retry_queue.get('post_count', 'artist_0_5') is None)
+    with scraper.db.read() as conn:
+        assert conn.execute("SELECT post_count FROM artists WHERE name = 'artist_0_5'").fetchone()[0] == 77
+    drainer.stop(timeout=5)
+
+    # A count for an artist whose page isn't saved yet stays queued
+    scraper.retry_queue.add('post_count', 'not_saved_yet')
+    try:
+        scraper._retry_post_count('not_saved_yet', {})
+        assert False, "Missing rows should fail the retry"
+    except LookupError:
+        pass
+
+    # A page saved after the drainer recovered a count doesn't overwrite it with 0
+    scraper._request_post_count = unavailable
+    pending_page = [scraper.parse_artist_data(artist, fetch_post_count=True) for artist in make_page(0, 3)]
+    assert [artist['post_count'] for artist in pending_page] == [None, None, None]
+    scraper._request_post_count = lambda name: 55
+    scraper._retry_post_count('artist_0_1', {})
+    scraper.retry_queue.succeeded('post_count', 'artist_0_1')
+    scraper.save_artists(pending_page)
+    with scraper.db.read() as conn:
+        counts = dict(conn.execute("SELECT name, post_count FROM artists WHERE name IN "
+                                   "('artist_0_0', 'artist_0_1', 'artist_0_2')").fetchall())
+    assert counts == {'artist_0_0': 0, 'artist_0_1': 55, 'artist_0_2': 0}
+    assert scraper.get_artist_post_count('artist_0_1') == 55
+    scraper.save_artists([scraper.parse_artist_data(make_page(0, 1)[0], fetch_post_count=True)])
+    with scraper.db.read() as conn:
+        assert conn.execute("SELECT post_count FROM artists WHERE name = 'artist_0_0'").fetchone()[0] == 55
+    scraper._request_post_count = original
+    with scraper.db.write() as conn:
+        conn.execute("DELETE FROM retry_queue WHERE kind = 'post_count'")
+
+    # A dead upstream stops the scrape after a run of failed pages, each one queued
+    FlakyHandler.failing = {'all'}
+    assert scraper.scrape_all_pages(start_page=10, fetch_post_counts=False) == 0
+    stats = scraper.get_retry_stats()
+    print(f"  {stats}")
+    assert stats['pending'] == 10 and stats['by_kind']['page']['pending'] == 10
+
+    # Entries that keep failing are parked as dead instead of retrying forever
+    queue = RetryQueue(scraper.db, base_delay=0, max_attempts=2)
+    assert queue.failed('page', 'a10', 'still down') and not queue.failed('page', 'a10', 'still down')
+    assert queue.get('page', 'a10')['state'] == 'dead' and queue.due(now=time.time() + 1e6)[0]['key'] != 'a10'
+    assert queue.requeue_dead() == 1 and queue.get('page', 'a10')['attempts'] == 0
+
+    # Endpoint
+    os.environ.setdefault('ARTISTS_DB_PATH', os.path.join(tempfile.mkdtemp(), "app.db"))
+    import app as app_module
+    payload = app_module.app.test_client().get('/retry-queue').get_json()
+    assert payload['enabled'] and 'pending' in payload
+
+    server.shutdown()
+    print("\n✅ Retry queue test completed!")
+
+if __name__ == "__main__":
+    test_retry_queue()
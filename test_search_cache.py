@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Test the generation-tagged search result cache
+"""
+
+import os
+import tempfile
+from scraper import DanbooruArtistScraper
+
+def make_artist(artist_id, name, post_count):
+    return {
+        'id': artist_id, 'name': name, 'post_count': post_count, 'other_names': '',
+        'group_name': '', 'url_string': '', 'is_active': True, 'created_at': '',
+        'updated_at': '', 'is_banned': False, 'is_deleted': False
+    }
+
+def test_search_cache():
+    print("🧪 Testing Search Result Cache")
+    print("=" * 50)
+
+    db_path = os.path.join(tempfile.mkdtemp(), "artists.db")
+    scraper = DanbooruArtistScraper(db_path=db_path)
+    scraper.save_artists([make_artist(1, 'abe', 10), make_artist(2, 'akira', 500)])
+
+    first = scraper.get_artists_by_criteria(name_starts_with='A', limit=10)
+    second = scraper.get_artists_by_criteria(name_starts_with='a', limit=10)
+    assert [a['name'] for a in first] == ['akira', 'abe']
+    assert first == second
+
+    stats = scraper.search_cache.get_stats()
+    print(f"  After repeat query: {stats['hits']} hit(s), {stats['misses']} miss(es)")
+    assert stats['hits'] == 1 and stats['misses'] == 1
+
+    # Callers can't corrupt cached results: records are immutable
+    try:
+        second[0]['name'] = 'mutated'
+        assert False, "Records should be read-only"
+    except TypeError:
+        pass
+    second.clear()
+    assert scraper.get_artists_by_criteria(name_starts_with='a', limit=10)[0]['name'] == 'akira'
+
+    # Any write bumps the generation and invalidates cached results
+    generation = scraper.get_db_generation()
+    scraper.save_artists([make_artist(3, 'aoi', 9000)])
+    assert scraper.get_db_generation() == generation + 1
+    assert scraper.get_artists_by_criteria(name_starts_with='a', limit=10)[0]['name'] == 'aoi'
+
+    scraper.save_post_counts([(1, 3)])
+    assert scraper.get_artists_by_criteria(name_starts_with='a', limit=10)[0]['name'] == 'akira'
+
+    stats = scraper.search_cache.get_stats()
+    print(f"  Stale entries dropped: {stats['stale_evictions']}, hit rate {stats['hit_rate']:.0%}")
+    assert stats['stale_evictions'] == 2
+
+    # Projected queries read only the requested columns and are cached separately
+    cards = scraper.get_artists_by_criteria(name_starts_with='a', limit=10, fields='minimal')
+    assert list(cards[0].keys()) == ['id', 'name', 'post_count']
+    names = scraper.get_artists_by_criteria(name_starts_with='a', limit=10, fields=['name'])
+    assert [artist.to_dict() for artist in names] == [{'name': 'akira'}, {'name': 'abe'}, {'name': 'aoi'}]
+    try:
+        scraper.get_artists_by_criteria(fields='name,password')
+        assert False, "Unknown columns should be rejected"
+    except ValueError:
+        pass
+
+    # LIKE folds only ASCII case, so non-ASCII queries differing in case are cached apart
+    scraper.save_artists([make_artist(4, 'émile', 5)])
+    assert [a['name'] for a in scraper.get_artists_by_criteria(name_starts_with='é', limit=10)] == ['émile']
+    assert scraper.get_artists_by_criteria(name_starts_with='É', limit=10) == []
+    assert scraper.get_artists_by_criteria(name_starts_with='é', limit=10)[0]['name'] == 'émile'
+
+    print("\n✅ Search cache test completed!")
+
+if __name__ == "__main__":
+    test_search_cache()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test the streaming snapshot diff across database, CSV and NDJSON snapshots
+"""
+
+import json
+import os
+import tempfile
+import time
+import snapshot_diff
+from scraper import DanbooruArtistScraper
+
+def make_artist(artist_id, post_count=0, other_names='', is_deleted=False):
+    return {
+        'id': artist_id, 'name': f'artist_{artist_id}', 'post_count': post_count,
+        'other_names': other_names, 'group_name': '', 'url_string': '', 'is_active': not is_deleted,
+        'created_at': '2020-01-01T00:00:00.000Z', 'updated_at': '2020-01-01T00:00:00.000Z',
+        'is_banned': False, 'is_deleted': is_deleted
+    }
+
+def test_snapshot_diff():
+    print("🧪 Testing Snapshot Diff")
+    print("=" * 50)
+
+    tmp_dir = tempfile.mkdtemp()
+    scraper = DanbooruArtistScraper(db_path=os.path.join(tmp_dir, "artists.db"))
+    scraper.save_artists([make_artist(i, i) for i in range(1, 30001)])
+
+    # Old snapshots: the CSV export (ordered by name, so it gets external-sorted) and NDJSON (by post count)
+    old_csv = scraper.export_to_csv(os.path.join(tmp_dir, "old.csv"))
+    old_ndjson = os.path.join(tmp_dir, "old.ndjson")
+    with open(old_ndjson, 'w') as f:
+        for artist in scraper.iter_artists_by_criteria():
+            f.write(json.dumps(artist.to_dict()) + '\n')
+
+    # Next scrape: 100 removed, 200 added, 300 changed
+    with scraper.db.write() as conn:
+        conn.execute("DELETE FROM artists WHERE id <= 100")
+    scraper.save_artists([make_artist(i) for i in range(40001, 40201)])
+    scraper.save_artists([make_artist(i, i + 1, other_names='new alias') for i in range(1000, 1100)] +
+                         [make_artist(i, i + 1) for i in range(2000, 2100)] +
+                         [make_artist(i, i, is_deleted=True) for i in range(3000, 3100)])
+
+    for old in (old_csv, old_ndjson, scraper.db_path):
+        started = time.time()
+        differences = list(snapshot_diff.diff_snapshots(snapshot_diff.open_snapshot(old, run_size=7000),
+                                                        snapshot_diff.open_snapshot(scraper.db_path)))
+        kinds = [d['change'] for d in differences]
+        print(f"  {os.path.basename(old)} -> db: {kinds.count('added')} added, {kinds.count('removed')} removed, "
+              f"{kinds.count('changed')} changed ({(time.time() - started) * 1000:.0f}ms)")
+        if old == scraper.db_path:
+            assert differences == []
+            continue
+        assert (kinds.count('added'), kinds.count('removed'), kinds.count('changed')) == (200, 100, 300)
+        assert [d['id'] for d in differences] == sorted(d['id'] for d in differences)
+        by_id = {d['id']: d for d in differences}
+        assert by_id[1000]['fields'] == {'post_count': [1000, 1001], 'other_names': ['', 'new alias']}
+        assert by_id[3000]['fields'] == {'is_active': [True, False], 'is_deleted': [False, True]}
+        assert by_id[40001]['record']['name'] == 'artist_40001' and by_id[1]['change'] == 'removed'
+
+    # --ignore drops a column from the comparison; the CLI writes NDJSON and returns the counts
+    output = os.path.join(tmp_dir, "diff.ndjson")
+    counts = snapshot_diff.main([old_csv, scraper.db_path, '--output', output, '--ignore', 'post_count'])
+    assert counts['changed'] == 200
+    with open(output) as f:
+        assert sum(1 for _ in f) == 500
+
+    # Duplicate ids keep their last record
+    dupes = os.path.join(tmp_dir, "dupes.ndjson")
+    with open(dupes, 'w') as f:
+        for artist in (make_artist(2, 1), make_artist(1), make_artist(2, 5)):
+            f.write(json.dumps(artist) + '\n')
+    new = [snapshot_diff.normalize_record(make_artist(1)), snapshot_diff.normalize_record(make_artist(2, 5))]
+    assert list(snapshot_diff.diff_snapshots(snapshot_diff.open_snapshot(dupes), new)) == []
+
+    print("\n✅ Snapshot diff test completed!")
+
+if __name__ == "__main__":
+    test_snapshot_diff()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Test streaming page parsing: incremental JSON decoding and batched saves
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from json_stream import iter_json_array
+from scraper import DanbooruArtistScraper, PageFetchError
+
+def make_page(page_num, count=1000):
+    return [{'id': page_num * 10000 + i, 'name': f'artist_{page_num}_{i}',
+             'other_names': ['別名', f'alias_{i}'], 'group_name': '', 'is_banned': False,
+             'is_deleted': False, 'created_at': '2024-01-01T00:00:00.000Z',
+             'updated_at': '2024-01-02T00:00:00.000Z'} for i in range(count)]
+
+class PagesHandler(BaseHTTPRequestHandler):
+    # Bodies are built up front so the server thread doesn't skew memory measurements
+    bodies = {page: json.dumps(make_page(page) if page < 2 else []).encode() for page in range(3)}
+
+    def do_GET(self):
+        page = self.path.split('page=a')[1].split('&')[0]
+        body = self.bodies[int(page)]
+        if 'truncated' in self.path:
+            body = body[:len(body) // 2]
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def test_json_stream():
+    print("🧪 Testing Incremental JSON Array Parser")
+    print("=" * 50)
+
+    data = [{'id': 1, 'name': 'ｋａｎｔｏｋｕ', 'tags': ['a', 'b']}, 12345, "text", [1, [2]], None, 1.5e3]
+    encoded = json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+    # Any chunking, including splits inside multi-byte characters and numbers
+    for size in (1, 2, 3, 7, len(encoded)):
+        chunks = [encoded[i:i + size] for i in range(0, len(encoded), size)]
+        assert list(iter_json_array(chunks)) == data, size
+    assert list(iter_json_array([b' [ ] \n'])) == []
+
+    for bad in (b'{"id": 1}', b'[{"id": 1}', b'[1 2]', b'[1] x', b''):
+        try:
+            list(iter_json_array([bad]))
+            assert False, f"Should reject {bad!r}"
+        except ValueError:
+            pass
+    print("  ✅ Parser handles arbitrary chunk boundaries and rejects malformed input")
+
+def test_streaming_pages():
+    print("🧪 Testing Streaming Page Scrape")
+    print("=" * 50)
+
+    server = HTTPServer(('127.0.0.1', 0), PagesHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    tmp_dir = tempfile.mkdtemp()
+    scraper = DanbooruArtistScraper(db_path=os.path.join(tmp_dir, "artists.db"),
+                                    archive_dir=os.path.join(tmp_dir, "archive"))
+    scraper.base_url = f"http://127.0.0.1:{server.server_port}/artists.json"
+    scraper.min_request_interval = 0.001
+
+    # Streamed artists match the buffered page exactly
+    assert list(scraper.iter_page('a0')) == make_page(0)
+
+    total = scraper.scrape_all_pages(start_page=0, max_pages=3, fetch_post_counts=False, streaming=True)
+    print(f"  Streamed {total} artists")
+    assert total == 2000
+
+    conn = sqlite3.connect(scraper.db_path)
+    assert conn.execute("SELECT COUNT(*) FROM artists").fetchone()[0] == 2000
+    assert conn.execute("SELECT other_names FROM artists WHERE id = 10001").fetchone()[0] == '別名, alias_1'
+    conn.close()
+
+    # Pages are archived as they stream, and downloaded bytes are still counted
+    assert scraper.page_archive.get_stats()['records'] == 3000
+    assert scraper.get_rate_limit_status()['bytes_received'] > 0
+
+    # A cut-off body raises after yielding the complete artists it contained
+    scraper.base_url += "?truncated=1&"
+    received = []
+    try:
+        for artist in scraper.iter_page('a0'):
+            received.append(artist)
+        assert False, "Truncated page should raise"
+    except PageFetchError:
+        pass
+    assert 0 < len(received) < 1000
+
+    # Peak memory per page: streaming stays below loading the whole page
+    scraper.base_url = f"http://127.0.0.1:{server.server_port}/artists.json"
+    scraper.page_archive = None
+
+    def peak(fn):
+        tracemalloc.start()
+        fn()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak_bytes
+
+    def buffered():
+        artists = [scraper.parse_artist_data(a, fetch_post_count=False) for a in scraper.get_page('a1')]
+        scraper.save_artists(artists)
+
+    def streamed():
+        for batch in scraper.scrape_page_streaming('a1', fetch_post_counts=False):
+            scraper.save_artists(batch)
+
+    buffered_peak, streamed_peak = peak(buffered), peak(streamed)
+    print(f"  Peak memory: buffered {buffered_peak // 1024} KB, streamed {streamed_peak // 1024} KB")
+    assert streamed_peak < buffered_peak / 2
+
+    server.shutdown()
+    print("\n✅ Streaming page test completed!")
+
+if __name__ == "__main__":
+    test_json_stream()
+    test_streaming_pages()
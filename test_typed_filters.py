@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test date and status filters on the typed, indexed artist columns
+"""
+
+import os
+import sqlite3
+import tempfile
+from datetime import datetime, timezone
+from scraper import DanbooruArtistScraper, to_epoch
+
+def make_artist(artist_id, created_at, updated_at, is_deleted=False, is_banned=False):
+    return {
+        'id': artist_id, 'name': f'artist_{artist_id}', 'post_count': artist_id, 'other_names': '',
+        'group_name': '', 'url_string': '', 'is_active': not is_deleted, 'created_at': created_at,
+        'updated_at': updated_at, 'is_banned': is_banned, 'is_deleted': is_deleted
+    }
+
+def test_typed_filters():
+    print("🧪 Testing Typed Date and Status Filters")
+    print("=" * 50)
+
+    assert to_epoch('2020-01-01T00:00:00Z') == to_epoch('2019-12-31T19:00:00-05:00') == 1577836800
+    assert to_epoch('2020-01-01') == to_epoch(datetime(2020, 1, 1, tzinfo=timezone.utc)) == 1577836800
+    assert to_epoch('1577836800') == 1577836800 and to_epoch('') is None
+
+    db_path = os.path.join(tempfile.mkdtemp(), "artists.db")
+    scraper = DanbooruArtistScraper(db_path=db_path)
+    scraper.save_artists([
+        # Mixed offsets: 1 and 2 were created at the same instant
+        make_artist(1, '2015-06-01T09:00:00.000+09:00', '2024-01-10T00:00:00.000Z'),
+        make_artist(2, '2015-06-01T00:00:00.000Z', '2019-01-01T00:00:00.000-05:00'),
+        make_artist(3, '2018-03-01T12:00:00.000-04:00', '2024-02-01T00:00:00.000Z', is_deleted=True),
+        make_artist(4, '2021-07-01T00:00:00.000Z', '2021-07-02T00:00:00.000Z', is_banned=True),
+        make_artist(5, '', '', is_deleted=True),
+    ])
+
+    def ids(**criteria):
+        return [a['id'] for a in scraper.get_artists_by_criteria(fields='minimal', **criteria)]
+
+    assert ids(created_after='2015-06-01T00:00:00Z') == [4, 3, 2, 1]
+    assert ids(created_after='2015-06-01T00:00:01Z') == [4, 3]
+    assert ids(created_before='2018-01-01') == [2, 1]
+    assert ids(updated_since='2024-01-01') == [3, 1]
+    assert ids(exclude_deleted=True) == [4, 2, 1]
+    assert ids(exclude_deleted=True, exclude_banned=True, updated_since=1546300800) == [2, 1]
+    assert ids(exclude_deleted=True, min_post_count=2) == [4, 2]
+
+    # Every filter is answered from an index, never a plain table scan
+    with scraper.db.read() as conn:
+        def plan(sql):
+            return ' '.join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}"))
+        for where, index in (("created_ts >= 1500000000", 'idx_artists_created_ts'),
+                             ("updated_ts >= 1500000000", 'idx_artists_updated_ts'),
+                             ("is_deleted = 1", 'idx_artists_deleted')):
+            assert index in plan(f"SELECT id FROM artists WHERE {where}"), where
+            searched = plan(f"SELECT id FROM artists WHERE {where} ORDER BY post_count DESC LIMIT 10")
+            assert 'USING' in searched, searched
+        searched = plan("SELECT id FROM artists WHERE is_deleted = 0 ORDER BY post_count DESC LIMIT 10")
+        print(f"  exclude_deleted: {searched}")
+        assert 'idx_artists_live_post_count' in searched
+
+    # The filters also apply to fuzzy searches
+    assert ids(fuzzy='artist_3', exclude_deleted=True, limit=10) == [x for x in ids(fuzzy='artist_3', limit=10)
+                                                                     if x not in (3, 5)]
+
+    # Databases created before the typed columns get them (and 0/1 flags) on open
+    legacy_path = os.path.join(tempfile.mkdtemp(), "legacy.db")
+    with sqlite3.connect(legacy_path) as conn:
+        conn.execute("""CREATE TABLE artists (id INTEGER PRIMARY KEY, name TEXT UNIQUE, post_count INTEGER,
+                        other_names TEXT, group_name TEXT, url_string TEXT, is_active BOOLEAN,
+                        created_at TEXT, updated_at TEXT, is_banned BOOLEAN, is_deleted BOOLEAN)""")
+        conn.execute("INSERT INTO artists VALUES (1, 'old', 1, '', '', '', 1, '2010-01-01T00:00:00Z', "
+                      "'2010-01-01T00:00:00Z', NULL, 'True')")
+    legacy = DanbooruArtistScraper(db_path=legacy_path)
+    assert [a['id'] for a in legacy.get_artists_by_criteria(created_before='2011-01-01')] == [1]
+    assert legacy.get_artists_by_criteria(exclude_deleted=True) == []
+    assert legacy.get_artists_by_criteria()[0]['is_banned'] == 0
+
+    # /search query parameters
+    os.environ.setdefault('ARTISTS_DB_PATH', os.path.join(tempfile.mkdtemp(), "app.db"))
+    import app as app_module
+    client = app_module.app.test_client()
+    assert client.get('/search?created_after=2020-01-01&exclude_deleted=1').get_json()['success']
+    assert client.get('/search?updated_since=yesterday').status_code == 400
+
+    print("\n✅ Typed filters test completed!")
+
+if __name__ == "__main__":
+    test_typed_filters()
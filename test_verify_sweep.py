@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Test the id-range verification sweep against a fake upstream with gaps and changes
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlparse
+from jobs import JobManager
+from scraper import DanbooruArtistScraper, parse_artist_json
+
+def make_artist(artist_id, name=None, updated_at='2024-01-02T00:00:00.000Z', is_deleted=False):
+    return {'id': artist_id, 'name': name or f'artist_{artist_id}', 'other_names': [f'alias_{artist_id}'],
+            'group_name': '', 'is_banned': False, 'is_deleted': is_deleted,
+            'created_at': '2024-01-01T00:00:00.000Z', 'updated_at': updated_at}
+
+class UpstreamHandler(BaseHTTPRequestHandler):
+    artists = {}
+    requests = []
+    failing = set()
+
+    def do_GET(self):
+        query = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+        self.requests.append(query)
+        wanted = query.get('search[id]')
+        if wanted in self.failing:
+            self.send_response(404)
+            self.end_headers()
+            return
+        if wanted is None:
+            ids = sorted(self.artists, reverse=True)
+        elif '..' in wanted:
+            lo, hi = map(int, wanted.split('..'))
+            ids = sorted(i for i in self.artists if lo <= i <= hi)
+        else:
+            ids = sorted(i for i in map(int, wanted.split(',')) if i in self.artists)
+        ids = ids[:int(query.get('limit', 20))]
+        only = query.get('only', '').split(',') if query.get('only') else None
+        body = json.dumps([{key: value for key, value in self.artists[i].items() if not only or key in only}
+                           for i in ids]).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def test_verify_sweep():
+    print("🧪 Testing Verification Sweep")
+    print("=" * 50)
+
+    server = HTTPServer(('127.0.0.1', 0), UpstreamHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    scraper = DanbooruArtistScraper(db_path=os.path.join(tempfile.mkdtemp(), "artists.db"))
+    scraper.base_url = f"http://127.0.0.1:{server.server_port}/artists.json"
+    scraper.min_request_interval = 0.001
+
+    # Local copy of 1..3500 with stored post counts, then upstream drifts away from it
+    upstream = {i: make_artist(i) for i in range(1, 3501)}
+    scraper.save_artists([parse_artist_json(artist, post_count=i) for i, artist in upstream.items()])
+    lost_page = range(1201, 1401)          # a page that failed during the scrape
+    with scraper.db.write() as conn:
+        conn.execute("DELETE FROM artists WHERE id BETWEEN ? AND ?", (lost_page[0], lost_page[-1]))
+        scraper._bump_generation(conn)
+    upstream[42] = make_artist(42, name='renamed_42', updated_at='2024-06-01T12:00:00.000+02:00')
+    upstream[77] = make_artist(77, updated_at='2024-06-01T00:00:00.000Z', is_deleted=True)
+    del upstream[900], upstream[2500]      # gone upstream
+    upstream[3600] = make_artist(3600)     # newer than anything stored
+    UpstreamHandler.artists = upstream
+
+    progress = []
+    result = scraper.verify_catalogue(progress_callback=progress.append)
+    print(f"  {result}")
+    assert result['state'] == 'completed' and result['ranges_total'] == 4 and not result['failed_ranges']
+    assert (result['missing'], result['changed'], result['deleted']) == (201, 2, 2)
+    assert result['refetched'] == 203
+    # Newest-id probe, one tiny request per range and 100-id refetches; nothing per artist
+    assert result['requests'] == 1 + 4 + 4
+    assert progress[-1]['percent'] == 100.0
+
+    with scraper.db.read() as conn:
+        rows = {row[0]: row[1:] for row in conn.execute(
+            "SELECT id, name, post_count, is_deleted, is_active, other_names FROM artists")}
+    assert len(rows) == 3501
+    assert all(i in rows for i in lost_page) and rows[1300][1] == 0
+    assert rows[42][:3] == ('renamed_42', 42, 0)   # refetched, stored post count kept
+    assert rows[77][2:4] == (1, 0)
+    assert rows[900][2:4] == (1, 0) and rows[2500][2:4] == (1, 0)
+    assert rows[3600][0] == 'artist_3600'
+    assert scraper.lookup_artists(['alias_1300']).__next__()[1]
+
+    # A second sweep finds nothing left to repair
+    UpstreamHandler.requests = []
+    again = scraper.verify_catalogue(end_id=3600)
+    assert (again['missing'], again['changed'], again['deleted'], again['refetched']) == (0, 0, 0, 0)
+    assert len(UpstreamHandler.requests) == 4
+    assert all(request['only'] == 'id,updated_at' for request in UpstreamHandler.requests)
+
+    # A failing range is reported and left alone
+    UpstreamHandler.failing = {'2001..3000'}
+    del upstream[2600]
+    failed = scraper.verify_catalogue(end_id=3600, retries=1)
+    assert failed['failed_ranges'] == [[2001, 3000]] and failed['deleted'] == 0
+    UpstreamHandler.failing = set()
+
+    # A range whose refetch fails is reported, not counted as clean
+    upstream[1500] = make_artist(1500, name='renamed_1500', updated_at='2024-07-01T00:00:00.000Z')
+    UpstreamHandler.failing = {'1500'}
+    failed = scraper.verify_catalogue(start_id=1001, end_id=2000, retries=1)
+    assert failed['failed_ranges'] == [[1001, 2000]] and failed['ranges_checked'] == 0
+    assert failed['changed'] == 1 and failed['refetched'] == 0
+    UpstreamHandler.failing = set()
+    assert scraper.verify_catalogue(start_id=1001, end_id=2000)['refetched'] == 1
+
+    # Sweeps always ask upstream, even with a fresh HTTP cache in front of it
+    cached = DanbooruArtistScraper(db_path=scraper.db_path, http_cache_dir=tempfile.mkdtemp())
+    cached.base_url = scraper.base_url
+    cached.min_request_interval = 0.001
+    cached.verify_catalogue(start_id=1, end_id=1000)
+    UpstreamHandler.requests = []
+    upstream[500] = make_artist(500, name='renamed_500', updated_at='2024-08-01T00:00:00.000Z')
+    repaired = cached.verify_catalogue(start_id=1, end_id=1000)
+    assert len(UpstreamHandler.requests) == 2 and repaired['changed'] == 1
+    assert cached.http_cache.get_stats()['hits'] == 0
+
+    # A refetched artist takes over a name another local id still holds
+    scraper.save_artists([parse_artist_json(make_artist(5001, name='foo'), post_count=5),
+                          parse_artist_json(make_artist(5003, name='baz'), post_count=7)])
+    ticket = scraper.save_artists([parse_artist_json(make_artist(5002, name='foo'), post_count=0),
+                                   parse_artist_json(make_artist(5003, name='baz2'), post_count=0)],
+                                  preserve_post_counts=True)
+    assert ticket.failed_rows == []
+    with scraper.db.read() as conn:
+        assert conn.execute("SELECT id, name, post_count FROM artists WHERE id > 5000 ORDER BY id").fetchall() == [
+            (5002, 'foo', 0), (5003, 'baz2', 7)]
+
+    # As a queued job
+    job = JobManager(scraper).submit('verify', {'start_id': 2001, 'end_id': 3000})
+    deadline = time.time() + 30
+    while not job.is_finished and time.time() < deadline:
+        time.sleep(0.05)
+    assert job.state == 'completed' and job.result['deleted'] == 1, job.to_dict()
+    assert job.metrics['ranges_checked'] == 1
+
+    server.shutdown()
+    print("\n✅ Verification sweep test completed!")
+
+if __name__ == "__main__":
+    test_verify_sweep()
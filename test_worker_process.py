@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test the SQLite job table hand-off between web processes and the scraper worker
+"""
+
+import os
+import tempfile
+import threading
+import time
+from scraper import DanbooruArtistScraper
+from jobs import SQLiteJobStore, QUEUED, RUNNING, COMPLETED, CANCELLED
+from worker import ScraperWorker
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+def test_worker_process():
+    print("🧪 Testing Scraper Worker Job Table")
+    print("=" * 50)
+
+    tmp_dir = tempfile.mkdtemp()
+    scraper = DanbooruArtistScraper(db_path=os.path.join(tmp_dir, "artists.db"))
+
+    def fake_page(page_id, retries=5):
+        time.sleep(0.02)
+        page_num = int(page_id[1:])
+        return [{'id': page_num * 10 + i, 'name': f'artist_{page_num}_{i}'} for i in range(3)]
+
+    scraper.get_page = fake_page
+
+    # The web tier and the worker each open their own handle on the job table
+    web_store = SQLiteJobStore(os.path.join(tmp_dir, "jobs.db"))
+    worker = ScraperWorker(scraper, SQLiteJobStore(web_store.db_path), poll_interval=0.05,
+                           metrics_interval=0.05)
+
+    finite_job = web_store.submit('sync', {'start_page': 0, 'max_pages': 2})
+    endless_job = web_store.submit('sync', {'start_page': 0})
+    assert web_store.get(finite_job.id).state == QUEUED
+    assert web_store.live_worker() is None
+
+    thread = threading.Thread(target=worker.run, daemon=True)
+    thread.start()
+
+    assert wait_for(lambda: web_store.get(finite_job.id).state == COMPLETED)
+    finished = web_store.get(finite_job.id)
+    print(f"  Finite job result: {finished.result} artists")
+    assert finished.result == 6
+    assert finished.metrics['pages_processed'] == 2
+
+    # The second job starts only after the first one finished, then gets cancelled
+    assert wait_for(lambda: web_store.get(endless_job.id).state == RUNNING)
+    assert wait_for(lambda: web_store.get(endless_job.id).metrics.get('pages_processed', 0) >= 2)
+    web_store.cancel(endless_job.id)
+    assert wait_for(lambda: web_store.get(endless_job.id).state == CANCELLED)
+    print(f"  Endless job cancelled after {web_store.get(endless_job.id).metrics['pages_processed']} pages")
+
+    # The worker publishes its rate limit status for the web tier
+    live = web_store.live_worker()
+    assert live is not None and live['worker_id'] == worker.worker_id
+    assert 'health_status' in live['rate_limit_status']
+
+    # A second worker refuses to share the upstream budget
+    try:
+        ScraperWorker(scraper, web_store, poll_interval=0.05).run()
+        assert False, "Second worker should refuse to start"
+    except RuntimeError:
+        pass
+
+    worker.stop()
+    thread.join(timeout=5)
+    assert web_store.live_worker() is None
+    print("\n✅ Worker process test completed!")
+
+if __name__ == "__main__":
+    test_worker_process()
@@ -0,0 +1,290 @@
+"""
+Trigram index for fuzzy (misspelling-tolerant) artist name search
+
+Every artist name and alias is split into words, and each word padded as
+"  word " is cut into trigrams (as PostgreSQL's pg_trgm does). An inverted
+index maps each trigram to the entries containing it. A query only reads the
+postings of its own trigrams; entries sharing enough of them are ranked by
+Jaccard similarity of the trigram sets, then by post count.
+
+Like the autocomplete index, writes committed through the group commit
+writer go into a small overlay and the postings are rebuilt in the background
+when the overlay grows or the database changed underneath.
+"""
+
+import logging
+import math
+import re
+import threading
+import time
+from array import array
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+
+from autocomplete import split_aliases
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIN_SIMILARITY = 0.3
+# Rows (most posts first) query_matches scores while the index is building
+FALLBACK_CANDIDATES = 5000
+_WORD = re.compile(r'[^\W_]+')
+
+
+def trigrams(text: str) -> Set[str]:
+    """Trigrams of each word, padded with two leading spaces and one trailing"""
+    grams = set()
+    for word in _WORD.findall(text.lower()):
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def query_matches(conn, query: str, limit: int = 100, min_similarity: float = DEFAULT_MIN_SIMILARITY,
+                  min_post_count: int = None, max_post_count: int = None) -> List[Tuple[int, str, int, float]]:
+    """Same ranking as TrigramIndex.search, straight from SQLite (slow path)
+
+    Used while the index is still building. Candidates are artists whose name
+    or aliases contain one of the query's unpadded trigrams (or one of its
+    words under three letters), limited to the FALLBACK_CANDIDATES with the
+    most posts, so rarely posted matches may be missing until the index is ready.
+    """
+    grams = trigrams(query)
+    if not grams:
+        return []
+    needles = sorted({gram for gram in grams if ' ' not in gram}
+                     | {word for word in _WORD.findall(query.lower()) if len(word) < 3})
+    sql = ("SELECT id, name, post_count, other_names FROM artists WHERE ("
+           + " OR ".join(["instr(lower(name), ?) OR instr(lower(other_names), ?)"] * len(needles)) + ")")
+    params = [needle for needle in needles for _ in range(2)]
+    if min_post_count is not None:
+        sql += " AND post_count >= ?"
+        params.append(min_post_count)
+    if max_post_count is not None:
+        sql += " AND post_count <= ?"
+        params.append(max_post_count)
+    rows = conn.execute(sql + " ORDER BY post_count DESC LIMIT ?", params + [FALLBACK_CANDIDATES]).fetchall()
+
+    best: Dict[int, Tuple[float, int, str]] = {}
+    for artist_id, name, post_count, other_names in rows:
+        for text in [name or ''] + split_aliases(other_names):
+            text_grams = trigrams(text)
+            if not text_grams:
+                continue
+            similarity = len(grams & text_grams) / len(grams | text_grams)
+            if similarity >= min_similarity and (artist_id not in best or similarity > best[artist_id][0]):
+                best[artist_id] = (similarity, post_count or 0, name or '')
+    ranked = sorted(best.items(), key=lambda item: (-item[1][0], -item[1][1], item[1][2]))
+    return [(artist_id, name, post_count, similarity)
+            for artist_id, (similarity, post_count, name) in ranked[:int(limit)]]
+
+
+class TrigramIndex:
+    """Inverted trigram index over artist names and aliases"""
+
+    def __init__(self, db, max_overlay: int = 2000):
+        self.db = db
+        self.max_overlay = max_overlay
+        self.generation = None
+        self.build_seconds = 0.0
+        self._lock = threading.Lock()
+        self._rebuild_lock = threading.Lock()
+        self._ready = threading.Event()
+        self._stale = True
+        self.stats = {'queries': 0, 'rebuilds': 0, 'overlay_updates': 0, 'candidates': 0}
+
+        # Base snapshot: artists, entries (one per name/alias) and trigram postings
+        self._ids = array('q')
+        self._names: List[str] = []
+        self._other_names: List[str] = []
+        self._counts = array('q')
+        self._row_by_id: Dict[int, int] = {}
+        self._entry_artist = array('l')
+        self._entry_sizes = array('H')
+        self._postings: Dict[str, array] = {}
+
+        # Overlay: artist id -> (name, post_count, aliases, trigram set per text)
+        self._overlay: Dict[int, Tuple[str, int, List[str], List[Set[str]]]] = {}
+        self._overlay_names: Dict[str, int] = {}
+        self._shadowed = set()
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def wait_ready(self, timeout: float = None) -> bool:
+        return self._ready.wait(timeout)
+
+    # -- building ------------------------------------------------------------
+
+    def rebuild(self):
+        """Reload every name and alias from the database"""
+        with self._rebuild_lock:
+            started = time.time()
+            with self.db.read() as conn:
+                conn.execute("BEGIN")
+                generation = conn.execute("SELECT value FROM db_meta WHERE key = 'generation'").fetchone()
+                rows = conn.execute("SELECT id, name, post_count, other_names FROM artists").fetchall()
+
+            ids, names, other, counts = array('q'), [], [], array('q')
+            entry_artist, entry_sizes = array('l'), array('H')
+            postings: Dict[str, array] = {}
+            for row, (artist_id, name, post_count, other_names) in enumerate(rows):
+                ids.append(artist_id)
+                names.append(name or '')
+                other.append(other_names or '')
+                counts.append(post_count or 0)
+                for text in [name or ''] + split_aliases(other_names):
+                    grams = trigrams(text)
+                    if not grams:
+                        continue
+                    entry = len(entry_artist)
+                    entry_artist.append(row)
+                    entry_sizes.append(min(len(grams), 0xFFFF))
+                    for gram in grams:
+                        posting = postings.get(gram)
+                        if posting is None:
+                            posting = postings[gram] = array('l')
+                        posting.append(entry)
+            del rows
+
+            with self._lock:
+                self._ids, self._names, self._other_names, self._counts = ids, names, other, counts
+                self._row_by_id = {artist_id: row for row, artist_id in enumerate(ids)}
+                self._entry_artist, self._entry_sizes, self._postings = entry_artist, entry_sizes, postings
+                self._overlay, self._overlay_names, self._shadowed = {}, {}, set()
+                self.generation = generation[0] if generation else 0
+                self._stale = False
+            self._ready.set()
+            self.build_seconds = time.time() - started
+            self.stats['rebuilds'] += 1
+            logger.info(f"🔡 Trigram index built: {len(entry_artist)} names and aliases, "
+                        f"{len(postings)} trigrams in {self.build_seconds:.2f}s")
+
+    def rebuild_in_background(self):
+        """Start a rebuild unless one is already running"""
+        if self._rebuild_lock.locked():
+            return
+        threading.Thread(target=self._safe_rebuild, daemon=True, name='trigram-rebuild').start()
+
+    def _safe_rebuild(self):
+        try:
+            self.rebuild()
+        except Exception as e:
+            logger.warning(f"Trigram index rebuild failed: {e}")
+
+    # -- incremental updates -------------------------------------------------
+
+    def apply_commit(self, ops):
+        """GroupCommitWriter listener: fold committed artist writes into the overlay"""
+        with self._lock:
+            for op in ops:
+                if op.kind == 'artists':
+                    for row in op.rows:
+                        self._upsert(row[0], row[1] or '', row[2] or 0, split_aliases(row[3]))
+                elif op.kind == 'post_counts':
+                    for post_count, artist_id in op.rows:
+                        current = self._lookup(artist_id)
+                        if current is not None:
+                            self._upsert(artist_id, current[0], post_count or 0, current[2])
+                else:
+                    # Writes the overlay can't model exactly (merges, raw SQL)
+                    self._stale = True
+            if self.generation is not None:
+                self.generation += 1
+            needs_rebuild = self._stale or len(self._overlay) > self.max_overlay
+        self.stats['overlay_updates'] += 1
+        if needs_rebuild and self.ready:
+            self.rebuild_in_background()
+
+    def _lookup(self, artist_id: int) -> Optional[Tuple[str, int, List[str]]]:
+        if artist_id in self._overlay:
+            return self._overlay[artist_id][:3]
+        row = self._row_by_id.get(artist_id)
+        if row is None or artist_id in self._shadowed:
+            return None
+        return self._names[row], self._counts[row], split_aliases(self._other_names[row])
+
+    def _upsert(self, artist_id: int, name: str, post_count: int, aliases: List[str]):
+        if artist_id in self._row_by_id:
+            self._shadowed.add(artist_id)
+        # INSERT OR REPLACE drops any other artist holding the same (unique) name
+        postings = [self._postings.get(gram, ()) for gram in trigrams(name)]
+        for entry in min(postings, key=len, default=()):
+            row = self._entry_artist[entry]
+            if self._names[row] == name and self._ids[row] != artist_id:
+                self._shadowed.add(self._ids[row])
+        other_id = self._overlay_names.get(name)
+        if other_id is not None and other_id != artist_id:
+            del self._overlay[other_id]
+        previous = self._overlay.get(artist_id)
+        if previous is not None and self._overlay_names.get(previous[0]) == artist_id:
+            del self._overlay_names[previous[0]]
+        texts = [name] + aliases
+        self._overlay[artist_id] = (name, post_count, aliases, [trigrams(text) for text in texts])
+        self._overlay_names[name] = artist_id
+
+    # -- queries -------------------------------------------------------------
+
+    def search(self, query: str, limit: int = 100, min_similarity: float = DEFAULT_MIN_SIMILARITY,
+               min_post_count: int = None, max_post_count: int = None) -> List[Tuple[int, str, int, float]]:
+        """(id, name, post_count, similarity) of the closest artists, best first
+
+        An artist matching through several names/aliases counts once, with
+        its best similarity.
+        """
+        grams = trigrams(query)
+        if not grams:
+            return []
+        self.stats['queries'] += 1
+        # Jaccard >= s needs at least ceil(s * |query trigrams|) shared trigrams
+        min_shared = max(1, math.ceil(min_similarity * len(grams)))
+
+        def in_range(post_count):
+            return ((min_post_count is None or post_count >= min_post_count)
+                    and (max_post_count is None or post_count <= max_post_count))
+
+        best: Dict[int, Tuple[float, int, str]] = {}
+
+        def consider(artist_id, name, post_count, similarity):
+            if similarity >= min_similarity and in_range(post_count):
+                if artist_id not in best or similarity > best[artist_id][0]:
+                    best[artist_id] = (similarity, post_count, name)
+
+        with self._lock:
+            shared = Counter()
+            for gram in grams:
+                posting = self._postings.get(gram)
+                if posting is not None:
+                    shared.update(posting)
+            self.stats['candidates'] += len(shared)
+
+            entry_artist, entry_sizes = self._entry_artist, self._entry_sizes
+            ids, shadowed = self._ids, self._shadowed
+            for entry, count in shared.items():
+                if count < min_shared:
+                    continue
+                row = entry_artist[entry]
+                artist_id = ids[row]
+                if artist_id in shadowed:
+                    continue
+                similarity = count / (len(grams) + entry_sizes[entry] - count)
+                consider(artist_id, self._names[row], self._counts[row], similarity)
+
+            for artist_id, (name, post_count, _, text_grams) in self._overlay.items():
+                for entry_grams in text_grams:
+                    if entry_grams:
+                        common = len(grams & entry_grams)
+                        consider(artist_id, name, post_count, common / len(grams | entry_grams))
+
+        ranked = sorted(best.items(), key=lambda item: (-item[1][0], -item[1][1], item[1][2]))
+        return [(artist_id, name, post_count, similarity)
+                for artist_id, (similarity, post_count, name) in ranked[:int(limit)]]
+
+    def is_fresh(self, generation: int) -> bool:
+        return not self._stale and self.generation == generation
+
+    def get_stats(self) -> Dict:
+        return dict(self.stats, ready=self.ready, entries=len(self._entry_artist), trigrams=len(self._postings),
+                    overlay=len(self._overlay), shadowed=len(self._shadowed), generation=self.generation,
+                    build_seconds=round(self.build_seconds, 3))
@@ -4,7 +4,6 @@ Update existing artists in the database with post counts
 """
 
 from scraper import DanbooruArtistScraper
-import sqlite3
 from tqdm import tqdm
 
 def update_post_counts():
@@ -25,7 +24,7 @@ def update_post_counts():
     print(f"✅ Authenticated as: {scraper.username}")
     
     # Get all artists with 0 post count
-    conn = sqlite3.connect(scraper.db_path)
+    conn = scraper.db.open_reader()
     cursor = conn.cursor()
     
     cursor.execute("SELECT COUNT(*) FROM artists WHERE post_count = 0")
@@ -46,19 +45,17 @@ def update_post_counts():
     print("   (This will respect rate limiting - about 1 update every 0.15 seconds)")
     
     updated_count = 0
+    updates = []
     with tqdm(total=len(artists_to_update), desc="Updating post counts") as pbar:
         for artist_id, artist_name in artists_to_update:
             try:
                 # Get the post count
                 post_count = scraper.get_artist_post_count(artist_name)
                 
-                # Update the database
-                cursor.execute(
-                    "UPDATE artists SET post_count = ? WHERE id = ?",
-                    (post_count, artist_id)
-                )
-                
-                updated_count += 1
+                # Queue the update for the database; 0 means the lookup failed
+                if post_count:
+                    updates.append((post_count, artist_id))
+                    updated_count += 1
                 pbar.set_description(f"Updated {artist_name}: {post_count} posts")
                 pbar.update(1)
                 
@@ -66,8 +63,8 @@ def update_post_counts():
                 print(f"\n❌ Error updating {artist_name}: {e}")
                 continue
     
-    # Commit changes
-    conn.commit()
+    # Save changes (bumps the database generation so cached searches refresh)
+    scraper.save_post_counts(updates)
     
     # Show updated stats
     cursor.execute("SELECT COUNT(*) FROM artists WHERE post_count > 0")
@@ -98,7 +95,7 @@ def update_all_incrementally():
     total_updated = 0
     
     while True:
-        conn = sqlite3.connect(scraper.db_path)
+        conn = scraper.db.open_reader()
         cursor = conn.cursor()
         
         # Get next batch
@@ -115,21 +112,22 @@ def update_all_incrementally():
         
         print(f"📦 Updating batch of {len(batch)} artists...")
         
+        updates = []
         for artist_id, artist_name in batch:
             try:
                 post_count = scraper.get_artist_post_count(artist_name)
-                cursor.execute(
-                    "UPDATE artists SET post_count = ? WHERE id = ?",
-                    (post_count, artist_id)
-                )
+                if not post_count:
+                    print(f"  ⚠️ {artist_name}: no post count, left unchanged")
+                    continue
+                updates.append((post_count, artist_id))
                 total_updated += 1
                 print(f"  ✅ {artist_name}: {post_count} posts")
                 
             except Exception as e:
                 print(f"  ❌ {artist_name}: {e}")
         
-        conn.commit()
         conn.close()
+        scraper.save_post_counts(updates)
         
         print(f"📊 Batch complete. Total updated: {total_updated}")
 
@@ -4,7 +4,6 @@ Update post counts for existing artists in small batches
 """
 
 from scraper import DanbooruArtistScraper
-import sqlite3
 from tqdm import tqdm
 import time
 
@@ -26,7 +25,7 @@ def update_post_counts_incrementally():
     print(f"✅ Authenticated as: {scraper.username}")
     
     # Get stats
-    conn = sqlite3.connect(scraper.db_path)
+    conn = scraper.db.open_reader()
     cursor = conn.cursor()
     
     cursor.execute("SELECT COUNT(*) FROM artists")
@@ -67,19 +66,17 @@ def update_post_counts_incrementally():
     artists_to_update = cursor.fetchall()
     
     updated_count = 0
+    updates = []
     with tqdm(total=len(artists_to_update), desc="Updating post counts") as pbar:
         for artist_id, artist_name in artists_to_update:
             try:
                 # Get the post count
                 post_count = scraper.get_artist_post_count(artist_name)
                 
-                # Update the database
-                cursor.execute(
-                    "UPDATE artists SET post_count = ? WHERE id = ?",
-                    (post_count, artist_id)
-                )
-                
-                updated_count += 1
+                # Queue the update for the database; 0 means the lookup failed
+                if post_count:
+                    updates.append((post_count, artist_id))
+                    updated_count += 1
                 pbar.set_description(f"Updated {artist_name}: {post_count} posts")
                 pbar.update(1)
                 
@@ -87,8 +84,8 @@ def update_post_counts_incrementally():
                 print(f"\n❌ Error updating {artist_name}: {e}")
                 continue
     
-    # Commit changes
-    conn.commit()
+    # Save changes (bumps the database generation so cached searches refresh)
+    scraper.save_post_counts(updates)
     
     # Show updated stats
     cursor.execute("SELECT COUNT(*) FROM artists WHERE post_count > 0")
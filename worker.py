@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Scraper worker process: the single owner of the upstream rate budget
+
+Web processes started with SCRAPE_WORKER_MODE=process only write jobs to the
+shared job table (see jobs.SQLiteJobStore). This daemon claims those jobs,
+runs them with its own DanbooruArtistScraper and writes state, metrics and
+rate limit health back, so any number of web workers can serve /search while
+exactly one process talks to Danbooru.
+
+Usage:
+    python worker.py [--db artists.db] [--jobs-db jobs.db] [--workers 1]
+"""
+
+import argparse
+import logging
+import os
+import signal
+import threading
+import time
+import uuid
+from scraper import DanbooruArtistScraper
+from jobs import JobManager, SQLiteJobStore, RUNNING
+
+
+class ScraperWorker:
+    """Claim jobs from a SQLiteJobStore and run them on an in-process JobManager"""
+
+    def __init__(self, scraper: DanbooruArtistScraper, store: SQLiteJobStore,
+                 max_workers: int = 1, poll_interval: float = 1.0,
+                 metrics_interval: float = 1.0):
+        self.scraper = scraper
+        self.store = store
+        self.poll_interval = poll_interval
+        self.metrics_interval = metrics_interval
+        self.worker_id = f"worker-{uuid.uuid4().hex[:8]}"
+        self.logger = logging.getLogger(__name__)
+        self.stop_event = threading.Event()
+
+        self._last_written = {}
+        self.manager = JobManager(scraper, max_workers=max_workers, on_update=self._on_job_update)
+
+    def _on_job_update(self, job):
+        """Persist job changes; progress-only updates are throttled"""
+        now = time.time()
+        if job.state == RUNNING and job.metrics and now - self._last_written.get(job.id, 0) < self.metrics_interval:
+            return
+        self._last_written[job.id] = now
+        self.store.update(job)
+        if job.is_finished:
+            self._last_written.pop(job.id, None)
+
+    def run_once(self):
+        """Claim jobs while there is capacity, then propagate cancellations"""
+        while self.manager.active_count() < self.manager.max_workers:
+            job = self.store.claim_next(self.worker_id)
+            if job is None:
+                break
+            self.logger.info(f"📥 Claimed {job.kind} job {job.id}")
+            self.manager.enqueue(job)
+
+        active_ids = [job.id for job in self.manager.list(active_only=True)]
+        for job_id in self.store.cancel_requested_ids(active_ids):
+            self.manager.cancel(job_id)
+
+        self.store.heartbeat(self.worker_id, self.scraper.get_rate_limit_status())
+
+    def run(self):
+        live = self.store.live_worker(max_age=self.poll_interval * 5)
+        if live and live['worker_id'] != self.worker_id:
+            raise RuntimeError(
+                f"Another scraper worker ({live['worker_id']}, pid {live['pid']}) is already running"
+            )
+
+        orphaned = self.store.fail_orphaned_jobs(self.worker_id)
+        if orphaned:
+            self.logger.warning(f"⚠️  Marked {orphaned} orphaned running job(s) as failed")
+
+        self.logger.info(f"👷 Scraper worker {self.worker_id} started (pid {os.getpid()})")
+        self.scraper.start_retry_drainer()
+        try:
+            while not self.stop_event.is_set():
+                self.run_once()
+                self.stop_event.wait(self.poll_interval)
+        finally:
+            # Jobs stop cooperatively before their next upstream request
+            for job in self.manager.list(active_only=True):
+                self.manager.cancel(job.id)
+            deadline = time.time() + 60
+            while self.manager.active_count() and time.time() < deadline:
+                time.sleep(0.1)
+            self.scraper.retry_drainer.stop(timeout=30)
+            self.store.remove_worker(self.worker_id)
+            self.logger.info(f"👋 Scraper worker {self.worker_id} stopped")
+
+    def stop(self, *args):
+        self.stop_event.set()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the scraper job worker")
+    parser.add_argument('--db', default=os.environ.get('ARTISTS_DB_PATH', 'artists.db'),
+                        help="Artist database path")
+    parser.add_argument('--jobs-db', default=os.environ.get('JOBS_DB_PATH', 'jobs.db'),
+                        help="Shared job table database path")
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('JOB_WORKERS', 1)),
+                        help="Jobs to run concurrently (they share one rate budget)")
+    parser.add_argument('--poll-interval', type=float, default=1.0,
+                        help="Seconds between job table polls")
+    args = parser.parse_args()
+
+    worker = ScraperWorker(
+        DanbooruArtistScraper(db_path=args.db),
+        SQLiteJobStore(args.jobs_db),
+        max_workers=args.workers,
+        poll_interval=args.poll_interval
+    )
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    worker.run()
+
+
+if __name__ == "__main__":
+    main()